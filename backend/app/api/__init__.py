@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api import auth, dashboard, applications, profile, resumes, ai, notifications, templates, resume_content, cover_letters, events, emails
+from app.api import auth, dashboard, applications, profile, resumes, ai, notifications, templates, resume_content, cover_letters, events, emails, storage
 
 router = APIRouter()
 
@@ -15,3 +15,4 @@ router.include_router(ai.router, prefix="/ai", tags=["AI"])
 router.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
 router.include_router(emails.router, tags=["Emails"])
 router.include_router(cover_letters.router, tags=["Cover Letters"])
+router.include_router(storage.router, prefix="/storage", tags=["Storage"])
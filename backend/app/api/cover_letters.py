@@ -2,11 +2,12 @@
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user, get_db
+from app.core.http_cache import etag_matches
 from app.models import CoverLetter, User, Profile
 from app.schemas.cover_letter import (
     CoverLetterCreate,
@@ -17,6 +18,8 @@ from app.schemas.cover_letter import (
     CoverLetterExportRequest,
 )
 from app.services import cover_letter_service
+from app.services.pdf_renderer import PdfRenderBusyError, PdfRenderTimeoutError, get_or_render_pdf
+from app.services.render_cache import render_cache
 
 router = APIRouter(prefix="/cover-letters", tags=["cover-letters"])
 
@@ -33,9 +36,9 @@ def list_cover_letter_templates():
 
 
 @router.get("/templates/{slug}")
-def get_cover_letter_template(slug: str):
+def get_cover_letter_template(slug: str, db: Session = Depends(get_db)):
     """Get details of a specific template."""
-    template = cover_letter_service.get_template(slug)
+    template = cover_letter_service.get_template(slug, db)
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
     
@@ -192,10 +195,15 @@ def _get_user_profile(db: Session, user_id: int) -> Optional[dict]:
 def preview_cover_letter(
     cover_letter_id: int,
     request: CoverLetterPreviewRequest,
+    http_request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Generate HTML preview of a cover letter."""
+    """
+    Generate HTML preview of a cover letter.
+    The response carries an ETag; If-None-Match with it returns 304 when nothing changed.
+    """
     cover_letter = (
         db.query(CoverLetter)
         .filter(CoverLetter.id == cover_letter_id, CoverLetter.user_id == current_user.id)
@@ -216,12 +224,29 @@ def preview_cover_letter(
     design_tokens = request.design_tokens.model_dump() if request.design_tokens else cover_letter.design_tokens
     
     try:
-        html = cover_letter_service.render_cover_letter_html(
+        cache_key = cover_letter_service.cover_letter_render_key(
             content=cover_letter.content,
             template_slug=template_slug,
             design_tokens=design_tokens,
             profile=profile,
+            db=db,
+        )
+        etag = f'"{cache_key}"'
+        if etag_matches(http_request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        
+        html = render_cache.get_or_render(
+            cache_key,
+            lambda: cover_letter_service.render_cover_letter_html(
+                content=cover_letter.content,
+                template_slug=template_slug,
+                design_tokens=design_tokens,
+                profile=profile,
+                db=db,
+            ),
         )
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
         return {"html": html}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to render preview: {str(e)}")
@@ -255,20 +280,35 @@ def export_cover_letter_pdf(
     design_tokens = request.design_tokens.model_dump() if request.design_tokens else cover_letter.design_tokens
     
     try:
-        pdf_bytes = cover_letter_service.export_to_pdf(
+        # One lookup, so the HTML and CSS come from the same template row
+        template_data = cover_letter_service.resolve_template(template_slug, db)
+        html = cover_letter_service.render_cover_letter_html(
             content=cover_letter.content,
             template_slug=template_slug,
             design_tokens=design_tokens,
             profile=profile,
+            db=db,
+            inline_css=False,
+            template_data=template_data,
         )
+        css = cover_letter_service.export_stylesheet(template_data)
+        # Rendered in the PDF worker pool, or streamed from the PDF cache
+        chunks, size, _ = get_or_render_pdf(html, css)
         
         filename = f"{cover_letter.title.replace(' ', '_')}.pdf"
         
-        return Response(
-            content=pdf_bytes,
+        return StreamingResponse(
+            chunks,
             media_type="application/pdf",
-            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Content-Length": str(size),
+            },
         )
+    except PdfRenderBusyError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except PdfRenderTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
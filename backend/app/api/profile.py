@@ -1,12 +1,22 @@
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.core.database import get_db
-from app.core.storage import StorageError, resolve_avatar_url, upload_profile_avatar
+from app.core.storage import (
+    StorageError,
+    UploadTooLargeError,
+    measure_stream,
+    resolve_avatar_url,
+    resolve_avatar_variants,
+    upload_avatar_variants,
+    upload_profile_avatar,
+)
 from app.models.profile import Profile
 from app.models.user import User
 from app.schemas.profile import ProfileResponse, ProfileUpdate
+from app.services.avatar_service import PIL_AVAILABLE, avatar_variant_sizes, build_avatar_variants
 
 router = APIRouter()
 
@@ -23,16 +33,40 @@ def get_or_create_profile(db: Session, user_id: int) -> Profile:
     return profile
 
 
+def _attach_avatar_urls(profile: Profile) -> Profile:
+    profile.avatar_variants = resolve_avatar_variants(profile.avatar_url, avatar_variant_sizes())
+    avatar_url = resolve_avatar_url(profile.avatar_url)
+    if avatar_url:
+        profile.avatar_url = avatar_url
+    return profile
+
+
+def _store_avatar(file: UploadFile, user_id: int, file_size: int) -> str:
+    """
+    Store an uploaded avatar as resized, metadata-free WebP variants and
+    return the object path to save on the profile. Without Pillow the
+    original file is stored unchanged.
+    """
+    if not PIL_AVAILABLE:
+        object_path, _ = upload_profile_avatar(
+            file.file,
+            file.content_type,
+            file.filename,
+            user_id,
+            size=file_size,
+        )
+        return object_path
+    variants = build_avatar_variants(file.file)
+    return upload_avatar_variants(variants, user_id)
+
+
 @router.get("/me", response_model=ProfileResponse)
 def read_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     profile = get_or_create_profile(db, current_user.id)
-    avatar_url = resolve_avatar_url(profile.avatar_url)
-    if avatar_url:
-        profile.avatar_url = avatar_url
-    return profile
+    return _attach_avatar_urls(profile)
 
 
 @router.put("/me", response_model=ProfileResponse)
@@ -51,10 +85,7 @@ def update_profile(
         setattr(profile, key, value)
     db.commit()
     db.refresh(profile)
-    avatar_url = resolve_avatar_url(profile.avatar_url)
-    if avatar_url:
-        profile.avatar_url = avatar_url
-    return profile
+    return _attach_avatar_urls(profile)
 
 
 @router.post("/me/avatar", response_model=ProfileResponse)
@@ -66,20 +97,19 @@ async def upload_avatar(
     if not file.content_type or not file.content_type.startswith("image/"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image file.")
 
-    content = await file.read()
-    if len(content) > MAX_AVATAR_SIZE:
+    try:
+        file_size, _ = await run_in_threadpool(measure_stream, file.file, MAX_AVATAR_SIZE)
+    except UploadTooLargeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Image must be smaller than 2MB.",
         )
 
     try:
-        object_path, signed_url = upload_profile_avatar(
-            content,
-            file.content_type,
-            file.filename,
-            current_user.id,
-        )
+        # Decoding and resizing is CPU-bound; keep it off the event loop
+        object_path = await run_in_threadpool(_store_avatar, file, current_user.id, file_size)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image file.") from exc
     except StorageError as exc:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
 
@@ -87,5 +117,4 @@ async def upload_avatar(
     profile.avatar_url = object_path
     db.commit()
     db.refresh(profile)
-    profile.avatar_url = signed_url
-    return profile
+    return _attach_avatar_urls(profile)
@@ -4,11 +4,15 @@ API endpoints for resume content extraction and management.
 import asyncio
 from typing import Optional
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.core.database import get_db, SessionLocal
+from app.core.http_cache import etag_matches
 from app.core.storage import download_resume_file
 from app.models.resume import Resume
 from app.models.resume_content import ExtractionStatus, ResumeContent
@@ -20,14 +24,35 @@ from app.schemas.resume_content import (
     ResumeContentResponse,
     ResumeContentUpdate,
 )
-from app.schemas.template import ExportResumeRequest, RenderResumeRequest, RenderResumeResponse
+from app.schemas.template import (
+    CompareResumeItem,
+    CompareResumeRequest,
+    CompareResumeResponse,
+    CompareVariant,
+    ExportResumeRequest,
+    RenderFragmentsRequest,
+    RenderFragmentsResponse,
+    RenderResumeRequest,
+    RenderResumeResponse,
+    ResumeFragment,
+)
 from app.services.extraction_service import (
     basic_parse_resume,
     extract_text,
     parse_resume_with_ai,
     validate_resume_schema,
 )
-from app.services.template_service import render_resume_html, resolve_design_tokens
+from app.services.pdf_renderer import PdfRenderBusyError, PdfRenderTimeoutError, get_or_render_pdf
+from app.services.render_cache import render_cache
+from app.services.template_service import (
+    export_stylesheet,
+    render_resume_for_export,
+    render_resume_fragments,
+    render_resume_html,
+    resolve_design_tokens,
+    resume_render_key,
+)
+from app.services.thumbnail_service import html_thumbnail
 
 router = APIRouter()
 
@@ -333,11 +358,16 @@ async def update_resume_content(
 async def preview_resume(
     resume_id: int,
     payload: RenderResumeRequest,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     Render resume with selected template for preview.
+    
+    Rendered HTML is cached by its inputs and the response carries an ETag;
+    sending it back in If-None-Match returns 304 when nothing changed.
     """
     # Get resume content
     resume = (
@@ -360,14 +390,22 @@ async def preview_resume(
     
     # Resolve tokens
     tokens = resolve_design_tokens(payload.design_tokens, payload.template_slug)
+    purpose = payload.purpose or content.purpose
+    
+    etag = f'"{resume_render_key(payload.template_slug, content.structured_data, payload.design_tokens, purpose)}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
     
     # Render
     try:
-        html = render_resume_html(
-            template_slug=payload.template_slug,
-            resume_data=content.structured_data,
-            design_tokens=payload.design_tokens,
-            purpose=payload.purpose or content.purpose
+        html = render_cache.get_or_render(
+            etag.strip('"'),
+            lambda: render_resume_html(
+                template_slug=payload.template_slug,
+                resume_data=content.structured_data,
+                design_tokens=payload.design_tokens,
+                purpose=purpose
+            ),
         )
     except ValueError as e:
         raise HTTPException(
@@ -375,6 +413,8 @@ async def preview_resume(
             detail=str(e)
         )
     
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
     return RenderResumeResponse(
         html=html,
         template_slug=payload.template_slug,
@@ -382,6 +422,174 @@ async def preview_resume(
     )
 
 
+@router.post("/{resume_id}/preview/fragments", response_model=RenderFragmentsResponse)
+async def preview_resume_fragments(
+    resume_id: int,
+    payload: RenderFragmentsRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Incremental preview for the editor.
+    
+    Sections are rendered as fragments cached by their content, so an edit
+    only re-renders the sections it touched. The client sends the layout and
+    fragment keys it already has and gets back only the fragments that
+    changed, to put between the section's <!--section:name--> comments.
+    The full document comes back when the layout key changed or the template
+    doesn't split into sections.
+    """
+    resume = (
+        db.query(Resume)
+        .filter(Resume.id == resume_id, Resume.user_id == current_user.id)
+        .first()
+    )
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    resume_data = payload.structured_data
+    purpose = payload.purpose
+    if resume_data is None or not purpose:
+        content = db.query(ResumeContent).filter(ResumeContent.resume_id == resume_id).first()
+        if resume_data is None:
+            if not content or not content.structured_data:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Resume content not available. Extract or create content first."
+                )
+            resume_data = content.structured_data
+        purpose = purpose or (content.purpose if content else None)
+    
+    def render() -> RenderFragmentsResponse:
+        layout_key, fragments, html = render_resume_fragments(
+            template_slug=payload.template_slug,
+            resume_data=resume_data,
+            design_tokens=payload.design_tokens,
+            purpose=purpose,
+            known_layout=payload.known_layout
+        )
+        return RenderFragmentsResponse(
+            template_slug=payload.template_slug,
+            tokens_used=resolve_design_tokens(payload.design_tokens, payload.template_slug),
+            layout_key=layout_key,
+            sections={section: key for section, (key, _) in fragments.items()},
+            fragments=[
+                ResumeFragment(section=section, key=key, html=fragment_html)
+                for section, (key, fragment_html) in fragments.items()
+                if html is None and payload.known_fragments.get(section) != key
+            ],
+            html=html
+        )
+    
+    try:
+        return await run_in_threadpool(render)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def _render_compare_variant(
+    variant: CompareVariant,
+    resume_data: dict,
+    purpose: Optional[str],
+    thumbnail_width: Optional[int],
+) -> CompareResumeItem:
+    """Render one compare variant; blocking, runs in the threadpool."""
+    key = resume_render_key(variant.template_slug, resume_data, variant.design_tokens, purpose)
+    html = render_cache.get_or_render(
+        key,
+        lambda: render_resume_html(
+            template_slug=variant.template_slug,
+            resume_data=resume_data,
+            design_tokens=variant.design_tokens,
+            purpose=purpose
+        ),
+    )
+    
+    thumbnail = None
+    if thumbnail_width is not None:
+        try:
+            export_html = render_resume_for_export(
+                template_slug=variant.template_slug,
+                resume_data=resume_data,
+                design_tokens=variant.design_tokens,
+                purpose=purpose,
+                inline_css=False
+            )
+            thumbnail = html_thumbnail(export_html, export_stylesheet(variant.template_slug), thumbnail_width)
+        except Exception as e:
+            # Thumbnails are optional; the HTML is still returned
+            print(f"[Compare] Thumbnail for '{variant.template_slug}' failed: {e}")
+    
+    return CompareResumeItem(
+        html=html,
+        template_slug=variant.template_slug,
+        tokens_used=resolve_design_tokens(variant.design_tokens, variant.template_slug),
+        etag=f'"{key}"',
+        thumbnail=thumbnail
+    )
+
+
+@router.post("/{resume_id}/compare", response_model=CompareResumeResponse)
+async def compare_templates(
+    resume_id: int,
+    payload: CompareResumeRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Render one resume with several templates or token sets in a single call.
+    
+    The content is loaded once and the variants render in parallel; results
+    come back in request order. Each result carries the ETag the preview
+    endpoint would return for the same variant. With include_thumbnails a
+    PNG of the first page is added, rendered through the PDF renderer.
+    """
+    if len(payload.variants) > settings.RESUME_COMPARE_MAX_VARIANTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.RESUME_COMPARE_MAX_VARIANTS} variants can be compared at once"
+        )
+    
+    resume = (
+        db.query(Resume)
+        .filter(Resume.id == resume_id, Resume.user_id == current_user.id)
+        .first()
+    )
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    content = db.query(ResumeContent).filter(ResumeContent.resume_id == resume_id).first()
+    if not content or not content.structured_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Resume content not available. Extract or create content first."
+        )
+    
+    purpose = payload.purpose or content.purpose
+    thumbnail_width = (payload.thumbnail_width or settings.THUMBNAIL_WIDTH) if payload.include_thumbnails else None
+    try:
+        results = await asyncio.gather(*(
+            run_in_threadpool(_render_compare_variant, variant, content.structured_data, purpose, thumbnail_width)
+            for variant in payload.variants
+        ))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return CompareResumeResponse(results=list(results))
+
+
 @router.post("/{resume_id}/export")
 async def export_resume(
     resume_id: int,
@@ -393,7 +601,6 @@ async def export_resume(
     Export resume as PDF or DOCX.
     """
     from fastapi.responses import Response
-    from app.services.template_service import render_resume_for_export
     
     # Get resume content
     resume = (
@@ -420,28 +627,35 @@ async def export_resume(
         resume_data=content.structured_data,
         design_tokens=payload.design_tokens,
         purpose=content.purpose,
-        page_size=payload.page_size
+        page_size=payload.page_size,
+        inline_css=payload.format != "pdf"
     )
     
     if payload.format == "pdf":
-        # Generate PDF using WeasyPrint
+        # Template CSS goes to the renderer as a stylesheet, parsed once per worker
+        css = export_stylesheet(payload.template_slug, payload.page_size)
+        # Rendered in the PDF worker pool, or streamed from the PDF cache
         try:
-            from weasyprint import HTML
-            pdf_bytes = HTML(string=html).write_pdf()
-            
-            filename = f"{resume.title.replace(' ', '_')}.pdf"
-            return Response(
-                content=pdf_bytes,
-                media_type="application/pdf",
-                headers={
-                    "Content-Disposition": f'attachment; filename="{filename}"'
-                }
-            )
+            chunks, size, _ = await run_in_threadpool(get_or_render_pdf, html, css)
+        except PdfRenderBusyError as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+        except PdfRenderTimeoutError as e:
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"PDF generation failed: {e}"
             )
+        
+        filename = f"{resume.title.replace(' ', '_')}.pdf"
+        return StreamingResponse(
+            chunks,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'attachment; filename="{filename}"',
+                "Content-Length": str(size),
+            }
+        )
     
     elif payload.format == "docx":
         # Generate DOCX using python-docx
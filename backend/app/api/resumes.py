@@ -1,17 +1,58 @@
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import chain
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import quote
+from uuid import uuid4
 import asyncio
+import hashlib
+import os
+import tempfile
+import zipfile
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.core.database import get_db, SessionLocal
-from app.core.storage import StorageError, download_resume_file, resolve_resume_url, upload_resume_file
+from app.core.http_cache import etag_matches
+from app.core.security import create_upload_token, verify_token
+from app.core.storage import (
+	StorageError,
+	UploadTooLargeError,
+	create_signed_upload_url,
+	delete_objects,
+	download_resume_file,
+	get_object_info,
+	measure_stream,
+	new_resume_object_path,
+	resolve_resume_url,
+	resolve_resume_urls,
+	stream_object,
+	upload_resume_file,
+)
 from app.models.resume import Resume
 from app.models.resume_content import ExtractionStatus, ResumeContent
 from app.models.user import User
-from app.schemas.resume import ResumeResponse, ResumeUpdate
-from app.services.extraction_service import extract_text, parse_resume_with_ai, basic_parse_resume, validate_resume_schema
+from app.schemas.resume import (
+	BulkImportItem,
+	BulkImportResponse,
+	ResumeResponse,
+	ResumeUpdate,
+	ResumeUploadComplete,
+	ResumeUploadIntentRequest,
+	ResumeUploadIntentResponse,
+)
+from app.services.extraction_service import (
+	basic_parse_resume,
+	extract_text,
+	parse_resume_with_ai,
+	validate_resume_schema,
+)
 from app.services.ai_service import _call_deepseek
 
 router = APIRouter()
@@ -22,12 +63,29 @@ ALLOWED_CONTENT_TYPES = {
 	"application/msword",
 	"application/vnd.openxmlformats-officedocument.wordprocessingml.document",
 }
+EXTENSION_CONTENT_TYPES = {
+	".pdf": "application/pdf",
+	".doc": "application/msword",
+	".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+ZIP_CONTENT_TYPES = {"application/zip", "application/x-zip-compressed"}
+
+# Bounded pools so a bulk import can't start an unbounded number of uploads or extractions
+_extraction_pool = ThreadPoolExecutor(
+	max_workers=max(1, settings.RESUME_EXTRACTION_WORKERS),
+	thread_name_prefix="resume-extract",
+)
+_upload_pool = ThreadPoolExecutor(
+	max_workers=max(1, settings.RESUME_BULK_UPLOAD_CONCURRENCY),
+	thread_name_prefix="resume-upload",
+)
 
 
-def _auto_extract_resume(resume_id: int, use_ai: bool = True):
+def _auto_extract_resume(resume_id: int, use_ai: bool = True, expected_hash: Optional[str] = None):
 	"""
 	Automatically extract and parse resume content in background.
 	Uses its own database session to avoid threading issues.
+	When expected_hash is given (direct uploads), the downloaded bytes are checked against it first.
 	"""
 	db = SessionLocal()
 	
@@ -47,6 +105,10 @@ def _auto_extract_resume(resume_id: int, use_ai: bool = True):
 		try:
 			# Download and extract text
 			file_bytes = download_resume_file(resume.storage_path)
+			if expected_hash:
+				_check_upload_hash(db, resume, hashlib.sha256(file_bytes).hexdigest(), expected_hash)
+			# Full text (up to the page budget): the section segmenter reads all of it,
+			# the AI prompt is cut to AI_PARSE_MAX_CHARS when it is built
 			raw_text = extract_text(file_bytes, resume.content_type)
 			
 			if not raw_text.strip():
@@ -93,6 +155,431 @@ def _auto_extract_resume(resume_id: int, use_ai: bool = True):
 		db.close()
 
 
+def _check_upload_hash(db: Session, resume: Resume, actual_hash: str, expected_hash: str) -> None:
+	"""
+	Compare a directly uploaded file's hash with the one declared in its upload intent.
+	On mismatch the stored hash is corrected, so dedup never matches on a wrong hash.
+	"""
+	if actual_hash == expected_hash.lower():
+		return
+	resume.content_hash = actual_hash
+	db.commit()
+	raise ValueError("Uploaded file does not match the declared SHA-256 hash")
+
+
+def _verify_upload_hash(resume_id: int, expected_hash: str):
+	"""Background hash check for direct uploads that skip extraction."""
+	db = SessionLocal()
+	try:
+		resume = db.query(Resume).filter(Resume.id == resume_id).first()
+		if not resume:
+			return
+		try:
+			# Hash chunk by chunk; the file itself isn't needed here
+			digest = hashlib.sha256()
+			for chunk in stream_object(resume.storage_path):
+				digest.update(chunk)
+			_check_upload_hash(db, resume, digest.hexdigest(), expected_hash)
+		except (StorageError, ValueError) as e:
+			db.add(ResumeContent(
+				resume_id=resume_id,
+				extraction_status=ExtractionStatus.FAILED.value,
+				extraction_error=str(e),
+			))
+			db.commit()
+	finally:
+		db.close()
+
+
+def _find_duplicate_resume(db: Session, user_id: int, content_hash: str) -> Optional[Resume]:
+	"""
+	Find an earlier upload of the same file bytes by this user.
+	Prefers a resume whose extraction has already completed so it can be reused.
+	"""
+	candidates = (
+		db.query(Resume)
+		.filter(Resume.user_id == user_id, Resume.content_hash == content_hash)
+		.order_by(Resume.created_at.desc())
+		.all()
+	)
+	for candidate in candidates:
+		if (
+			candidate.content
+			and candidate.content.extraction_status == ExtractionStatus.COMPLETED.value
+			and candidate.content.structured_data
+		):
+			return candidate
+	return candidates[0] if candidates else None
+
+
+def _copy_extracted_content(db: Session, source: Resume, resume_id: int) -> bool:
+	"""
+	Copy a completed extraction from a duplicate resume instead of re-running it.
+	Returns True when content was copied.
+	"""
+	source_content = source.content
+	if (
+		not source_content
+		or source_content.extraction_status != ExtractionStatus.COMPLETED.value
+		or not source_content.structured_data
+	):
+		return False
+
+	db.add(ResumeContent(
+		resume_id=resume_id,
+		structured_data=source_content.structured_data,
+		raw_text=source_content.raw_text,
+		extraction_status=ExtractionStatus.COMPLETED.value,
+		purpose=source_content.purpose,
+		industry=source_content.industry,
+		language=source_content.language,
+		tone=source_content.tone,
+	))
+	db.commit()
+	return True
+
+
+def _create_resume_record(
+	db: Session,
+	user_id: int,
+	*,
+	title: Optional[str],
+	file_name: Optional[str],
+	object_path: str,
+	content_type: str,
+	file_size: int,
+	content_hash: str,
+	is_primary: bool,
+	duplicate: Optional[Resume],
+	upload_id: Optional[str] = None,
+) -> Tuple[Resume, bool]:
+	"""
+	Create the Resume row for a stored file.
+	Returns (resume, content_reused) - content_reused is True when a duplicate's
+	completed extraction was copied, so no new extraction is needed.
+	"""
+	resume_title = title.strip() if title and title.strip() else (file_name or "Resume")
+
+	if is_primary:
+		db.query(Resume).filter(Resume.user_id == user_id).update({Resume.is_primary: False})
+
+	resume = Resume(
+		user_id=user_id,
+		title=resume_title,
+		file_name=file_name or resume_title,
+		storage_path=object_path,
+		content_type=content_type,
+		file_size=file_size,
+		content_hash=content_hash,
+		is_primary=is_primary,
+		upload_id=upload_id,
+	)
+	db.add(resume)
+	db.commit()
+	db.refresh(resume)
+
+	# Reuse a completed extraction of the same file instead of re-parsing it
+	content_reused = (
+		duplicate is not None
+		and duplicate.content_type == resume.content_type
+		and _copy_extracted_content(db, duplicate, resume.id)
+	)
+	return resume, content_reused
+
+
+def _find_completed_upload(
+	db: Session,
+	user_id: int,
+	upload_id: Optional[str],
+	object_path: Optional[str],
+) -> Optional[Resume]:
+	"""Resume already created for an upload intent, so completing it again is a no-op."""
+	query = db.query(Resume).filter(Resume.user_id == user_id)
+	if upload_id:
+		return query.filter(Resume.upload_id == upload_id).first()
+	if object_path:
+		# Intents issued before upload_id existed
+		return query.filter(Resume.storage_path == object_path).first()
+	return None
+
+
+def _resolve_content_type(filename: Optional[str], declared: Optional[str] = None) -> Optional[str]:
+	"""Use the declared type when allowed, otherwise infer it from the file extension."""
+	if declared in ALLOWED_CONTENT_TYPES:
+		return declared
+	extension = os.path.splitext(filename or "")[1].lower()
+	return EXTENSION_CONTENT_TYPES.get(extension)
+
+
+def _bulk_item(
+	file_name: str,
+	content_type: Optional[str],
+	source: Optional[BinaryIO] = None,
+	error: Optional[str] = None,
+	spool: bool = False,
+) -> Dict[str, Any]:
+	"""
+	Size and hash one file in a single chunked pass.
+	Non-seekable sources (zip entries) are spooled to a temporary file on the way.
+	"""
+	item = {"file_name": file_name, "content_type": content_type, "stream": None, "error": error}
+	if error is None and not content_type:
+		item["error"] = "Invalid resume file type."
+	if item["error"] is None and source is not None:
+		stream = tempfile.SpooledTemporaryFile(max_size=1024 * 1024) if spool else source
+		try:
+			item["file_size"], item["content_hash"] = measure_stream(
+				source,
+				MAX_RESUME_SIZE,
+				sink=stream if spool else None,
+			)
+			item["stream"] = stream
+		except UploadTooLargeError:
+			item["error"] = "Resume must be smaller than 5MB."
+			if spool:
+				stream.close()
+	item["owns_stream"] = spool and item["stream"] is not None
+	item["status"] = "rejected" if item["error"] else "pending"
+	return item
+
+
+def _check_bulk_limit(items: List[Dict[str, Any]], adding: int = 1) -> None:
+	"""Refuse the import before `adding` more resumes would exceed the limit."""
+	if sum(1 for item in items if item["status"] == "pending") + adding > settings.RESUME_BULK_MAX_FILES:
+		raise HTTPException(
+			status_code=status.HTTP_400_BAD_REQUEST,
+			detail=f"A bulk import can contain at most {settings.RESUME_BULK_MAX_FILES} resumes.",
+		)
+
+
+def _collect_bulk_items(files: List[UploadFile], items: List[Dict[str, Any]]) -> None:
+	"""Measure each uploaded file and the resumes in each zip archive into items."""
+	for upload in files:
+		if upload.content_type in ZIP_CONTENT_TYPES or (upload.filename or "").lower().endswith(".zip"):
+			_expand_zip(upload, items)
+			continue
+		name = upload.filename or "resume"
+		content_type = _resolve_content_type(name, upload.content_type)
+		if content_type:
+			_check_bulk_limit(items)
+		items.append(_bulk_item(name, content_type, upload.file))
+
+
+def _expand_zip(upload: UploadFile, items: List[Dict[str, Any]]) -> None:
+	"""
+	Add the resume files in an uploaded zip archive to items.
+	The resume count and each entry's declared size are checked before
+	anything is decompressed; entries are then read one at a time and capped
+	at MAX_RESUME_SIZE each.
+	"""
+	archive_name = upload.filename or "archive.zip"
+	try:
+		archive = zipfile.ZipFile(upload.file)
+	except zipfile.BadZipFile:
+		items.append(_bulk_item(archive_name, None, error="Invalid zip archive."))
+		return
+
+	with archive:
+		entries = []
+		for info in archive.infolist():
+			name = os.path.basename(info.filename)
+			if info.is_dir() or not name or name.startswith(".") or info.filename.startswith("__MACOSX/"):
+				continue
+			content_type = _resolve_content_type(name)
+			if not content_type:
+				items.append(_bulk_item(name, None))
+			elif info.file_size > MAX_RESUME_SIZE:
+				items.append(_bulk_item(name, content_type, error="Resume must be smaller than 5MB."))
+			else:
+				entries.append((info, name, content_type))
+		_check_bulk_limit(items, adding=len(entries))
+
+		for info, name, content_type in entries:
+			# Header sizes can lie, so measure_stream enforces the limit while reading
+			with archive.open(info) as entry:
+				items.append(_bulk_item(name, content_type, entry, spool=True))
+
+
+def _upload_bulk_item(item: Dict[str, Any], user_id: int) -> None:
+	try:
+		item["storage_path"], _ = upload_resume_file(
+			item["stream"],
+			item["content_type"],
+			item["file_name"],
+			user_id,
+			size=item["file_size"],
+		)
+		item["status"] = "uploaded"
+	except StorageError as exc:
+		item["status"] = "failed"
+		item["error"] = str(exc)
+
+
+def _extract_bulk_group(resume_id: int, duplicate_ids: List[int], use_ai: bool = True):
+	"""
+	Extract one resume, then share the result with in-batch copies of the same file.
+	"""
+	_auto_extract_resume(resume_id, use_ai)
+	if not duplicate_ids:
+		return
+
+	db = SessionLocal()
+	try:
+		source = db.query(Resume).filter(Resume.id == resume_id).first()
+		for duplicate_id in duplicate_ids:
+			if source and _copy_extracted_content(db, source, duplicate_id):
+				continue
+			# Same bytes would fail the same way, so record the failure instead of retrying
+			error = source.content.extraction_error if source and source.content else None
+			db.add(ResumeContent(
+				resume_id=duplicate_id,
+				extraction_status=ExtractionStatus.FAILED.value,
+				extraction_error=error or "Extraction failed",
+			))
+			db.commit()
+	finally:
+		db.close()
+
+
+async def _import_bulk_items(
+	items: List[Dict[str, Any]],
+	auto_extract: bool,
+	current_user: User,
+	db: Session,
+) -> BulkImportResponse:
+	"""Store, dedupe and queue extraction for already measured bulk import items."""
+	if not items:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No resume files found.")
+	accepted = [item for item in items if item["status"] == "pending"]
+
+	batch_id = uuid4().hex
+
+	# Group identical files so each distinct file is stored and extracted once
+	groups: Dict[str, List[Dict[str, Any]]] = {}
+	for item in accepted:
+		groups.setdefault(item["content_hash"], []).append(item)
+
+	to_upload = []
+	for content_hash, group in groups.items():
+		leader = group[0]
+		leader["existing"] = _find_duplicate_resume(db, current_user.id, content_hash)
+		if leader["existing"]:
+			leader["storage_path"] = leader["existing"].storage_path
+			leader["status"] = "duplicate"
+		else:
+			to_upload.append(leader)
+
+	loop = asyncio.get_running_loop()
+	await asyncio.gather(*(
+		loop.run_in_executor(_upload_pool, _upload_bulk_item, item, current_user.id)
+		for item in to_upload
+	))
+
+	created: Dict[str, List[Dict[str, Any]]] = {}
+	for content_hash, group in groups.items():
+		leader = group[0]
+		for item in group:
+			if leader["status"] == "failed":
+				item["status"] = "failed"
+				item["error"] = leader["error"]
+				continue
+			if item is not leader:
+				item["status"] = "duplicate"
+			resume = Resume(
+				user_id=current_user.id,
+				title=item["file_name"],
+				file_name=item["file_name"],
+				storage_path=leader["storage_path"],
+				content_type=item["content_type"],
+				file_size=item["file_size"],
+				content_hash=content_hash,
+				import_batch_id=batch_id,
+				is_primary=False,
+			)
+			item["resume"] = resume
+			created.setdefault(content_hash, []).append(item)
+			db.add(resume)
+	db.commit()
+
+	for content_hash, created_items in created.items():
+		existing = groups[content_hash][0].get("existing")
+		pending = []
+		for item in created_items:
+			# Reuse a completed extraction of the same file instead of re-parsing it
+			if (
+				existing is not None
+				and existing.content_type == item["content_type"]
+				and _copy_extracted_content(db, existing, item["resume"].id)
+			):
+				item["extraction_status"] = ExtractionStatus.COMPLETED.value
+			else:
+				pending.append(item)
+		if auto_extract and pending:
+			for item in pending:
+				item["extraction_status"] = ExtractionStatus.PENDING.value
+			resume_ids = [item["resume"].id for item in pending]
+			_extraction_pool.submit(_extract_bulk_group, resume_ids[0], resume_ids[1:], True)
+
+	return BulkImportResponse(
+		batch_id=batch_id,
+		total=len(items),
+		items=[
+			BulkImportItem(
+				file_name=item["file_name"],
+				status=item["status"],
+				resume_id=item["resume"].id if item.get("resume") else None,
+				extraction_status=item.get("extraction_status"),
+				error=item["error"],
+			)
+			for item in items
+		],
+	)
+
+
+def _resume_etag(resume: Resume) -> Optional[str]:
+	"""
+	Strong ETag for a resume's file. The content hash identifies the bytes
+	without a storage round trip; older rows fall back to the storage ETag.
+	"""
+	if resume.content_hash:
+		return f'"{resume.content_hash}"'
+	info = get_object_info(resume.storage_path)
+	return (info or {}).get("etag")
+
+
+def _parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+	"""
+	Parse a single "bytes=" range into an inclusive (start, end).
+	Returns None when the whole file should be sent (no header, another unit,
+	or several ranges). Raises 416 when the range lies outside the file.
+	"""
+	if not header or not header.strip().lower().startswith("bytes="):
+		return None
+	spec = header.strip()[6:].strip()
+	if "," in spec or "-" not in spec:
+		return None
+	first, last = (part.strip() for part in spec.split("-", 1))
+	try:
+		if not first:
+			# Suffix range: the last N bytes
+			length = int(last)
+			if length <= 0:
+				raise ValueError
+			start, end = max(0, size - length), size - 1
+		else:
+			start = int(first)
+			end = min(int(last), size - 1) if last else size - 1
+	except ValueError:
+		return None
+	if start > end or start >= size:
+		raise HTTPException(
+			status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+			detail="Requested range not satisfiable",
+			headers={"Content-Range": f"bytes */{size}"},
+		)
+	return start, end
+
+
 @router.get("", response_model=List[ResumeResponse])
 async def list_resumes(
 	current_user: User = Depends(get_current_user),
@@ -104,8 +591,10 @@ async def list_resumes(
 		.order_by(Resume.created_at.desc())
 		.all()
 	)
-	for resume in resumes:
-		resume.file_url = resolve_resume_url(resume.storage_path)
+	# One batch sign request instead of one round trip per resume
+	file_urls = resolve_resume_urls([resume.storage_path for resume in resumes])
+	for resume, file_url in zip(resumes, file_urls):
+		resume.file_url = file_url
 	return resumes
 
 
@@ -126,6 +615,74 @@ async def get_resume(
 	return resume
 
 
+@router.get("/{resume_id}/file")
+async def download_resume(
+	resume_id: int,
+	request: Request,
+	current_user: User = Depends(get_current_user),
+	db: Session = Depends(get_db),
+):
+	"""
+	Stream the stored file through the API. Supports single byte ranges so
+	viewers can fetch pages on demand, and If-None-Match so repeat views
+	are answered with 304 without touching storage.
+	"""
+	resume = (
+		db.query(Resume)
+		.filter(Resume.id == resume_id, Resume.user_id == current_user.id)
+		.first()
+	)
+	if not resume:
+		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found")
+
+	try:
+		etag = await run_in_threadpool(_resume_etag, resume)
+	except StorageError:
+		etag = None
+	headers = {
+		"Accept-Ranges": "bytes",
+		"Cache-Control": "private, no-cache",
+		"Content-Disposition": f"inline; filename*=UTF-8''{quote(resume.file_name or '')}",
+	}
+	if etag:
+		headers["ETag"] = etag
+	if etag_matches(request.headers.get("if-none-match"), etag):
+		return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+	size = resume.file_size
+	byte_range = None
+	if_range = request.headers.get("if-range")
+	# A stale If-Range means the client's partial copy is outdated: send everything
+	if not if_range or (etag and if_range.strip() == etag):
+		byte_range = _parse_range(request.headers.get("range"), size)
+
+	if byte_range:
+		start, end = byte_range
+		headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+		status_code = status.HTTP_206_PARTIAL_CONTENT
+	else:
+		start, end = 0, size - 1
+		status_code = status.HTTP_200_OK
+	headers["Content-Length"] = str(end - start + 1)
+
+	if byte_range:
+		chunks = stream_object(resume.storage_path, start=start, end=end)
+	else:
+		chunks = stream_object(resume.storage_path)
+	try:
+		# Pull the first chunk before sending headers so storage errors become a 502
+		first_chunk = await run_in_threadpool(next, chunks, b"")
+	except StorageError as e:
+		raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(e))
+
+	return StreamingResponse(
+		chain([first_chunk], chunks),
+		status_code=status_code,
+		media_type=resume.content_type,
+		headers=headers,
+	)
+
+
 @router.post("/upload", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
 async def upload_resume(
 	background_tasks: BackgroundTasks,
@@ -139,49 +696,254 @@ async def upload_resume(
 	if not file.content_type or file.content_type not in ALLOWED_CONTENT_TYPES:
 		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid resume file type.")
 
-	content = await file.read()
-	if len(content) > MAX_RESUME_SIZE:
+	# Size and hash in one chunked pass, stopping as soon as the limit is crossed
+	try:
+		file_size, content_hash = await run_in_threadpool(measure_stream, file.file, MAX_RESUME_SIZE)
+	except UploadTooLargeError:
 		raise HTTPException(
 			status_code=status.HTTP_400_BAD_REQUEST,
 			detail="Resume must be smaller than 5MB.",
 		)
 
-	try:
-		object_path, signed_url = upload_resume_file(
-			content,
-			file.content_type,
-			file.filename,
-			current_user.id,
-		)
-	except StorageError as exc:
-		raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
-
-	resume_title = title.strip() if title and title.strip() else (file.filename or "Resume")
+	duplicate = _find_duplicate_resume(db, current_user.id, content_hash)
 
-	if is_primary:
-		db.query(Resume).filter(Resume.user_id == current_user.id).update({Resume.is_primary: False})
+	if duplicate:
+		# Same bytes already stored for this user - reuse the storage object
+		object_path = duplicate.storage_path
+		signed_url = resolve_resume_url(object_path)
+	else:
+		try:
+			object_path, signed_url = upload_resume_file(
+				file.file,
+				file.content_type,
+				file.filename,
+				current_user.id,
+				size=file_size,
+			)
+		except StorageError as exc:
+			raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
 
-	resume = Resume(
-		user_id=current_user.id,
-		title=resume_title,
-		file_name=file.filename or resume_title,
-		storage_path=object_path,
+	resume, content_reused = _create_resume_record(
+		db,
+		current_user.id,
+		title=title,
+		file_name=file.filename,
+		object_path=object_path,
 		content_type=file.content_type,
-		file_size=len(content),
+		file_size=file_size,
+		content_hash=content_hash,
 		is_primary=is_primary,
+		duplicate=duplicate,
 	)
-	db.add(resume)
-	db.commit()
-	db.refresh(resume)
 	resume.file_url = signed_url
 	
 	# Automatically extract resume content in background
-	if auto_extract:
+	if auto_extract and not content_reused:
 		background_tasks.add_task(_auto_extract_resume, resume.id, True)
 	
 	return resume
 
 
+@router.post("/upload-intent", response_model=ResumeUploadIntentResponse, status_code=status.HTTP_201_CREATED)
+async def create_upload_intent(
+	payload: ResumeUploadIntentRequest,
+	current_user: User = Depends(get_current_user),
+	db: Session = Depends(get_db),
+):
+	"""
+	Start a direct-to-storage upload. The client PUTs the file to upload_url,
+	then calls /upload-complete with upload_token; the bytes never pass through the API.
+	"""
+	if payload.content_type not in ALLOWED_CONTENT_TYPES:
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid resume file type.")
+	if payload.file_size > MAX_RESUME_SIZE:
+		raise HTTPException(
+			status_code=status.HTTP_400_BAD_REQUEST,
+			detail="Resume must be smaller than 5MB.",
+		)
+
+	content_hash = payload.sha256.lower()
+	object_path = None
+	upload_url = None
+	# Same bytes already stored for this user - skip the upload and reuse the object
+	if not _find_duplicate_resume(db, current_user.id, content_hash):
+		object_path = new_resume_object_path(current_user.id, payload.file_name, payload.content_type)
+		try:
+			upload_url = create_signed_upload_url(object_path)
+		except StorageError as exc:
+			raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+
+	expires = timedelta(minutes=settings.RESUME_UPLOAD_INTENT_EXPIRE_MINUTES)
+	upload_token = create_upload_token(
+		{
+			"sub": str(current_user.id),
+			"upload_id": uuid4().hex,
+			"object_path": object_path,
+			"file_name": payload.file_name,
+			"content_type": payload.content_type,
+			"file_size": payload.file_size,
+			"sha256": content_hash,
+			"title": payload.title,
+			"is_primary": payload.is_primary,
+		},
+		expires,
+	)
+	return ResumeUploadIntentResponse(
+		upload_token=upload_token,
+		upload_required=object_path is not None,
+		upload_url=upload_url,
+		object_path=object_path,
+		expires_in=int(expires.total_seconds()),
+	)
+
+
+@router.post("/upload-complete", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
+async def complete_upload(
+	payload: ResumeUploadComplete,
+	background_tasks: BackgroundTasks,
+	current_user: User = Depends(get_current_user),
+	db: Session = Depends(get_db),
+):
+	"""
+	Finish a direct upload: check the stored object's size and content type,
+	create the Resume and queue extraction. The SHA-256 declared in the intent
+	is verified by the background job when it downloads the file.
+	"""
+	intent = verify_token(payload.upload_token)
+	if not intent or intent.get("type") != "resume_upload" or intent.get("sub") != str(current_user.id):
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or expired upload token.")
+
+	upload_id = intent.get("upload_id")
+	object_path = intent.get("object_path")
+	# Completing twice (e.g. a client retry) returns the same resume
+	existing = _find_completed_upload(db, current_user.id, upload_id, object_path)
+	if existing:
+		existing.file_url = resolve_resume_url(existing.storage_path)
+		return existing
+
+	duplicate = None
+	if not object_path:
+		duplicate = _find_duplicate_resume(db, current_user.id, intent["sha256"])
+		if not duplicate:
+			raise HTTPException(
+				status_code=status.HTTP_409_CONFLICT,
+				detail="The stored copy of this file no longer exists. Request a new upload intent.",
+			)
+		object_path = duplicate.storage_path
+
+	# The declared size and type are only trusted once the stored object matches them,
+	# including a reused copy, which was matched on the declared hash alone
+	try:
+		info = get_object_info(object_path)
+	except StorageError as exc:
+		raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
+	if info is None:
+		if duplicate:
+			raise HTTPException(
+				status_code=status.HTTP_409_CONFLICT,
+				detail="The stored copy of this file no longer exists. Request a new upload intent.",
+			)
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="The file has not been uploaded yet.")
+
+	problem = None
+	if info["size"] is not None and info["size"] != intent["file_size"]:
+		problem = "Uploaded file size does not match the upload intent."
+	elif info["content_type"] and info["content_type"] != intent["content_type"]:
+		problem = "Uploaded file type does not match the upload intent."
+	if problem:
+		# Never delete a reused object; other resumes point at it
+		if duplicate is None:
+			try:
+				delete_objects([object_path])
+			except StorageError:
+				pass
+		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=problem)
+
+	try:
+		resume, content_reused = _create_resume_record(
+			db,
+			current_user.id,
+			title=intent.get("title"),
+			file_name=intent["file_name"],
+			object_path=object_path,
+			content_type=intent["content_type"],
+			file_size=intent["file_size"],
+			content_hash=intent["sha256"],
+			is_primary=bool(intent.get("is_primary")),
+			duplicate=duplicate,
+			upload_id=upload_id,
+		)
+	except IntegrityError:
+		# A concurrent completion of the same intent created it first
+		db.rollback()
+		existing = _find_completed_upload(db, current_user.id, upload_id, None)
+		if not existing:
+			raise
+		existing.file_url = resolve_resume_url(existing.storage_path)
+		return existing
+	resume.file_url = resolve_resume_url(object_path)
+
+	# Reused objects were hashed when first uploaded; new ones are checked in the background
+	expected_hash = intent["sha256"] if duplicate is None else None
+	if payload.auto_extract and not content_reused:
+		background_tasks.add_task(_auto_extract_resume, resume.id, True, expected_hash)
+	elif expected_hash:
+		background_tasks.add_task(_verify_upload_hash, resume.id, expected_hash)
+
+	return resume
+
+
+@router.post("/bulk", response_model=BulkImportResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_import_resumes(
+	files: List[UploadFile] = File(...),
+	auto_extract: bool = Form(True),
+	current_user: User = Depends(get_current_user),
+	db: Session = Depends(get_db),
+):
+	"""
+	Import many resumes at once from multiple files and/or zip archives.
+	Files are uploaded to storage concurrently and extracted on a bounded worker pool;
+	poll GET /resumes/imports/{batch_id} for extraction progress.
+	"""
+	items: List[Dict[str, Any]] = []
+	try:
+		# Reading, unzipping and hashing the uploads blocks, so it runs in the threadpool
+		await run_in_threadpool(_collect_bulk_items, files, items)
+		return await _import_bulk_items(items, auto_extract, current_user, db)
+	finally:
+		for item in items:
+			if item["owns_stream"]:
+				item["stream"].close()
+
+
+@router.get("/imports/{batch_id}", response_model=BulkImportResponse)
+async def get_bulk_import(
+	batch_id: str,
+	current_user: User = Depends(get_current_user),
+	db: Session = Depends(get_db),
+):
+	resumes = (
+		db.query(Resume)
+		.filter(Resume.user_id == current_user.id, Resume.import_batch_id == batch_id)
+		.order_by(Resume.id)
+		.all()
+	)
+	if not resumes:
+		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import batch not found")
+
+	items = []
+	for resume in resumes:
+		content = resume.content
+		items.append(BulkImportItem(
+			file_name=resume.file_name,
+			status="uploaded",
+			resume_id=resume.id,
+			extraction_status=content.extraction_status if content else None,
+			error=content.extraction_error if content else None,
+		))
+	return BulkImportResponse(batch_id=batch_id, total=len(items), items=items)
+
+
 @router.patch("/{resume_id}", response_model=ResumeResponse)
 async def update_resume(
 	resume_id: int,
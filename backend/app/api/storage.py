@@ -0,0 +1,72 @@
+"""
+API endpoints that serve the local storage backend.
+
+Only active when STORAGE_BACKEND is "local". Access is granted by the HMAC
+signature in the URL, not by the user's session, just like Supabase signed URLs.
+"""
+import mimetypes
+import tempfile
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+
+from app.core.config import settings
+from app.core.storage import UPLOAD_CHUNK_SIZE, StorageError, UploadTooLargeError, get_storage_backend
+from app.core.storage_local import LocalStorage
+
+router = APIRouter()
+
+
+def _authorize(method: str, object_path: str, expires: int, signature: str) -> LocalStorage:
+    backend = get_storage_backend()
+    if not isinstance(backend, LocalStorage):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    if not backend.verify_signature(method, object_path, expires, signature):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or expired signature")
+    return backend
+
+
+@router.get("/local/{object_path:path}")
+async def serve_local_file(object_path: str, expires: int, signature: str):
+    backend = _authorize("GET", object_path, expires, signature)
+    try:
+        path = backend.local_path(object_path)
+    except StorageError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    media_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    if settings.LOCAL_STORAGE_ACCEL_REDIRECT_PREFIX:
+        # Let the reverse proxy send the file with sendfile instead of streaming it through Python
+        prefix = settings.LOCAL_STORAGE_ACCEL_REDIRECT_PREFIX.rstrip("/")
+        return Response(
+            headers={"X-Accel-Redirect": f"{prefix}/{object_path}", "Content-Type": media_type},
+        )
+    return FileResponse(path, media_type=media_type)
+
+
+@router.put("/local/{object_path:path}")
+async def receive_local_upload(object_path: str, expires: int, signature: str, request: Request):
+    backend = _authorize("PUT", object_path, expires, signature)
+    try:
+        # The body is spooled in chunks as it arrives, never held in memory whole
+        written = await _write_request_body(backend, object_path, request)
+    except UploadTooLargeError:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File is too large.")
+    except StorageError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return {"Key": object_path, "size": written}
+
+
+async def _write_request_body(backend: LocalStorage, object_path: str, request: Request) -> int:
+    # Spool to a temporary file first; LocalStorage.write then moves it into place atomically
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spool:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.LOCAL_STORAGE_MAX_UPLOAD_SIZE:
+                raise UploadTooLargeError("File is too large.")
+            spool.write(chunk)
+        spool.seek(0)
+        return backend.write(object_path, iter(lambda: spool.read(UPLOAD_CHUNK_SIZE), b""))
@@ -1,14 +1,17 @@
 """
 API endpoints for resume templates.
 """
+import re
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
+from app.core.config import settings
 from app.core.database import get_db
-from app.models.resume_template import ResumeTemplate
+from app.core.http_cache import etag_matches
 from app.models.user import User
 from app.schemas.template import (
     TemplateCreate,
@@ -16,69 +19,46 @@ from app.schemas.template import (
     TemplateResponse,
     TemplateUpdate,
 )
-from app.services.template_service import get_available_templates
+from app.services.render_cache import render_cache
+from app.services.template_catalog import template_catalog
+from app.services.template_previews import (
+    SAMPLE_PURPOSE,
+    SAMPLE_RESUME,
+    preview_dir,
+    preview_key,
+    read_preview_html,
+)
+from app.services.template_service import render_resume_html
 
 router = APIRouter()
 
+PREVIEW_FILE_PATTERN = re.compile(r"^[A-Za-z0-9_-]+-[0-9a-f]{16}\.(html|png)$")
+
 
 @router.get("", response_model=List[TemplateListItem])
 async def list_templates(
+    request: Request,
+    response: Response,
     template_type: str = "resume",
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     List all available templates.
-    Returns both database templates and filesystem templates.
+    Returns both database templates and filesystem templates, served from
+    the in-memory template catalog. Answers If-None-Match with 304 while
+    no template has changed.
     """
-    # Get filesystem templates
-    fs_templates = get_available_templates()
-    
-    # Get database templates
-    db_templates = (
-        db.query(ResumeTemplate)
-        .filter(
-            ResumeTemplate.is_active == True,
-            ResumeTemplate.template_type == template_type
-        )
-        .all()
-    )
-    
-    # Combine, preferring DB over filesystem for same slug
-    db_slugs = {t.slug for t in db_templates}
-    
-    result = []
-    
-    # Add DB templates
-    for t in db_templates:
-        result.append(TemplateListItem(
-            id=t.id,
-            slug=t.slug,
-            name=t.name,
-            description=t.description,
-            template_type=t.template_type,
-            thumbnail_url=t.thumbnail_url,
-            is_active=t.is_active,
-            is_default=t.is_default,
-            version=t.version or "1.0"
-        ))
-    
-    # Add filesystem templates not in DB
-    for ft in fs_templates:
-        if ft["slug"] not in db_slugs and ft.get("type", "resume") == template_type:
-            result.append(TemplateListItem(
-                id=0,  # Filesystem templates have no DB id
-                slug=ft["slug"],
-                name=ft["name"],
-                description=ft.get("description", ""),
-                template_type=ft.get("type", "resume"),
-                thumbnail_url=None,
-                is_active=True,
-                is_default=ft["slug"] == "modern",
-                version="1.0"
-            ))
+    templates, etag = template_catalog.list(db, template_type)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.TEMPLATE_LIST_MAX_AGE}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    return result
+    response.headers.update(headers)
+    return templates
 
 
 @router.get("/{slug}", response_model=TemplateResponse)
@@ -89,146 +69,66 @@ async def get_template(
 ):
     """
     Get a specific template by slug.
+    Database templates take precedence over filesystem templates.
     """
-    # Try database first
-    template = (
-        db.query(ResumeTemplate)
-        .filter(ResumeTemplate.slug == slug, ResumeTemplate.is_active == True)
-        .first()
-    )
-    
+    template = template_catalog.get(db, slug)
     if template:
         return template
     
-    # Try filesystem
-    fs_templates = get_available_templates()
-    for ft in fs_templates:
-        if ft["slug"] == slug:
-            from app.services.template_service import load_template_css, TEMPLATES_DIR
-            
-            # Load HTML content
-            html_path = TEMPLATES_DIR / slug / "index.html"
-            with open(html_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            css_content = load_template_css(slug)
-            
-            return TemplateResponse(
-                id=0,
-                slug=slug,
-                name=ft["name"],
-                description=ft.get("description", ""),
-                template_type=ft.get("type", "resume"),
-                html_content=html_content,
-                css_content=css_content,
-                config={
-                    "supportedPurposes": ft.get("supportedPurposes", []),
-                    "defaultTokens": ft.get("defaultTokens", {}),
-                    "features": ft.get("features", []),
-                },
-                thumbnail_url=None,
-                is_active=True,
-                is_default=slug == "modern",
-                version="1.0",
-                created_at=None,
-                updated_at=None
-            )
-    
     raise HTTPException(
         status_code=status.HTTP_404_NOT_FOUND,
         detail=f"Template '{slug}' not found"
     )
 
 
+@router.get("/previews/{name}")
+async def get_template_preview_file(name: str):
+    """
+    Pre-rendered sample preview (HTML) or thumbnail (PNG). Names include the
+    template version, so responses are cacheable forever. No auth: the files
+    only contain sample data, and <img> tags can't send a bearer token.
+    """
+    if not PREVIEW_FILE_PATTERN.match(name):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Preview not found")
+    path = preview_dir() / name
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Preview not found")
+    media_type = "image/png" if name.endswith(".png") else "text/html; charset=utf-8"
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
 @router.get("/{slug}/preview")
 async def preview_template(
     slug: str,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
 ):
     """
     Get a preview of a template with sample data.
+    Served from the pre-rendered preview when it has been built. Answers
+    If-None-Match with 304 while the template is unchanged.
     """
-    from app.services.template_service import render_resume_html
-    
-    # Sample data for preview
-    sample_data = {
-        "meta": {
-            "purpose": "software_engineer",
-            "language": "en",
-            "tone": "professional"
-        },
-        "profile": {
-            "fullName": "Alex Johnson",
-            "headline": "Senior Software Engineer",
-            "contact": {
-                "email": "alex@example.com",
-                "phone": "+1 (555) 123-4567",
-                "location": "San Francisco, CA",
-                "linkedin": "linkedin.com/in/alexjohnson",
-                "portfolio": "github.com/alexj"
-            }
-        },
-        "sections": {
-            "summary": "Experienced software engineer with 8+ years building scalable web applications. Passionate about clean code, mentoring, and delivering impactful products.",
-            "experience": [
-                {
-                    "company": "TechCorp Inc.",
-                    "role": "Senior Software Engineer",
-                    "location": "San Francisco, CA",
-                    "startDate": "Jan 2021",
-                    "endDate": "Present",
-                    "bullets": [
-                        "Led development of microservices architecture serving 10M+ users",
-                        "Reduced API latency by 40% through caching optimization",
-                        "Mentored team of 5 junior developers"
-                    ]
-                },
-                {
-                    "company": "StartupXYZ",
-                    "role": "Software Engineer",
-                    "location": "Remote",
-                    "startDate": "Jun 2018",
-                    "endDate": "Dec 2020",
-                    "bullets": [
-                        "Built real-time collaboration features using WebSockets",
-                        "Implemented CI/CD pipeline reducing deployment time by 60%"
-                    ]
-                }
-            ],
-            "projects": [
-                {
-                    "name": "Open Source CLI Tool",
-                    "description": "Command-line tool for automating development workflows",
-                    "technologies": ["Python", "Click", "Docker"]
-                }
-            ],
-            "education": [
-                {
-                    "institution": "University of California, Berkeley",
-                    "degree": "B.S.",
-                    "field": "Computer Science",
-                    "startDate": "2014",
-                    "endDate": "2018"
-                }
-            ],
-            "skills": ["Python", "TypeScript", "React", "Node.js", "PostgreSQL", "AWS", "Docker", "Kubernetes"],
-            "certifications": [
-                {
-                    "name": "AWS Solutions Architect",
-                    "issuer": "Amazon Web Services",
-                    "date": "2023"
-                }
-            ],
-            "awards": []
-        }
-    }
+    cache_key = preview_key(slug)
+    etag = f'"{cache_key}"'
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
     
     try:
-        html = render_resume_html(
-            template_slug=slug,
-            resume_data=sample_data,
-            purpose="software_engineer"
+        html = read_preview_html(slug) or render_cache.get_or_render(
+            cache_key,
+            lambda: render_resume_html(
+                template_slug=slug,
+                resume_data=SAMPLE_RESUME,
+                purpose=SAMPLE_PURPOSE
+            ),
         )
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
         return {"html": html, "template_slug": slug}
     except ValueError as e:
         raise HTTPException(
@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import model_validator
+from pydantic import field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -30,14 +30,78 @@ class Settings(BaseSettings):
     DEEPSEEK_API_URL: Optional[str] = "https://api.deepseek.com/v1/chat/completions"
     AI_DAILY_QUOTA: int = 50
 
+    # File storage
+    STORAGE_BACKEND: str = "supabase"  # supabase or local
+    LOCAL_STORAGE_PATH: str = "storage"  # root directory for the local backend
+    LOCAL_STORAGE_PUBLIC_URL: str = "http://localhost:8000"  # base URL signed local links point at
+    LOCAL_STORAGE_MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # cap for presigned PUTs to the local backend
+    LOCAL_STORAGE_ACCEL_REDIRECT_PREFIX: Optional[str] = None  # e.g. /protected - let nginx sendfile the file
+
     # Supabase storage
     SUPABASE_URL: Optional[str] = None
     SUPABASE_SERVICE_ROLE_KEY: Optional[str] = None
     SUPABASE_BUCKET: Optional[str] = None
     SUPABASE_SIGNED_URL_EXPIRES_IN: int = 86400
+    SUPABASE_SIGNED_URL_REFRESH_MARGIN: int = 3600  # re-sign cached URLs with less than this left
+    SUPABASE_SIGN_CONCURRENCY: int = 8  # parallel sign requests when batch signing is unavailable
+    SIGNED_URL_CACHE_MAX_ENTRIES: int = 10000
+    SIGNED_URL_CACHE_SHARED: bool = True  # share signed URLs between workers via SQLite
+    SIGNED_URL_CACHE_DB: Optional[str] = None  # defaults to a file in the system temp dir
+
+    # Orphaned storage object cleanup (workers/storage_gc.py)
+    STORAGE_GC_GRACE_HOURS: int = 24  # never delete objects younger than this
+    STORAGE_GC_BATCH_SIZE: int = 100  # objects per bulk delete request
+    STORAGE_GC_REQUESTS_PER_SECOND: float = 5.0  # list + delete calls against storage
+    STORAGE_GC_CHECKPOINT: Optional[str] = None  # defaults to a file in the system temp dir
+
+    # Template rendering
+    TEMPLATE_BYTECODE_CACHE: bool = True  # persist compiled Jinja templates between processes
+    TEMPLATE_BYTECODE_CACHE_DIR: Optional[str] = None  # defaults to a private dir in the system temp dir
+    RENDER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # rendered preview HTML kept in memory per process
+    RENDER_CACHE_MAX_ENTRIES: int = 2000
+    TEMPLATE_CATALOG_TTL: float = 30.0  # seconds between checks for DB/filesystem template changes
+    TEMPLATE_LIST_MAX_AGE: int = 60  # Cache-Control max-age of the /templates listing
+    TEMPLATE_PREVIEW_DIR: Optional[str] = None  # pre-rendered sample previews; defaults to a dir in the system temp dir
+    TEMPLATE_PREVIEW_BASE_URL: Optional[str] = None  # defaults to the relative /api/templates/previews path; set for a CDN
+    TEMPLATE_PREVIEWS_ON_STARTUP: bool = True  # build missing previews in the background at startup
+
+    # PDF export
+    PDF_RENDER_WORKERS: int = 2  # WeasyPrint processes
+    PDF_RENDER_MAX_PENDING: int = 8  # renders running or queued before new exports get 503
+    PDF_RENDER_QUEUE_TIMEOUT: float = 30.0  # seconds to wait for a free slot
+    PDF_RENDER_TIMEOUT: float = 60.0  # seconds before a render is killed
+    PDF_CACHE: str = "disk"  # disk, storage or off
+    PDF_CACHE_DIR: Optional[str] = None  # defaults to a dir in the system temp dir
+    PDF_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # disk cache size before least recently used PDFs go
+    THUMBNAIL_WIDTH: int = 240  # px, first-page PNG previews
+    RESUME_COMPARE_MAX_VARIANTS: int = 6  # templates/token sets per compare request
+
+    # Avatars
+    AVATAR_VARIANT_SIZES: List[int] = [64, 128, 512]  # square WebP variants generated on upload
+    AVATAR_WEBP_QUALITY: int = 80
+
+    # Resume extraction
+    RESUME_PDF_ENGINE: str = "pdfplumber"  # pdfplumber (layout-aware) or pypdfium2 (fast text layer)
+    RESUME_EXTRACT_MAX_PAGES: int = 10  # 0 = no page limit
+    RESUME_DOCX_ENGINE: str = "stream"  # stream (zip + iterparse) or python-docx
+    RESUME_EXTRACTION_WORKERS: int = 4  # parallel background extractions per process
+
+    # Bulk resume import
+    RESUME_BULK_MAX_FILES: int = 50
+    RESUME_BULK_UPLOAD_CONCURRENCY: int = 4
+
+    # Direct-to-storage uploads
+    RESUME_UPLOAD_INTENT_EXPIRE_MINUTES: int = 60
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
+    @field_validator("AVATAR_VARIANT_SIZES")
+    @classmethod
+    def require_avatar_variant_size(cls, sizes: List[int]) -> List[int]:
+        if not any(size > 0 for size in sizes):
+            raise ValueError("AVATAR_VARIANT_SIZES needs at least one positive size")
+        return sizes
+
     @model_validator(mode="after")
     def apply_email_from(self):
         if self.EMAIL_FROM:
@@ -0,0 +1,18 @@
+"""
+Conditional request helpers (ETag / If-None-Match).
+"""
+from typing import Optional
+
+
+def strip_weak(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(header: Optional[str], etag: Optional[str]) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    return strip_weak(etag) in {strip_weak(candidate) for candidate in header.split(",")}
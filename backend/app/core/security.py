@@ -46,6 +46,12 @@ def create_refresh_token(data: dict):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def create_upload_token(data: dict, expires_delta: timedelta):
+    """Short-lived token that carries a direct-to-storage upload intent to its completion call."""
+    to_encode = data.copy()
+    to_encode.update({"exp": datetime.utcnow() + expires_delta, "type": "resume_upload"})
+    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+
 def verify_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -0,0 +1,129 @@
+"""
+Cache for Supabase signed URLs.
+
+Signed URLs stay valid for SUPABASE_SIGNED_URL_EXPIRES_IN seconds, so there is
+no need to ask Supabase for a new one on every request. Entries live in an
+in-process LRU and in a small SQLite file shared by every worker on the host.
+A cached URL is only handed out while it has more than the refresh margin
+left; after that it is treated as missing and re-signed.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+# Expired rows are purged from the shared tier every this many writes
+_PURGE_EVERY = 500
+
+
+class SignedUrlCache:
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 10000):
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._db_path = db_path
+        self._local = threading.local()
+        self._writes = 0
+
+    # --- shared tier ---
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self._db_path:
+            return None
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            return connection
+        try:
+            if not os.path.exists(self._db_path):
+                # Signed URLs grant access to private files - keep the file private
+                os.close(os.open(self._db_path, os.O_CREAT | os.O_WRONLY, 0o600))
+            connection = sqlite3.connect(self._db_path, timeout=1.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS signed_urls "
+                "(key TEXT PRIMARY KEY, url TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+        except (OSError, sqlite3.Error) as exc:
+            print(f"[SignedUrlCache] Shared cache disabled: {exc}")
+            self._db_path = None
+            return None
+        self._local.connection = connection
+        return connection
+
+    def _shared_get(self, key: str) -> Optional[Tuple[str, float]]:
+        connection = self._connection()
+        if connection is None:
+            return None
+        try:
+            row = connection.execute(
+                "SELECT url, expires_at FROM signed_urls WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        return (row[0], row[1]) if row else None
+
+    def _shared_set(self, key: str, url: str, expires_at: float) -> None:
+        connection = self._connection()
+        if connection is None:
+            return
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO signed_urls (key, url, expires_at) VALUES (?, ?, ?)",
+                (key, url, expires_at),
+            )
+            with self._lock:
+                self._writes += 1
+                purge = self._writes % _PURGE_EVERY == 0
+            if purge:
+                connection.execute("DELETE FROM signed_urls WHERE expires_at < ?", (time.time(),))
+        except sqlite3.Error:
+            # The shared tier is best effort; the in-process tier still works
+            pass
+
+    # --- public API ---
+
+    def get(self, key: str, min_remaining: float) -> Optional[str]:
+        """Return a cached URL that stays valid for at least min_remaining seconds."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and entry[1] - now > min_remaining:
+                self._memory.move_to_end(key)
+                return entry[0]
+
+        entry = self._shared_get(key)
+        if entry and entry[1] - now > min_remaining:
+            self._remember(key, entry[0], entry[1])
+            return entry[0]
+        return None
+
+    def set(self, key: str, url: str, expires_at: float) -> None:
+        self._remember(key, url, expires_at)
+        self._shared_set(key, url, expires_at)
+
+    def _remember(self, key: str, url: str, expires_at: float) -> None:
+        with self._lock:
+            self._memory[key] = (url, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self._max_entries:
+                self._memory.popitem(last=False)
+
+
+def _default_db_path() -> Optional[str]:
+    if not settings.SIGNED_URL_CACHE_SHARED:
+        return None
+    return settings.SIGNED_URL_CACHE_DB or os.path.join(tempfile.gettempdir(), "applypilot_signed_urls.sqlite3")
+
+
+signed_url_cache = SignedUrlCache(_default_db_path(), max_entries=settings.SIGNED_URL_CACHE_MAX_ENTRIES)
+
+
+def refresh_margin(expires_in: int) -> float:
+    """Seconds of validity a cached URL must still have to be reused."""
+    # Never require more than half the lifetime, or short-lived URLs would never be reused
+    return min(settings.SUPABASE_SIGNED_URL_REFRESH_MARGIN, expires_in / 2)
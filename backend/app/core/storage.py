@@ -1,13 +1,21 @@
+"""
+File storage for resumes and avatars.
+
+The public functions below are what the API uses. They delegate to the
+backend selected by settings.STORAGE_BACKEND: "supabase" (Supabase Storage
+over HTTP) or "local" (files on disk served with HMAC-signed URLs).
+"""
 from __future__ import annotations
 
+import abc
+import hashlib
+import re
+import threading
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 from urllib.parse import quote, urlsplit, urlunsplit
 from uuid import uuid4
 
-import requests
-from requests import RequestException
-
 from app.core.config import settings
 
 
@@ -15,90 +23,212 @@ class StorageError(RuntimeError):
     pass
 
 
-def _get_base_url() -> str:
-    if not settings.SUPABASE_URL:
-        raise StorageError("Supabase storage is not configured.")
-    return settings.SUPABASE_URL.rstrip("/")
-
+class UploadTooLargeError(StorageError):
+    pass
 
-def _get_bucket() -> str:
-    if not settings.SUPABASE_BUCKET:
-        raise StorageError("Supabase bucket is not configured.")
-    return settings.SUPABASE_BUCKET.strip()
 
+UPLOAD_CHUNK_SIZE = 256 * 1024
 
-def _get_key() -> str:
-    if not settings.SUPABASE_SERVICE_ROLE_KEY:
-        raise StorageError("Supabase service role key is not configured.")
-    return settings.SUPABASE_SERVICE_ROLE_KEY
+AVATAR_VARIANT_PATTERN = re.compile(r"^(profiles/\d+/[0-9a-f]{32})/\d+\.webp$")
 
 
-def _public_url(bucket: str, object_path: str) -> str:
-    base_url = _get_base_url()
-    bucket_encoded = quote(bucket, safe="")
-    object_encoded = quote(object_path, safe="/")
-    return f"{base_url}/storage/v1/object/public/{bucket_encoded}/{object_encoded}"
+def measure_stream(
+    stream: BinaryIO,
+    max_size: int,
+    sink: Optional[BinaryIO] = None,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> Tuple[int, str]:
+    """
+    Read a stream in chunks, returning (size, sha256 hex digest).
+    Chunks are copied to sink when given. Raises UploadTooLargeError as soon
+    as more than max_size bytes have been read, without reading the rest.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > max_size:
+            raise UploadTooLargeError(f"File exceeds {max_size} bytes.")
+        digest.update(chunk)
+        if sink is not None:
+            sink.write(chunk)
+    return size, digest.hexdigest()
+
+
+class _StreamBody:
+    """
+    Request body that reads a file in chunks. Having a length makes requests
+    send Content-Length instead of chunked transfer encoding.
+    """
 
+    def __init__(self, stream: BinaryIO, length: int, chunk_size: int = UPLOAD_CHUNK_SIZE):
+        self._stream = stream
+        self._length = length
+        self._chunk_size = chunk_size
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        remaining = self._length
+        while remaining > 0:
+            chunk = self._stream.read(min(self._chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def slice_chunks(chunks: Iterator[bytes], start: int, end: Optional[int] = None) -> Iterator[bytes]:
+    """Trim a chunk stream to the inclusive byte range start..end."""
+    position = 0
+    for chunk in chunks:
+        chunk_start = position
+        position += len(chunk)
+        if position <= start:
+            continue
+        if end is not None and chunk_start > end:
+            break
+        yield chunk[max(0, start - chunk_start):None if end is None else end - chunk_start + 1]
+        if end is not None and position > end:
+            break
+
+
+def _upload_body(content: Union[bytes, BinaryIO], size: Optional[int]) -> Union[bytes, _StreamBody]:
+    if isinstance(content, (bytes, bytearray)):
+        return content
+    if size is None:
+        raise StorageError("Upload size is required when streaming from a file.")
+    content.seek(0)
+    return _StreamBody(content, size)
+
+
+class StorageBackend(abc.ABC):
+    """
+    Operations every storage backend provides. Object paths are relative keys
+    such as resumes/{user_id}/{name}.pdf. A backend missing one of the
+    abstract operations fails when it is created, not on first use.
+    """
 
-def _extract_object_path(url: str, bucket: str) -> Optional[str]:
-    if not url:
+    name = "base"
+
+    @abc.abstractmethod
+    def upload(self, object_path: str, content: Union[bytes, BinaryIO], content_type: str, size: Optional[int] = None) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def download(self, object_path: str) -> bytes:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def stream(
+        self,
+        object_path: str,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        """Yield an object's content, or the inclusive byte range start..end of it."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def sign(self, object_path: str, expires_in: int) -> str:
+        raise NotImplementedError
+
+    def sign_many(self, object_paths: List[str], expires_in: int) -> Dict[str, str]:
+        signed = {}
+        for object_path in dict.fromkeys(object_paths):
+            try:
+                signed[object_path] = self.sign(object_path, expires_in)
+            except StorageError:
+                continue
+        return signed
+
+    @abc.abstractmethod
+    def create_upload_url(self, object_path: str) -> str:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def info(self, object_path: str) -> Optional[Dict[str, object]]:
+        """Size, content type and ETag of an object, or None if it doesn't exist."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, object_paths: List[str]) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list_folder(self, prefix: str) -> List[Dict[str, object]]:
+        """
+        Entries directly under prefix, each with "name", "is_folder" and, for
+        objects, "size" and "updated_at" (epoch seconds). Order is unspecified.
+        """
+        raise NotImplementedError
+
+    def object_path_from_url(self, url: str) -> Optional[str]:
+        """Recover the object path from a URL this backend generated, if it is one."""
         return None
 
-    markers = [
-        f"/storage/v1/object/public/{bucket}/",
-        f"/storage/v1/object/{bucket}/",
-        f"/storage/v1/object/sign/{bucket}/",
-        f"/storage/v1/object/authenticated/{bucket}/",
-    ]
 
-    for marker in markers:
-        if marker in url:
-            path = url.split(marker, 1)[1]
-            return path.split("?", 1)[0]
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
 
-    return None
+
+def get_storage_backend() -> StorageBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = (settings.STORAGE_BACKEND or "supabase").strip().lower()
+                if name == "local":
+                    from app.core.storage_local import LocalStorage
+                    _backend = LocalStorage.from_settings()
+                elif name == "supabase":
+                    from app.core.storage_supabase import SupabaseStorage
+                    _backend = SupabaseStorage()
+                else:
+                    raise StorageError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
+    return _backend
 
 
 def create_signed_url(object_path: str, expires_in: Optional[int] = None) -> str:
-    base_url = _get_base_url()
-    bucket = _get_bucket()
-    key = _get_key()
-    expires_in = expires_in or settings.SUPABASE_SIGNED_URL_EXPIRES_IN
-
-    bucket_encoded = quote(bucket, safe="")
-    object_encoded = quote(object_path, safe="/")
-    payload = {"expiresIn": int(expires_in)}
-    headers = {
-        "Authorization": f"Bearer {key}",
-        "apikey": key,
-        "Content-Type": "application/json",
-    }
-
-    endpoints = [
-        f"{base_url}/storage/v1/object/sign/{bucket_encoded}/{object_encoded}",
-        f"{base_url}/storage/v1/object/{bucket_encoded}/{object_encoded}/sign",
-    ]
-
-    last_status = None
-    for endpoint in endpoints:
-        try:
-            response = requests.post(endpoint, headers=headers, json=payload, timeout=30)
-        except RequestException as exc:
-            raise StorageError(f"Supabase signed URL request failed: {exc}") from exc
-        last_status = response.status_code
-        if response.status_code < 300:
-            data = response.json()
-            signed_url = data.get("signedURL") or data.get("signedUrl") or data.get("signed_url")
-            if signed_url:
-                if signed_url.startswith("http"):
-                    return _sanitize_url(signed_url)
-                if signed_url.startswith("/"):
-                    # Supabase returns relative URLs like /object/sign/... 
-                    # We need to prepend base_url + /storage/v1
-                    return _sanitize_url(f"{base_url}/storage/v1{signed_url}")
-                return _sanitize_url(f"{base_url}/storage/v1/{signed_url}")
-
-    raise StorageError(f"Supabase signed URL failed: {last_status}")
+    return get_storage_backend().sign(object_path, int(expires_in or settings.SUPABASE_SIGNED_URL_EXPIRES_IN))
+
+
+def create_signed_urls(object_paths: List[str], expires_in: Optional[int] = None) -> Dict[str, str]:
+    """
+    Sign several object paths, returning {object_path: signed_url}.
+    Paths that can't be signed are missing from the result.
+    """
+    return get_storage_backend().sign_many(
+        object_paths,
+        int(expires_in or settings.SUPABASE_SIGNED_URL_EXPIRES_IN),
+    )
+
+
+def create_signed_upload_url(object_path: str) -> str:
+    """Presign a one-time upload of object_path so the client can PUT the file straight to storage."""
+    return get_storage_backend().create_upload_url(object_path)
+
+
+def get_object_info(object_path: str) -> Optional[Dict[str, object]]:
+    return get_storage_backend().info(object_path)
+
+
+def delete_objects(object_paths: List[str]) -> None:
+    if object_paths:
+        get_storage_backend().delete(object_paths)
+
+
+def get_sign_endpoint_stats() -> Dict[str, object]:
+    """Supabase sign endpoint probe counters (empty for other backends)."""
+    if get_storage_backend().name != "supabase":
+        return {}
+    from app.core.storage_supabase import get_sign_endpoint_stats as supabase_stats
+    return supabase_stats()
 
 
 def _resolve_extension(filename: Optional[str], content_type: Optional[str]) -> str:
@@ -126,46 +256,61 @@ def _resolve_extension(filename: Optional[str], content_type: Optional[str]) ->
 
 
 def upload_profile_avatar(
-    content: bytes,
+    content: Union[bytes, BinaryIO],
     content_type: str,
     filename: Optional[str],
     user_id: int,
+    size: Optional[int] = None,
 ) -> Tuple[str, str]:
-    base_url = _get_base_url()
-    bucket = _get_bucket()
-    key = _get_key()
-
+    """Upload bytes, or stream a seekable file of the given size, to storage."""
     extension = _resolve_extension(filename, content_type)
     object_path = f"profiles/{user_id}/{uuid4().hex}{extension}"
-    bucket_encoded = quote(bucket, safe="")
-    object_encoded = quote(object_path, safe="/")
-    upload_url = f"{base_url}/storage/v1/object/{bucket_encoded}/{object_encoded}"
-
-    headers = {
-        "Authorization": f"Bearer {key}",
-        "apikey": key,
-        "Content-Type": content_type or "application/octet-stream",
-        "x-upsert": "true",
-    }
-
-    response = requests.post(upload_url, headers=headers, data=content, timeout=30)
-    if response.status_code >= 300:
-        raise StorageError(f"Supabase upload failed: {response.status_code}")
+    get_storage_backend().upload(object_path, content, content_type, size)
 
     signed_url = create_signed_url(object_path)
     return object_path, signed_url
 
 
-def resolve_avatar_url(stored_value: Optional[str]) -> Optional[str]:
+def upload_avatar_variants(variants: Dict[int, bytes], user_id: int) -> str:
+    """
+    Upload WebP avatar variants as profiles/{user_id}/{key}/{size}.webp.
+    Returns the object path of the largest variant, which is what gets stored.
+    """
+    key = uuid4().hex
+    backend = get_storage_backend()
+    for size, content in variants.items():
+        backend.upload(f"profiles/{user_id}/{key}/{size}.webp", content, "image/webp")
+    return f"profiles/{user_id}/{key}/{max(variants)}.webp"
+
+
+def resolve_avatar_variants(stored_value: Optional[str], sizes: List[int]) -> Optional[Dict[str, str]]:
+    """
+    Signed URLs for every size of a stored avatar, keyed by size. Returns None
+    for avatars uploaded before variants existed.
+    """
+    value = (stored_value or "").strip()
+    object_path = get_storage_backend().object_path_from_url(value) if value.startswith("http") else value
+    match = AVATAR_VARIANT_PATTERN.match(object_path or "")
+    if not match:
+        return None
+    paths = {size: f"{match.group(1)}/{size}.webp" for size in sizes}
+    try:
+        signed = create_signed_urls(list(paths.values()))
+    except StorageError:
+        return None
+    return {str(size): signed[path] for size, path in paths.items() if path in signed}
+
+
+def _resolve_stored_url(stored_value: Optional[str]) -> Optional[str]:
     if not stored_value:
         return None
 
-    bucket = _get_bucket()
+    backend = get_storage_backend()
     value = stored_value.strip()
 
     # If value is already a public/signed URL, try to extract path and sign it.
     if value.startswith("http"):
-        object_path = _extract_object_path(value, bucket)
+        object_path = backend.object_path_from_url(value)
         if object_path:
             try:
                 return create_signed_url(object_path)
@@ -180,69 +325,66 @@ def resolve_avatar_url(stored_value: Optional[str]) -> Optional[str]:
         return _sanitize_url(value)
 
 
+def resolve_avatar_url(stored_value: Optional[str]) -> Optional[str]:
+    return _resolve_stored_url(stored_value)
+
+
+def new_resume_object_path(user_id: int, filename: Optional[str], content_type: Optional[str]) -> str:
+    return f"resumes/{user_id}/{uuid4().hex}{_resolve_extension(filename, content_type)}"
+
+
 def upload_resume_file(
-    content: bytes,
+    content: Union[bytes, BinaryIO],
     content_type: str,
     filename: Optional[str],
     user_id: int,
+    size: Optional[int] = None,
 ) -> Tuple[str, str]:
-    base_url = _get_base_url()
-    bucket = _get_bucket()
-    key = _get_key()
-
-    extension = _resolve_extension(filename, content_type)
-    object_path = f"resumes/{user_id}/{uuid4().hex}{extension}"
-    bucket_encoded = quote(bucket, safe="")
-    object_encoded = quote(object_path, safe="/")
-    upload_url = f"{base_url}/storage/v1/object/{bucket_encoded}/{object_encoded}"
-
-    headers = {
-        "Authorization": f"Bearer {key}",
-        "apikey": key,
-        "Content-Type": content_type or "application/octet-stream",
-        "x-upsert": "true",
-    }
-
-    try:
-        response = requests.post(upload_url, headers=headers, data=content, timeout=30)
-        if response.status_code >= 300:
-            raise StorageError(f"Supabase upload failed: {response.status_code}")
-    except requests.exceptions.ConnectionError as e:
-        raise StorageError(f"Unable to connect to storage service. Please check your internet connection and try again.")
-    except requests.exceptions.Timeout:
-        raise StorageError(f"Storage upload timed out. Please try again.")
-    except requests.exceptions.RequestException as e:
-        raise StorageError(f"Storage upload failed: {str(e)}")
+    """Upload bytes, or stream a seekable file of the given size, to storage."""
+    object_path = new_resume_object_path(user_id, filename, content_type)
+    get_storage_backend().upload(object_path, content, content_type, size)
 
     signed_url = create_signed_url(object_path)
     return object_path, signed_url
 
 
 def resolve_resume_url(stored_value: Optional[str]) -> Optional[str]:
-    if not stored_value:
-        return None
+    return _resolve_stored_url(stored_value)
 
-    bucket = _get_bucket()
-    value = stored_value.strip()
 
-    if value.startswith("http"):
-        object_path = _extract_object_path(value, bucket)
-        if object_path:
-            try:
-                return create_signed_url(object_path)
-            except StorageError:
-                return value
-        return _sanitize_url(value)
+def resolve_resume_urls(stored_values: List[Optional[str]]) -> List[Optional[str]]:
+    """Batch version of resolve_resume_url; results are in input order."""
+    if not any(stored_values):
+        return [None for _ in stored_values]
+
+    backend = get_storage_backend()
+    object_paths: List[Optional[str]] = []
+    for stored_value in stored_values:
+        value = (stored_value or "").strip()
+        object_paths.append(backend.object_path_from_url(value) if value.startswith("http") else value or None)
 
     try:
-        return create_signed_url(value)
+        signed = create_signed_urls([path for path in object_paths if path])
     except StorageError:
-        return _sanitize_url(value)
+        signed = {}
+
+    resolved: List[Optional[str]] = []
+    for stored_value, object_path in zip(stored_values, object_paths):
+        if not stored_value:
+            resolved.append(None)
+        elif object_path and object_path in signed:
+            resolved.append(signed[object_path])
+        elif object_path and stored_value.strip().startswith("http"):
+            # Same fallback as resolve_resume_url: keep the stored URL as-is
+            resolved.append(stored_value.strip())
+        else:
+            resolved.append(_sanitize_url(stored_value.strip()))
+    return resolved
 
 
 def download_resume_file(object_path: str) -> bytes:
     """
-    Download resume file content from Supabase storage.
+    Download resume file content from storage.
     
     Args:
         object_path: The object path in storage (e.g., resumes/1/abc123.pdf)
@@ -253,31 +395,20 @@ def download_resume_file(object_path: str) -> bytes:
     Raises:
         StorageError: If download fails
     """
-    base_url = _get_base_url()
-    bucket = _get_bucket()
-    key = _get_key()
-    
-    bucket_encoded = quote(bucket, safe="")
-    object_encoded = quote(object_path, safe="/")
-    download_url = f"{base_url}/storage/v1/object/{bucket_encoded}/{object_encoded}"
-    
-    headers = {
-        "Authorization": f"Bearer {key}",
-        "apikey": key,
-    }
-    
-    try:
-        response = requests.get(download_url, headers=headers, timeout=60)
-        if response.status_code >= 300:
-            raise StorageError(f"Supabase download failed: {response.status_code}")
-    except requests.exceptions.ConnectionError:
-        raise StorageError(f"Unable to connect to storage service. Please check your internet connection and try again.")
-    except requests.exceptions.Timeout:
-        raise StorageError(f"Storage download timed out. Please try again.")
-    except requests.exceptions.RequestException as e:
-        raise StorageError(f"Storage download failed: {str(e)}")
-    
-    return response.content
+    return get_storage_backend().download(object_path)
+
+
+def stream_object(
+    object_path: str,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+) -> Iterator[bytes]:
+    """
+    Yield a stored object's content in chunks, optionally only the inclusive
+    byte range start..end. Errors surface when iteration starts.
+    """
+    return get_storage_backend().stream(object_path, chunk_size, start, end)
 
 
 def _sanitize_url(url: str) -> str:
@@ -0,0 +1,175 @@
+"""
+Local filesystem storage backend.
+
+Objects are files under LOCAL_STORAGE_PATH. Signed URLs point at the
+/api/storage/local route and carry an expiry plus an HMAC of the method,
+path and expiry, so they work like Supabase signed URLs without a database.
+Intended for tests, benchmarks and single-node deployments.
+"""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import mimetypes
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import quote, unquote, urlsplit
+
+from app.core.config import settings
+from app.core.storage import UPLOAD_CHUNK_SIZE, StorageBackend, StorageError, UploadTooLargeError
+
+LOCAL_ROUTE = "/api/storage/local"
+
+# Matches Supabase's lifetime for presigned uploads
+UPLOAD_URL_EXPIRES_IN = 2 * 60 * 60
+
+
+class LocalStorage(StorageBackend):
+    """Objects stored as files under a root directory."""
+
+    name = "local"
+
+    def __init__(self, root: str, public_url: str, secret: str):
+        self.root = Path(root).resolve()
+        self.public_url = public_url.rstrip("/")
+        self._secret = secret.encode("utf-8")
+
+    @classmethod
+    def from_settings(cls) -> "LocalStorage":
+        return cls(settings.LOCAL_STORAGE_PATH, settings.LOCAL_STORAGE_PUBLIC_URL, settings.SECRET_KEY)
+
+    # --- paths and signatures ---
+
+    def local_path(self, object_path: str) -> Path:
+        """Filesystem path for an object, refusing paths that escape the root."""
+        path = (self.root / object_path.lstrip("/")).resolve()
+        if path == self.root or self.root not in path.parents:
+            raise StorageError("Invalid object path.")
+        return path
+
+    def _signature(self, method: str, object_path: str, expires: int) -> str:
+        message = f"{method.upper()}\n{object_path}\n{expires}".encode("utf-8")
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def _signed_url(self, method: str, object_path: str, expires_in: int) -> str:
+        expires = int(time.time()) + int(expires_in)
+        signature = self._signature(method, object_path, expires)
+        return f"{self.public_url}{LOCAL_ROUTE}/{quote(object_path, safe='/')}?expires={expires}&signature={signature}"
+
+    def verify_signature(self, method: str, object_path: str, expires: int, signature: str) -> bool:
+        if expires < time.time():
+            return False
+        return hmac.compare_digest(self._signature(method, object_path, expires), signature)
+
+    # --- StorageBackend ---
+
+    def upload(self, object_path, content, content_type, size=None):
+        if isinstance(content, (bytes, bytearray)):
+            self.write(object_path, iter([bytes(content)]))
+            return
+        if size is None:
+            raise StorageError("Upload size is required when streaming from a file.")
+        content.seek(0)
+        self.write(object_path, iter(lambda: content.read(UPLOAD_CHUNK_SIZE), b""), max_size=size)
+
+    def write(self, object_path: str, chunks: Iterator[bytes], max_size: Optional[int] = None) -> int:
+        """
+        Write chunks to a temporary file and move it into place atomically, so
+        readers never see a partial object. Returns the number of bytes written.
+        """
+        path = self.local_path(object_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".upload-")
+        written = 0
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                for chunk in chunks:
+                    written += len(chunk)
+                    if max_size is not None and written > max_size:
+                        raise UploadTooLargeError(f"File exceeds {max_size} bytes.")
+                    handle.write(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return written
+
+    def download(self, object_path):
+        try:
+            return self.local_path(object_path).read_bytes()
+        except FileNotFoundError as exc:
+            raise StorageError("Stored file not found.") from exc
+
+    def stream(self, object_path, chunk_size=UPLOAD_CHUNK_SIZE, start=None, end=None):
+        try:
+            handle = open(self.local_path(object_path), "rb")
+        except FileNotFoundError as exc:
+            raise StorageError("Stored file not found.") from exc
+        with handle:
+            handle.seek(start or 0)
+            remaining = None if end is None else end - (start or 0) + 1
+            while remaining is None or remaining > 0:
+                chunk = handle.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def sign(self, object_path, expires_in):
+        self.local_path(object_path)
+        return self._signed_url("GET", object_path, expires_in)
+
+    def create_upload_url(self, object_path):
+        self.local_path(object_path)
+        return self._signed_url("PUT", object_path, UPLOAD_URL_EXPIRES_IN)
+
+    def info(self, object_path):
+        try:
+            stat = self.local_path(object_path).stat()
+        except FileNotFoundError:
+            return None
+        return {
+            "size": stat.st_size,
+            "content_type": mimetypes.guess_type(object_path)[0],
+            "etag": f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"',
+        }
+
+    def delete(self, object_paths):
+        for object_path in object_paths:
+            try:
+                self.local_path(object_path).unlink()
+            except FileNotFoundError:
+                continue
+
+    def list_folder(self, prefix):
+        folder = self.local_path(prefix) if prefix.strip("/") else self.root
+        entries = []
+        try:
+            children = list(os.scandir(folder))
+        except (FileNotFoundError, NotADirectoryError):
+            return entries
+        for entry in children:
+            if entry.is_dir(follow_symlinks=False):
+                entries.append({"name": entry.name, "is_folder": True})
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                entries.append({
+                    "name": entry.name,
+                    "is_folder": False,
+                    "size": stat.st_size,
+                    "updated_at": stat.st_mtime,
+                })
+        return entries
+
+    def object_path_from_url(self, url):
+        prefix = f"{self.public_url}{LOCAL_ROUTE}/"
+        if not url.startswith(prefix):
+            return None
+        return unquote(urlsplit(url).path[len(urlsplit(prefix).path):])
@@ -26,6 +26,12 @@ async def periodic_tasks():
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting up...")
+    from app.core.config import settings
+    from app.services.template_catalog import load_template_catalog
+    from app.services.template_previews import start_preview_build
+    await asyncio.to_thread(load_template_catalog)
+    if settings.TEMPLATE_PREVIEWS_ON_STARTUP:
+        start_preview_build()
     task = asyncio.create_task(periodic_tasks())
     yield
     # Shutdown
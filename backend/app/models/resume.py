@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -7,6 +7,9 @@ from app.core.database import Base
 
 class Resume(Base):
 	__tablename__ = "resumes"
+	__table_args__ = (
+		Index("ix_resumes_user_id_content_hash", "user_id", "content_hash"),
+	)
 
 	id = Column(Integer, primary_key=True, index=True)
 	user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -16,6 +19,10 @@ class Resume(Base):
 	storage_path = Column(String, nullable=False)
 	content_type = Column(String, nullable=False)
 	file_size = Column(Integer, nullable=False)
+	content_hash = Column(String(64), nullable=True)
+	import_batch_id = Column(String(32), nullable=True, index=True)
+	# Direct upload intent this resume completed; makes repeated completion idempotent
+	upload_id = Column(String(32), nullable=True, unique=True, index=True)
 	is_primary = Column(Boolean, default=False)
 
 	created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import BaseModel
 
@@ -42,6 +42,7 @@ class ProfileUpdate(ProfileBase):
 class ProfileResponse(ProfileBase):
     id: int
     user_id: int
+    avatar_variants: Optional[Dict[str, str]] = None  # size in px -> signed WebP URL
     created_at: datetime
     updated_at: Optional[datetime] = None
 
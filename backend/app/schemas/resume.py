@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 
 class ResumeBase(BaseModel):
@@ -27,6 +27,8 @@ class ResumeResponse(BaseModel):
     file_name: str
     content_type: str
     file_size: int
+    content_hash: Optional[str] = None
+    import_batch_id: Optional[str] = None
     is_primary: bool
     storage_path: str
     file_url: Optional[str] = None
@@ -35,3 +37,39 @@ class ResumeResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class BulkImportItem(BaseModel):
+    file_name: str
+    status: str  # uploaded, duplicate, rejected, failed
+    resume_id: Optional[int] = None
+    extraction_status: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkImportResponse(BaseModel):
+    batch_id: str
+    total: int
+    items: List[BulkImportItem]
+
+
+class ResumeUploadIntentRequest(BaseModel):
+    file_name: str = Field(..., min_length=1, max_length=255)
+    content_type: str
+    file_size: int = Field(..., gt=0)
+    sha256: str = Field(..., pattern=r"^[0-9a-fA-F]{64}$")
+    title: Optional[str] = None
+    is_primary: bool = False
+
+
+class ResumeUploadIntentResponse(BaseModel):
+    upload_token: str
+    upload_required: bool  # False when the same file is already stored and will be reused
+    upload_url: Optional[str] = None  # PUT the file here, with its Content-Type
+    object_path: Optional[str] = None
+    expires_in: int
+
+
+class ResumeUploadComplete(BaseModel):
+    upload_token: str
+    auto_extract: bool = True
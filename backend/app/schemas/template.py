@@ -58,7 +58,7 @@ class TemplateResponse(BaseModel):
     is_active: bool
     is_default: bool
     version: str
-    created_at: datetime
+    created_at: Optional[datetime] = None  # None for filesystem templates
     updated_at: Optional[datetime] = None
 
     class Config:
@@ -96,6 +96,58 @@ class RenderResumeResponse(BaseModel):
     tokens_used: Dict[str, str]
 
 
+class RenderFragmentsRequest(RenderResumeRequest):
+    """Request for the sections of a preview that changed"""
+    structured_data: Optional[Dict[str, Any]] = None  # unsaved editor content; defaults to the stored content
+    known_layout: Optional[str] = None  # layout_key of the document the client shows
+    known_fragments: Dict[str, str] = Field(default_factory=dict)  # section -> fragment key the client has
+
+
+class ResumeFragment(BaseModel):
+    """Rendered HTML of one section"""
+    section: str
+    key: str
+    html: str
+
+
+class RenderFragmentsResponse(BaseModel):
+    """Changed sections, or the whole document when the layout changed"""
+    template_slug: str
+    tokens_used: Dict[str, str]
+    layout_key: str
+    sections: Dict[str, str]  # section -> fragment key for every section, in document order
+    fragments: List[ResumeFragment]  # only the sections whose key the client does not have
+    html: Optional[str] = None  # full document when known_layout is stale or the template doesn't split into sections
+
+
+class CompareVariant(BaseModel):
+    """One template/token combination to compare"""
+    template_slug: str
+    design_tokens: Optional[Dict[str, str]] = None
+
+
+class CompareResumeRequest(BaseModel):
+    """Request to render one resume with several templates at once"""
+    variants: List[CompareVariant] = Field(..., min_length=1)
+    purpose: Optional[str] = None
+    include_thumbnails: bool = False
+    thumbnail_width: Optional[int] = Field(None, ge=64, le=800)  # px, defaults to THUMBNAIL_WIDTH
+
+
+class CompareResumeItem(BaseModel):
+    """Rendered HTML for one variant"""
+    html: str
+    template_slug: str
+    tokens_used: Dict[str, str]
+    etag: str
+    thumbnail: Optional[str] = None  # PNG data URL of the first page
+
+
+class CompareResumeResponse(BaseModel):
+    """Rendered variants, in request order"""
+    results: List[CompareResumeItem]
+
+
 # === Export Request ===
 class ExportResumeRequest(BaseModel):
     """Request to export resume as PDF or DOCX"""
@@ -0,0 +1,69 @@
+"""
+Avatar image processing - turns an uploaded photo into small square WebP variants.
+"""
+import io
+from typing import BinaryIO, Dict, List, Optional
+
+# Image processing - optional
+try:
+    from PIL import Image, ImageOps, features
+    PIL_AVAILABLE = features.check("webp")
+except ImportError:
+    PIL_AVAILABLE = False
+
+from app.core.config import settings
+
+# Larger images are refused before decoding (about a 50 MP photo)
+MAX_AVATAR_PIXELS = 50_000_000
+
+
+# Used if settings were changed at runtime to leave no valid size
+DEFAULT_AVATAR_VARIANT_SIZES = [64, 128, 512]
+
+
+def avatar_variant_sizes() -> List[int]:
+    sizes = {int(size) for size in settings.AVATAR_VARIANT_SIZES if int(size) > 0}
+    return sorted(sizes or DEFAULT_AVATAR_VARIANT_SIZES)
+
+
+def build_avatar_variants(stream: BinaryIO, sizes: Optional[List[int]] = None) -> Dict[int, bytes]:
+    """
+    Decode an image once and encode a square WebP for each size, largest first.
+
+    The photo is rotated according to its EXIF orientation and centre-cropped.
+    Metadata (EXIF, GPS, ICC) is not copied into the variants. Images are never
+    upscaled, so a small source gives variants no larger than itself.
+
+    Returns {size: webp_bytes}. Raises ValueError if the data isn't a usable image.
+    """
+    if not PIL_AVAILABLE:
+        raise RuntimeError("Pillow with WebP support is not installed.")
+    sizes = sorted(sizes or avatar_variant_sizes(), reverse=True)
+
+    stream.seek(0)
+    try:
+        image = Image.open(stream)
+        if image.width * image.height > MAX_AVATAR_PIXELS:
+            raise ValueError("Image dimensions are too large.")
+        # JPEG can decode at 1/2, 1/4 or 1/8 scale, much cheaper for phone photos
+        image.draft("RGB", (sizes[0], sizes[0]))
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    except (OSError, SyntaxError, Image.DecompressionBombError) as exc:
+        raise ValueError("Invalid image file.") from exc
+
+    mode = "RGBA" if image.mode in ("RGBA", "LA", "P", "PA") else "RGB"
+    image = image.convert(mode)
+    edge = min(image.width, image.height)
+    # Each variant is resized from the previous (larger) one
+    source = ImageOps.fit(image, (edge, edge), method=Image.Resampling.LANCZOS)
+
+    variants: Dict[int, bytes] = {}
+    for size in sizes:
+        target = min(size, edge)
+        if source.width != target:
+            source = source.resize((target, target), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        source.save(buffer, format="WEBP", quality=settings.AVATAR_WEBP_QUALITY, method=4)
+        variants[size] = buffer.getvalue()
+    return variants
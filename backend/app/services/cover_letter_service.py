@@ -1,20 +1,16 @@
 """Cover Letter rendering and export service."""
 
+import hashlib
 import io
 import json
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from jinja2 import Template
-
-# PDF export - WeasyPrint requires GTK libraries on Windows
-try:
-    from weasyprint import HTML
-    WEASYPRINT_AVAILABLE = True
-except (ImportError, OSError):
-    HTML = None
-    WEASYPRINT_AVAILABLE = False
+from sqlalchemy.orm import Session
 
 # DOCX export
 try:
@@ -27,8 +23,22 @@ except ImportError:
     DOCX_AVAILABLE = False
 
 
+from app.models.resume_template import ResumeTemplate, TemplateType
+from app.services.pdf_renderer import STYLESHEET_PLACEHOLDER, get_or_render_pdf
+from app.services.render_cache import render_cache_key
+from app.services.template_service import FileCache
+
+
 TEMPLATES_DIR = Path(__file__).parent.parent.parent / "templates" / "cover_letter"
 
+# Template files are re-read only when they change on disk
+_template_files = FileCache()
+
+# Compiled templates keyed by (slug, sha256 of the HTML)
+COMPILED_TEMPLATE_CACHE_SIZE = 64
+_compiled_templates: "OrderedDict[Tuple[str, str], Template]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
 
 def get_available_templates() -> list[dict]:
     """Get list of available cover letter templates."""
@@ -39,54 +49,103 @@ def get_available_templates() -> list[dict]:
     
     for template_dir in TEMPLATES_DIR.iterdir():
         if template_dir.is_dir():
-            config_path = template_dir / "config.json"
-            if config_path.exists():
-                with open(config_path, "r", encoding="utf-8") as f:
-                    config = json.load(f)
-                    templates.append({
-                        "slug": template_dir.name,
-                        "name": config.get("name", template_dir.name.title()),
-                        "description": config.get("description", ""),
-                        "supported_purposes": config.get("supported_purposes", []),
-                        "default_tokens": config.get("default_tokens", {}),
-                        "features": config.get("features", []),
-                    })
+            config = _template_files.get(template_dir / "config.json", json.loads)
+            if config is not None:
+                templates.append({
+                    "slug": template_dir.name,
+                    "name": config.get("name", template_dir.name.title()),
+                    "description": config.get("description", ""),
+                    "supported_purposes": config.get("supported_purposes", []),
+                    "default_tokens": config.get("default_tokens", {}),
+                    "features": config.get("features", []),
+                })
     
     return templates
 
 
-def get_template(slug: str) -> Optional[dict]:
-    """Get a specific template by slug."""
+def _read_html(text: str) -> Tuple[str, str]:
+    return text, hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _get_filesystem_template(slug: str) -> Optional[dict]:
     template_dir = TEMPLATES_DIR / slug
-    if not template_dir.exists():
-        return None
-    
-    config_path = template_dir / "config.json"
-    html_path = template_dir / "index.html"
-    css_path = template_dir / "styles.css"
-    
-    if not all(p.exists() for p in [config_path, html_path, css_path]):
+    config = _template_files.get(template_dir / "config.json", json.loads)
+    html = _template_files.get(template_dir / "index.html", _read_html)
+    css_content = _template_files.get(template_dir / "styles.css")
+    if config is None or html is None or css_content is None:
         return None
     
-    with open(config_path, "r", encoding="utf-8") as f:
-        config = json.load(f)
-    
-    with open(html_path, "r", encoding="utf-8") as f:
-        html_content = f.read()
-    
-    with open(css_path, "r", encoding="utf-8") as f:
-        css_content = f.read()
-    
+    html_content, html_hash = html
     return {
         "slug": slug,
         "name": config.get("name", slug.title()),
         "description": config.get("description", ""),
         "html_content": html_content,
+        "html_hash": html_hash,
         "css_content": css_content,
         "config": config,
     }
 
 
+def _get_db_template(db: Session, slug: str) -> Optional[dict]:
+    row = (
+        db.query(ResumeTemplate)
+        .filter(
+            ResumeTemplate.slug == slug,
+            ResumeTemplate.template_type == TemplateType.COVER_LETTER.value,
+            ResumeTemplate.is_active == True,
+        )
+        .first()
+    )
+    if not row:
+        return None
+    
+    html_content, html_hash = _read_html(row.html_content or "")
+    return {
+        "slug": row.slug,
+        "name": row.name,
+        "description": row.description or "",
+        "html_content": html_content,
+        "html_hash": html_hash,
+        "css_content": row.css_content or "",
+        "config": row.config or {},
+    }
+
+
+def get_template(slug: str, db: Optional[Session] = None) -> Optional[dict]:
+    """
+    Get a specific template by slug. With a session, an active cover letter
+    row in resume_templates takes precedence over the filesystem template.
+    """
+    if "/" in slug or "\\" in slug or slug.startswith("."):
+        return None
+    if db is not None:
+        template = _get_db_template(db, slug)
+        if template:
+            return template
+    return _get_filesystem_template(slug)
+
+
+def _compile_template(template_data: dict) -> Template:
+    """
+    Compiled template for this slug and HTML content, compiled on first use.
+    Edited files or rows hash differently, so they are recompiled.
+    """
+    key = (template_data["slug"], template_data["html_hash"])
+    with _compiled_lock:
+        template = _compiled_templates.get(key)
+        if template is not None:
+            _compiled_templates.move_to_end(key)
+            return template
+    
+    template = Template(template_data["html_content"])
+    with _compiled_lock:
+        _compiled_templates[key] = template
+        while len(_compiled_templates) > COMPILED_TEMPLATE_CACHE_SIZE:
+            _compiled_templates.popitem(last=False)
+    return template
+
+
 def resolve_design_tokens(tokens: Optional[dict]) -> dict:
     """Resolve design tokens to CSS classes."""
     default_tokens = {
@@ -127,25 +186,64 @@ def resolve_design_tokens(tokens: Optional[dict]) -> dict:
     }
 
 
+def resolve_template(template_slug: str, db: Optional[Session]) -> dict:
+    """
+    Template row (or file) for a slug, falling back to formal. Resolve once
+    per request and pass the result on, so HTML and CSS come from one row.
+    """
+    template_data = get_template(template_slug, db)
+    if not template_data:
+        # Fallback to formal template
+        template_data = get_template("formal", db)
+        if not template_data:
+            raise ValueError(f"Template '{template_slug}' not found and no fallback available")
+    return template_data
+
+
+def cover_letter_render_key(
+    content: dict,
+    template_slug: str = "formal",
+    design_tokens: Optional[dict] = None,
+    profile: Optional[dict] = None,
+    db: Optional[Session] = None,
+) -> str:
+    """Render cache key (and ETag) for render_cover_letter_html with the same arguments."""
+    template_data = resolve_template(template_slug, db)
+    return render_cache_key(
+        "cover_letter",
+        template_data["slug"],
+        template_data["html_hash"],
+        template_data["css_content"],
+        content,
+        resolve_design_tokens(design_tokens)["tokens"],
+        profile,
+        # The letter is dated, so the key changes daily
+        datetime.now().strftime("%B %d, %Y"),
+    )
+
+
 def render_cover_letter_html(
     content: dict,
     template_slug: str = "formal",
     design_tokens: Optional[dict] = None,
     profile: Optional[dict] = None,
+    db: Optional[Session] = None,
+    inline_css: bool = True,
+    template_data: Optional[dict] = None,
 ) -> str:
-    """Render a cover letter to HTML using the specified template."""
-    template_data = get_template(template_slug)
-    if not template_data:
-        # Fallback to formal template
-        template_data = get_template("formal")
-        if not template_data:
-            raise ValueError(f"Template '{template_slug}' not found and no fallback available")
+    """
+    Render a cover letter to HTML using the specified template. With
+    inline_css=False the template CSS is replaced by STYLESHEET_PLACEHOLDER;
+    PDF export passes it to the renderer separately (see export_stylesheet).
+    template_data, from resolve_template, overrides template_slug.
+    """
+    template_data = template_data or resolve_template(template_slug, db)
     
     # Resolve design tokens
     token_result = resolve_design_tokens(design_tokens)
     
     # Add token classes to body tag in CSS
-    css_content = template_data["css_content"]
+    css_content = template_data["css_content"] if inline_css else STYLESHEET_PLACEHOLDER
     
     # Prepare template context
     meta = content.get("meta", {})
@@ -164,7 +262,7 @@ def render_cover_letter_html(
     }
     
     # Render HTML template
-    html_template = Template(template_data["html_content"])
+    html_template = _compile_template(template_data)
     rendered_html = html_template.render(**context)
     
     # Inject token classes into body tag
@@ -176,23 +274,25 @@ def render_cover_letter_html(
     return rendered_html
 
 
+def export_stylesheet(template_data: dict) -> str:
+    """Template CSS for PDF export, applied in place of STYLESHEET_PLACEHOLDER."""
+    return template_data["css_content"] or ""
+
+
 def export_to_pdf(
     content: dict,
     template_slug: str = "formal",
     design_tokens: Optional[dict] = None,
     profile: Optional[dict] = None,
+    db: Optional[Session] = None,
 ) -> bytes:
-    """Export cover letter to PDF."""
-    if not WEASYPRINT_AVAILABLE:
-        raise RuntimeError("WeasyPrint is not installed. Install with: pip install weasyprint")
-    
-    html_content = render_cover_letter_html(content, template_slug, design_tokens, profile)
-    
-    # Generate PDF
-    html_doc = HTML(string=html_content)
-    pdf_bytes = html_doc.write_pdf()
-    
-    return pdf_bytes
+    """Export cover letter to PDF (rendered in the PDF worker pool, cached by HTML and CSS)."""
+    template_data = resolve_template(template_slug, db)
+    html_content = render_cover_letter_html(
+        content, template_slug, design_tokens, profile, db, inline_css=False, template_data=template_data
+    )
+    chunks, _, _ = get_or_render_pdf(html_content, export_stylesheet(template_data))
+    return b"".join(chunks)
 
 
 def export_to_docx(
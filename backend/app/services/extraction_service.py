@@ -4,7 +4,9 @@ Resume extraction service - extracts text from PDF/DOCX and parses into canonica
 import io
 import json
 import re
-from typing import Any, Dict, Optional, Tuple
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.etree.ElementTree import ParseError, iterparse
 
 # PDF extraction - optional
 try:
@@ -13,6 +15,13 @@ try:
 except ImportError:
     PDFPLUMBER_AVAILABLE = False
 
+# Fast PDF text-layer extraction - optional
+try:
+    import pypdfium2
+    PYPDFIUM2_AVAILABLE = True
+except ImportError:
+    PYPDFIUM2_AVAILABLE = False
+
 # DOCX extraction - optional
 try:
     from docx import Document
@@ -20,6 +29,16 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
+from app.core.config import settings
+from app.services.resume_scanner import (
+    EMAIL_PATTERN,
+    GITHUB_PATTERN,
+    LINKEDIN_PATTERN,
+    PHONE_PATTERNS,
+    scan_resume_text,
+    unique_skill_names,
+)
+from app.services.section_segmenter import low_confidence_fields, segment_resume, set_field
 from app.schemas.resume_content import (
     CanonicalResumeSchema,
     ContactInfo,
@@ -32,40 +51,196 @@ from app.schemas.resume_content import (
 )
 
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+# Only the beginning of the resume is sent to the AI parser
+AI_PARSE_MAX_CHARS = 8000
+
+# Segmenter fields scored below this are sent to the AI for filling
+AI_FILL_CONFIDENCE_THRESHOLD = 0.6
+# Past this many uncertain fields a full AI parse is cheaper than patching
+AI_FILL_MAX_FIELDS = 25
+
+PDF_ENGINES = ("pdfplumber", "pypdfium2")
+
+
+def _iter_pages_pdfplumber(file_content: bytes, max_pages: Optional[int]) -> Iterator[str]:
+    if not PDFPLUMBER_AVAILABLE:
+        raise RuntimeError("pdfplumber is not installed. Install with: pip install pdfplumber")
+
+    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+        for index, page in enumerate(pdf.pages):
+            if max_pages and index >= max_pages:
+                break
+            page_text = page.extract_text()
+            # Drop parsed objects so memory stays flat across pages
+            page.close()
+            yield page_text or ""
+
+
+def _iter_pages_pypdfium2(file_content: bytes, max_pages: Optional[int]) -> Iterator[str]:
+    if not PYPDFIUM2_AVAILABLE:
+        raise RuntimeError("pypdfium2 is not installed. Install with: pip install pypdfium2")
+
+    pdf = pypdfium2.PdfDocument(file_content)
+    try:
+        page_count = len(pdf)
+        if max_pages:
+            page_count = min(page_count, max_pages)
+        for index in range(page_count):
+            page = pdf[index]
+            text_page = page.get_textpage()
+            try:
+                page_text = text_page.get_text_bounded()
+            finally:
+                text_page.close()
+                page.close()
+            yield page_text.replace("\r\n", "\n")
+    finally:
+        pdf.close()
+
+
+def iter_pdf_pages(
+    file_content: bytes,
+    engine: Optional[str] = None,
+    max_pages: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Lazily yield the text of each PDF page, one page at a time.
+    
+    Args:
+        file_content: Raw PDF file bytes
+        engine: "pdfplumber" (layout-aware) or "pypdfium2" (fast text layer).
+            Defaults to settings.RESUME_PDF_ENGINE.
+        max_pages: Stop after this many pages (None or 0 = all pages)
+        
+    Yields:
+        Text of each page (may be empty)
+    """
+    engine = engine or settings.RESUME_PDF_ENGINE
+    if engine == "pypdfium2":
+        return _iter_pages_pypdfium2(file_content, max_pages)
+    if engine == "pdfplumber":
+        return _iter_pages_pdfplumber(file_content, max_pages)
+    raise ValueError(f"Unsupported PDF engine: {engine}")
+
+
+def extract_text_from_pdf(
+    file_content: bytes,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    engine: Optional[str] = None,
+) -> str:
     """
     Extract text from a PDF file.
     
+    Pages are streamed and extraction stops as soon as the page or
+    character budget is met, so later pages are never parsed.
+    
     Args:
         file_content: Raw PDF file bytes
+        max_pages: Maximum number of pages to read (None or 0 = all pages)
+        max_chars: Stop once at least this many characters were extracted
+        engine: PDF engine override (see iter_pdf_pages)
         
     Returns:
         Extracted text as string
     """
-    if not PDFPLUMBER_AVAILABLE:
-        raise RuntimeError("pdfplumber is not installed. Install with: pip install pdfplumber")
-    
     text_parts = []
+    total_chars = 0
     
-    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
+    for page_text in iter_pdf_pages(file_content, engine=engine, max_pages=max_pages):
+        if page_text:
+            text_parts.append(page_text)
+            total_chars += len(page_text)
+        if max_chars and total_chars >= max_chars:
+            break
     
     return "\n\n".join(text_parts)
 
 
-def extract_text_from_docx(file_content: bytes) -> str:
+DOCX_ENGINES = ("stream", "python-docx")
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = f"{_WORD_NS}p"
+_W_T = f"{_WORD_NS}t"
+_W_TAB = f"{_WORD_NS}tab"
+_W_BR = f"{_WORD_NS}br"
+_W_CR = f"{_WORD_NS}cr"
+_W_TBL = f"{_WORD_NS}tbl"
+_W_TR = f"{_WORD_NS}tr"
+_W_TC = f"{_WORD_NS}tc"
+
+
+def iter_docx_blocks(file_content: bytes) -> Iterator[str]:
     """
-    Extract text from a DOCX file.
+    Stream paragraphs and table rows out of word/document.xml in document order.
+    
+    The XML is read incrementally with iterparse and every element is
+    discarded once consumed, so the full DOM is never built. Table rows
+    are emitted as "cell | cell" like the python-docx extractor.
     
     Args:
         file_content: Raw DOCX file bytes
         
-    Returns:
-        Extracted text as string
+    Yields:
+        Non-empty paragraph or table-row text
     """
+    with zipfile.ZipFile(io.BytesIO(file_content)) as archive:
+        with archive.open("word/document.xml") as xml_stream:
+            depth = 0
+            body = None
+            table_depth = 0
+            paragraphs = []  # stack of text buffers (text boxes nest paragraphs)
+            row_cells = []
+            cell_parts = []
+
+            for event, elem in iterparse(xml_stream, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    depth += 1
+                    if depth == 2:
+                        body = elem
+                    elif tag == _W_P:
+                        paragraphs.append([])
+                    elif tag == _W_TBL:
+                        table_depth += 1
+                    elif tag == _W_TR and table_depth == 1:
+                        row_cells = []
+                    elif tag == _W_TC and table_depth == 1:
+                        cell_parts = []
+                    continue
+
+                depth -= 1
+                if tag == _W_T:
+                    if paragraphs and elem.text:
+                        paragraphs[-1].append(elem.text)
+                elif tag == _W_TAB:
+                    if paragraphs:
+                        paragraphs[-1].append("\t")
+                elif tag in (_W_BR, _W_CR):
+                    if paragraphs:
+                        paragraphs[-1].append("\n")
+                elif tag == _W_P:
+                    text = "".join(paragraphs.pop())
+                    if table_depth:
+                        cell_parts.append(text)
+                    elif text.strip():
+                        yield text
+                elif tag == _W_TC and table_depth == 1:
+                    row_cells.append("\n".join(cell_parts).strip())
+                elif tag == _W_TR and table_depth == 1:
+                    row_text = " | ".join(cell for cell in row_cells if cell)
+                    if row_text:
+                        yield row_text
+                elif tag == _W_TBL:
+                    table_depth -= 1
+
+                elem.clear()
+                if depth == 2 and body is not None:
+                    # A top-level block just finished - drop it from the body
+                    body.clear()
+
+
+def _extract_text_from_docx_python_docx(file_content: bytes) -> str:
     if not DOCX_AVAILABLE:
         raise RuntimeError("python-docx is not installed. Install with: pip install python-docx")
     
@@ -86,13 +261,44 @@ def extract_text_from_docx(file_content: bytes) -> str:
     return "\n".join(text_parts)
 
 
-def extract_text(file_content: bytes, content_type: str) -> str:
+def extract_text_from_docx(file_content: bytes, engine: Optional[str] = None) -> str:
+    """
+    Extract text from a DOCX file.
+    
+    Uses the streaming extractor by default and falls back to python-docx
+    when the archive can't be streamed.
+    
+    Args:
+        file_content: Raw DOCX file bytes
+        engine: "stream" or "python-docx". Defaults to settings.RESUME_DOCX_ENGINE.
+        
+    Returns:
+        Extracted text as string
+    """
+    engine = engine or settings.RESUME_DOCX_ENGINE
+    if engine == "python-docx":
+        return _extract_text_from_docx_python_docx(file_content)
+    if engine != "stream":
+        raise ValueError(f"Unsupported DOCX engine: {engine}")
+    
+    try:
+        return "\n".join(iter_docx_blocks(file_content))
+    except (zipfile.BadZipFile, KeyError, ParseError):
+        return _extract_text_from_docx_python_docx(file_content)
+
+
+def extract_text(
+    file_content: bytes,
+    content_type: str,
+    max_chars: Optional[int] = None,
+) -> str:
     """
     Extract text from a file based on content type.
     
     Args:
         file_content: Raw file bytes
         content_type: MIME type of the file
+        max_chars: Optional character budget; PDF extraction stops early once met
         
     Returns:
         Extracted text as string
@@ -101,7 +307,11 @@ def extract_text(file_content: bytes, content_type: str) -> str:
         ValueError: If content type is not supported
     """
     if content_type == "application/pdf":
-        return extract_text_from_pdf(file_content)
+        return extract_text_from_pdf(
+            file_content,
+            max_pages=settings.RESUME_EXTRACT_MAX_PAGES,
+            max_chars=max_chars,
+        )
     elif content_type in [
         "application/msword",
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
@@ -115,19 +325,14 @@ def extract_text(file_content: bytes, content_type: str) -> str:
 
 def extract_email(text: str) -> Optional[str]:
     """Extract email address from text"""
-    pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    match = re.search(pattern, text)
+    match = EMAIL_PATTERN.search(text)
     return match.group(0) if match else None
 
 
 def extract_phone(text: str) -> Optional[str]:
     """Extract phone number from text"""
-    patterns = [
-        r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}',
-        r'\+?[0-9]{1,3}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in PHONE_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(0)
     return None
@@ -135,25 +340,24 @@ def extract_phone(text: str) -> Optional[str]:
 
 def extract_linkedin(text: str) -> Optional[str]:
     """Extract LinkedIn URL from text"""
-    pattern = r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+'
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = LINKEDIN_PATTERN.search(text)
     return match.group(0) if match else None
 
 
 def extract_github(text: str) -> Optional[str]:
     """Extract GitHub URL from text"""
-    pattern = r'(?:https?://)?(?:www\.)?github\.com/[\w-]+'
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = GITHUB_PATTERN.search(text)
     return match.group(0) if match else None
 
 
-def basic_parse_resume(raw_text: str) -> Dict[str, Any]:
+def basic_parse_resume(raw_text: str, scan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Basic rule-based parsing of resume text.
     This provides a starting point before AI enhancement.
     
     Args:
         raw_text: Extracted text from resume
+        scan: Result of scan_resume_text(raw_text), if the caller already has it
         
     Returns:
         Dictionary with parsed resume data
@@ -164,11 +368,13 @@ def basic_parse_resume(raw_text: str) -> Dict[str, Any]:
     # Try to extract name (usually first line or first bold/large text)
     full_name = lines[0] if lines else "Unknown"
     
-    # Extract contact info
-    email = extract_email(raw_text)
-    phone = extract_phone(raw_text)
-    linkedin = extract_linkedin(raw_text)
-    portfolio = extract_github(raw_text)
+    # Extract contact info and skills in a single scan
+    scan = scan or scan_resume_text(raw_text)
+    contacts = scan["contacts"]
+    
+    def contact_value(kind: str) -> Optional[str]:
+        match = contacts.get(kind)
+        return match["value"] if match else None
     
     # Build basic schema
     result = {
@@ -183,11 +389,11 @@ def basic_parse_resume(raw_text: str) -> Dict[str, Any]:
             "fullName": full_name,
             "headline": None,
             "contact": {
-                "email": email,
-                "phone": phone,
+                "email": contact_value("email"),
+                "phone": contact_value("phone"),
                 "location": None,
-                "linkedin": linkedin,
-                "portfolio": portfolio
+                "linkedin": contact_value("linkedin"),
+                "portfolio": contact_value("github")
             }
         },
         "sections": {
@@ -195,43 +401,41 @@ def basic_parse_resume(raw_text: str) -> Dict[str, Any]:
             "experience": [],
             "projects": [],
             "education": [],
-            "skills": [],
+            "skills": unique_skill_names(scan["skills"]),
             "certifications": [],
             "awards": []
         }
     }
     
-    # Extract skills (look for common skill keywords)
-    skill_keywords = [
-        "Python", "JavaScript", "TypeScript", "React", "Node.js", "SQL",
-        "Java", "C++", "C#", "Go", "Rust", "Ruby", "PHP", "Swift", "Kotlin",
-        "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Git", "Linux",
-        "Machine Learning", "AI", "Data Science", "DevOps", "Agile"
-    ]
-    found_skills = []
-    text_lower = raw_text.lower()
-    for skill in skill_keywords:
-        if skill.lower() in text_lower:
-            found_skills.append(skill)
-    result["sections"]["skills"] = found_skills
-    
     return result
 
 
-async def parse_resume_with_ai(
-    raw_text: str,
-    ai_service_func
-) -> Dict[str, Any]:
-    """
-    Use AI to parse resume text into canonical schema.
-    
-    Args:
-        raw_text: Extracted text from resume
-        ai_service_func: Function to call AI service (can be sync or async)
-        
-    Returns:
-        Dictionary with parsed resume data in canonical schema format
-    """
+async def _request_ai_json(prompt: str, ai_service_func) -> Any:
+    """Call the AI service (sync or async) and decode its JSON reply."""
+    import inspect
+
+    if inspect.iscoroutinefunction(ai_service_func):
+        response = await ai_service_func(prompt)
+    else:
+        # Sync function - call directly
+        response, _ = ai_service_func(prompt)
+
+    # Handle tuple response (response, tokens)
+    if isinstance(response, tuple):
+        response = response[0]
+
+    # Try to extract JSON from response
+    json_text = response.strip()
+    if json_text.startswith("```"):
+        # Remove markdown code blocks
+        json_text = re.sub(r'^```(?:json)?\n?', '', json_text)
+        json_text = re.sub(r'\n?```$', '', json_text)
+
+    return json.loads(json_text)
+
+
+async def _parse_full_with_ai(raw_text: str, ai_service_func, scan: Dict[str, Any]) -> Dict[str, Any]:
+    """Ask the AI for the whole canonical schema (used when segmentation found nothing usable)."""
     prompt = f"""Parse the following resume text into a structured JSON format.
 
 Return ONLY valid JSON with this exact structure:
@@ -296,40 +500,118 @@ Return ONLY valid JSON with this exact structure:
 
 Resume text:
 ---
-{raw_text[:8000]}
+{raw_text[:AI_PARSE_MAX_CHARS]}
 ---
 
 Return ONLY the JSON, no markdown, no explanation."""
 
     try:
-        # Call AI service (supports both sync and async)
-        import asyncio
-        import inspect
-        
-        if inspect.iscoroutinefunction(ai_service_func):
-            response = await ai_service_func(prompt)
-        else:
-            # Sync function - call directly
-            response, _ = ai_service_func(prompt)
-        
-        # Handle tuple response (response, tokens)
-        if isinstance(response, tuple):
-            response = response[0]
-        
-        # Try to extract JSON from response
-        json_text = response.strip()
-        if json_text.startswith("```"):
-            # Remove markdown code blocks
-            json_text = re.sub(r'^```(?:json)?\n?', '', json_text)
-            json_text = re.sub(r'\n?```$', '', json_text)
-        
-        parsed = json.loads(json_text)
-        return parsed
-        
+        return await _request_ai_json(prompt, ai_service_func)
     except Exception as e:
         # Fall back to basic parsing
         print(f"AI parsing failed: {e}, falling back to basic parsing")
-        return basic_parse_resume(raw_text)
+        return basic_parse_resume(raw_text, scan=scan)
+
+
+# Shape hints for gap paths that cover a whole section rather than one field
+_SECTION_ENTRY_SHAPES = {
+    "experience": '{"company", "role", "location", "startDate", "endDate", "bullets": []}',
+    "education": '{"institution", "degree", "field", "startDate", "endDate", "gpa"}',
+    "projects": '{"name", "description", "technologies": [], "link"}',
+    "certifications": '{"name", "issuer", "date"}',
+    "awards": '{"name", "issuer", "date", "description"}',
+}
+
+
+async def _fill_gaps_with_ai(
+    raw_text: str,
+    segmented: Dict[str, Any],
+    gaps: List[str],
+    ai_service_func
+) -> Dict[str, Any]:
+    """Ask the AI for only the low-confidence fields and merge them into the draft."""
+    data = segmented["data"]
+    # Industry can't be derived by rules, so it rides along with every gap-fill request
+    requested = gaps + (["meta.industry"] if "meta.industry" not in gaps else [])
+
+    current = {}
+    hints = []
+    for path in requested:
+        current[path] = _get_field(data, path)
+        section = path.split(".", 1)[1] if path.startswith("sections.") and path.count(".") == 1 else None
+        if section in _SECTION_ENTRY_SHAPES:
+            hints.append(f"- {path}: list of {_SECTION_ENTRY_SHAPES[section]}")
+
+    shapes = ("\nList fields use these entry shapes:\n" + "\n".join(hints) + "\n") if hints else ""
+    prompt = f"""A resume was parsed automatically, but some fields are missing or uncertain.
+Fill in ONLY the fields listed below, using the resume text.
+
+Current values (field path -> value):
+{json.dumps(current, indent=2)}
+{shapes}
+Return ONLY a JSON object mapping each listed field path to its corrected value.
+Use null when the resume doesn't contain the information. Do not add other paths.
+
+Resume text:
+---
+{raw_text[:AI_PARSE_MAX_CHARS]}
+---
+
+Return ONLY the JSON, no markdown, no explanation."""
+
+    try:
+        filled = await _request_ai_json(prompt, ai_service_func)
+    except Exception as e:
+        # The rule-based draft is still better than a bare basic parse
+        print(f"AI gap filling failed: {e}, keeping rule-based draft")
+        return data
+
+    if not isinstance(filled, dict):
+        return data
+    for path in requested:
+        if path in filled and filled[path] is not None:
+            set_field(data, path, filled[path])
+    return data
+
+
+def _get_field(data: Dict[str, Any], path: str) -> Any:
+    target: Any = data
+    for key in re.findall(r"[^.\[\]]+", path):
+        try:
+            target = target[int(key)] if key.isdigit() else target[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return target
+
+
+async def parse_resume_with_ai(
+    raw_text: str,
+    ai_service_func
+) -> Dict[str, Any]:
+    """
+    Parse resume text into canonical schema, using AI only where rules fall short.
+
+    The rule-based segmenter runs first. Fields it fills confidently are kept
+    as-is; the AI is asked only for the low-confidence ones. If segmentation
+    recognised no sections, or too many fields are uncertain, the whole schema
+    is requested from the AI instead.
+
+    Args:
+        raw_text: Extracted text from resume
+        ai_service_func: Function to call AI service (can be sync or async)
+        
+    Returns:
+        Dictionary with parsed resume data in canonical schema format
+    """
+    scan = scan_resume_text(raw_text)
+    segmented = segment_resume(raw_text, scan=scan)
+    gaps = low_confidence_fields(segmented, AI_FILL_CONFIDENCE_THRESHOLD)
+
+    if not segmented["sections_found"] or len(gaps) > AI_FILL_MAX_FIELDS:
+        return await _parse_full_with_ai(raw_text, ai_service_func, scan)
+    if not gaps:
+        return segmented["data"]
+    return await _fill_gaps_with_ai(raw_text, segmented, gaps, ai_service_func)
 
 
 def validate_resume_schema(data: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
@@ -0,0 +1,410 @@
+"""
+PDF rendering off the request path.
+
+WeasyPrint runs in a small process pool so a render neither holds the GIL
+nor blocks an API worker. Admission is capped (running plus queued jobs) and
+every render has a timeout, enforced inside the worker from when it starts
+the job. A worker that doesn't respond even then is treated as stuck and its
+pool is replaced without killing other renders. Finished PDFs are cached by
+a hash of the HTML and CSS they were made from, on local disk or in file
+storage, so identical exports are served from the cache without rendering
+again.
+
+Template CSS is passed separately from the HTML, which holds
+STYLESHEET_PLACEHOLDER where the CSS goes. Each worker shares one
+FontConfiguration between renders and, for templates whose only CSS is the
+template stylesheet, parses that stylesheet once for every later render.
+"""
+import hashlib
+import multiprocessing
+import os
+import re
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Set, Tuple
+
+# PDF export - WeasyPrint requires GTK libraries on Windows
+try:
+    import weasyprint
+    WEASYPRINT_AVAILABLE = True
+    WEASYPRINT_VERSION = weasyprint.__version__
+except (ImportError, OSError):
+    WEASYPRINT_AVAILABLE = False
+    WEASYPRINT_VERSION = None
+
+from app.core.config import settings
+from app.core.storage import StorageError, get_object_info, get_storage_backend, stream_object
+
+PDF_CACHE_PREFIX = "pdf-cache"
+CHUNK_SIZE = 256 * 1024
+
+# Prune the disk cache every this many writes
+_PRUNE_EVERY = 50
+
+# Renders slower than this are logged
+_SLOW_RENDER_SECONDS = 5.0
+
+
+class PdfRenderError(RuntimeError):
+    pass
+
+
+class PdfRenderBusyError(PdfRenderError):
+    pass
+
+
+class PdfRenderTimeoutError(PdfRenderError):
+    pass
+
+
+# --- worker process state ---
+
+# Export HTML carries this as the whole content of a <style> element instead
+# of the template CSS; see _write_pdf.
+STYLESHEET_PLACEHOLDER = "/* template-stylesheet */"
+
+_STYLE_ELEMENT = re.compile(r"<style\b[^>]*>(.*?)</style\s*>", re.IGNORECASE | re.DOTALL)
+_STYLESHEET_LINK = re.compile(r"<link\b[^>]*\bstylesheet\b", re.IGNORECASE)
+
+# Parsed stylesheets (with their counter styles) per worker process, keyed by
+# a hash of the CSS text
+_WORKER_STYLESHEETS_MAX = 64
+_worker_stylesheets: Dict[str, Tuple[Any, Any]] = {}
+_worker_font_config = None
+
+
+def _init_worker() -> None:
+    """Import WeasyPrint and build the font configuration when a worker starts."""
+    global _worker_font_config
+    from weasyprint.text.fonts import FontConfiguration
+    _worker_font_config = FontConfiguration()
+
+
+def _worker_stylesheet(css: str, css_key: str) -> Tuple[Any, Any]:
+    from weasyprint import CSS
+    from weasyprint.css.counters import CounterStyle
+    cached = _worker_stylesheets.get(css_key)
+    if cached is None:
+        if len(_worker_stylesheets) >= _WORKER_STYLESHEETS_MAX:
+            _worker_stylesheets.pop(next(iter(_worker_stylesheets)))
+        # The render must use the counter styles the sheet registered (@counter-style)
+        counter_style = CounterStyle()
+        stylesheet = CSS(string=css, font_config=_worker_font_config, counter_style=counter_style)
+        cached = _worker_stylesheets[css_key] = (stylesheet, counter_style)
+    return cached
+
+
+def _stylesheet_is_only_css(html: str, css: str) -> bool:
+    """
+    True when the placeholder <style> is the document's only CSS and the
+    template CSS has no !important rule. Passed to write_pdf() the sheet is
+    user origin rather than author origin, which then renders the same: no
+    other author sheet can outrank it, and style attributes win over both.
+    """
+    styles = _STYLE_ELEMENT.findall(html)
+    return (
+        len(styles) == 1
+        and styles[0].strip() == STYLESHEET_PLACEHOLDER
+        and not _STYLESHEET_LINK.search(html)
+        and "!important" not in css
+    )
+
+
+def _on_render_timeout(signum: int, frame: Any) -> None:
+    raise PdfRenderTimeoutError("PDF generation timed out.")
+
+
+def _write_pdf(
+    html: str,
+    css: Optional[str] = None,
+    css_key: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> bytes:
+    """
+    Runs in a pool process, sharing the worker's font configuration between
+    renders. The template CSS replaces STYLESHEET_PLACEHOLDER. When it is the
+    document's only CSS it is parsed once per worker and passed as a
+    stylesheet; otherwise it is inlined, so it keeps its author origin and
+    place in the cascade next to the template's other styles.
+
+    The timeout starts when the worker picks the job up. Where SIGALRM exists
+    it aborts the render inside the worker, which stays usable.
+    """
+    from weasyprint import HTML
+    if _worker_font_config is None:
+        _init_worker()
+    use_alarm = bool(timeout) and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_render_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        if css and _stylesheet_is_only_css(html, css):
+            stylesheet, counter_style = _worker_stylesheet(css, css_key)
+            html = _STYLE_ELEMENT.sub("", html, count=1)
+            return HTML(string=html).write_pdf(
+                stylesheets=[stylesheet],
+                font_config=_worker_font_config,
+                counter_style=counter_style,
+            )
+        if css:
+            html = html.replace(STYLESHEET_PLACEHOLDER, css, 1)
+        return HTML(string=html).write_pdf(font_config=_worker_font_config)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+# --- process pool ---
+
+# Extra time the caller waits beyond PDF_RENDER_TIMEOUT, for worker start-up
+# and for platforms without SIGALRM, before treating a worker as stuck
+_STUCK_GRACE = 15.0
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+# Jobs in each pool; retired pools are terminated once their count drops to zero
+_pool_jobs: Dict[ProcessPoolExecutor, int] = {}
+_retired_pools: Set[ProcessPoolExecutor] = set()
+# Admission: renders running or waiting
+_slots = threading.BoundedSemaphore(max(1, settings.PDF_RENDER_MAX_PENDING))
+# At most one job per worker is handed to the pool, so a submitted job starts
+# right away and never waits in the pool's own queue
+_workers = threading.BoundedSemaphore(max(1, settings.PDF_RENDER_WORKERS))
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded server process can deadlock the child
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, settings.PDF_RENDER_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        _pool_jobs[_pool] = _pool_jobs.get(_pool, 0) + 1
+        return _pool
+
+
+def _terminate_pool(pool: ProcessPoolExecutor) -> None:
+    # ProcessPoolExecutor can't cancel a running task, so stop its processes
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _release_pool(pool: ProcessPoolExecutor, stuck: bool = False) -> None:
+    """
+    Finish a job's use of pool. A stuck job retires the pool: new renders go
+    to a fresh one, and the old pool's processes are terminated as soon as
+    the stuck job is the only one left in it, so renders running alongside
+    it are never killed.
+    """
+    global _pool
+    with _pool_lock:
+        _pool_jobs[pool] -= 1
+        if stuck:
+            _retired_pools.add(pool)
+            if _pool is pool:
+                _pool = None
+        terminate = pool in _retired_pools and _pool_jobs[pool] == 0
+        if terminate:
+            _retired_pools.discard(pool)
+            del _pool_jobs[pool]
+    if terminate:
+        _terminate_pool(pool)
+
+
+def render_pdf(html: str, css: Optional[str] = None) -> bytes:
+    """
+    Render HTML to PDF in the worker pool, with css applied in place of
+    STYLESHEET_PLACEHOLDER.
+    Blocks the calling thread, so call it from a threadpool in async code.
+
+    Waiting for a free worker is bounded by PDF_RENDER_QUEUE_TIMEOUT
+    (PdfRenderBusyError); the render itself by PDF_RENDER_TIMEOUT, counted
+    from when a worker starts it (PdfRenderTimeoutError).
+    """
+    if not WEASYPRINT_AVAILABLE:
+        raise PdfRenderError("WeasyPrint is not installed. Install with: pip install weasyprint")
+    deadline = time.monotonic() + settings.PDF_RENDER_QUEUE_TIMEOUT
+    if not _slots.acquire(timeout=settings.PDF_RENDER_QUEUE_TIMEOUT):
+        raise PdfRenderBusyError("Too many PDF exports in progress. Please try again shortly.")
+    try:
+        if not _workers.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise PdfRenderBusyError("Too many PDF exports in progress. Please try again shortly.")
+        try:
+            pool = _get_pool()
+            stuck = False
+            try:
+                css_key = hashlib.sha256(css.encode("utf-8")).hexdigest() if css else None
+                future = pool.submit(_write_pdf, html, css, css_key, settings.PDF_RENDER_TIMEOUT)
+                return future.result(timeout=settings.PDF_RENDER_TIMEOUT + _STUCK_GRACE)
+            except FutureTimeoutError as exc:
+                # The worker didn't come back even after its own timeout
+                stuck = True
+                raise PdfRenderTimeoutError("PDF generation timed out.") from exc
+            except BrokenProcessPool as exc:
+                stuck = True
+                raise PdfRenderError("PDF renderer stopped unexpectedly.") from exc
+            finally:
+                _release_pool(pool, stuck)
+        finally:
+            _workers.release()
+    finally:
+        _slots.release()
+
+
+# --- rendered PDF cache ---
+
+def pdf_cache_key(html: str, css: Optional[str] = None) -> str:
+    """Content address of the PDF rendered from html and css."""
+    digest = hashlib.sha256(f"weasyprint-{WEASYPRINT_VERSION}\n".encode("utf-8"))
+    digest.update(hashlib.sha256((css or "").encode("utf-8")).digest())
+    digest.update(html.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cache_dir() -> Path:
+    return Path(settings.PDF_CACHE_DIR or os.path.join(tempfile.gettempdir(), "applypilot_pdf_cache"))
+
+
+def _disk_path(key: str) -> Path:
+    return _cache_dir() / key[:2] / f"{key}.pdf"
+
+
+def _storage_path(key: str) -> str:
+    return f"{PDF_CACHE_PREFIX}/{key[:2]}/{key}.pdf"
+
+
+def _iter_file(handle: BinaryIO) -> Iterator[bytes]:
+    with handle:
+        yield from iter(lambda: handle.read(CHUNK_SIZE), b"")
+
+
+def open_cached_pdf(key: str) -> Optional[Tuple[Iterator[bytes], int]]:
+    """(chunks, size) of a cached PDF, or None on a miss."""
+    mode = settings.PDF_CACHE
+    if mode == "disk":
+        path = _disk_path(key)
+        try:
+            # Opened here, so pruning can't remove the file before it is streamed
+            handle = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        size = os.fstat(handle.fileno()).st_size
+        try:
+            # mtime doubles as last use for pruning
+            os.utime(path)
+        except OSError:
+            pass
+        return _iter_file(handle), size
+    if mode == "storage":
+        try:
+            info = get_object_info(_storage_path(key))
+        except StorageError:
+            return None
+        if not info or info.get("size") is None:
+            return None
+        return stream_object(_storage_path(key), CHUNK_SIZE), int(info["size"])
+    return None
+
+
+def _prune_disk_cache() -> None:
+    files = []
+    total = 0
+    for path in _cache_dir().glob("*/*.pdf"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+        total += stat.st_size
+    files.sort()
+    for _, size, path in files:
+        if total <= settings.PDF_CACHE_MAX_BYTES:
+            break
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+_cache_writes = 0
+
+
+def store_pdf(key: str, pdf: bytes) -> None:
+    """Best effort - a failed cache write never fails the export."""
+    global _cache_writes
+    mode = settings.PDF_CACHE
+    try:
+        if mode == "disk":
+            path = _disk_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            descriptor, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".pdf-")
+            with os.fdopen(descriptor, "wb") as handle:
+                handle.write(pdf)
+            os.replace(temp_path, path)
+            _cache_writes += 1
+            if _cache_writes % _PRUNE_EVERY == 0:
+                _prune_disk_cache()
+        elif mode == "storage":
+            get_storage_backend().upload(_storage_path(key), pdf, "application/pdf")
+    except (OSError, StorageError) as exc:
+        print(f"[PdfRenderer] Cache write failed: {exc}")
+
+
+# Renders in progress by cache key, so concurrent identical exports render once
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def get_or_render_pdf(html: str, css: Optional[str] = None) -> Tuple[Iterator[bytes], int, str]:
+    """
+    PDF for html (with css in place of STYLESHEET_PLACEHOLDER) as (chunks, size, cache key),
+    from the cache when possible. Blocks while rendering; call it from a
+    threadpool in async code.
+    """
+    key = pdf_cache_key(html, css)
+    cached = open_cached_pdf(key)
+    if cached:
+        return cached[0], cached[1], key
+
+    with _inflight_lock:
+        pending = _inflight.get(key)
+        owner = pending is None
+        if owner:
+            pending = _inflight[key] = Future()
+
+    if not owner:
+        # The leader waits for a worker, then for its render
+        try:
+            pdf = pending.result(
+                timeout=settings.PDF_RENDER_QUEUE_TIMEOUT + settings.PDF_RENDER_TIMEOUT + _STUCK_GRACE
+            )
+        except FutureTimeoutError:
+            raise PdfRenderTimeoutError("PDF generation timed out.")
+        return iter([pdf]), len(pdf), key
+
+    try:
+        started = time.perf_counter()
+        pdf = render_pdf(html, css)
+        elapsed = time.perf_counter() - started
+        if elapsed >= _SLOW_RENDER_SECONDS:
+            print(f"[PdfRenderer] Slow render: {len(pdf)} bytes in {elapsed:.2f}s")
+        store_pdf(key, pdf)
+        pending.set_result(pdf)
+    except BaseException as exc:
+        pending.set_exception(exc)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+    return iter([pdf]), len(pdf), key
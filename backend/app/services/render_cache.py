@@ -0,0 +1,70 @@
+"""
+In-memory cache of rendered HTML previews.
+
+Keys hash everything that affects the output (template version, content,
+resolved design tokens, purpose, profile), so entries never need explicit
+invalidation - changed inputs simply produce a different key. The key also
+serves as the ETag, which lets endpoints answer If-None-Match with a 304
+before rendering anything.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+
+def render_cache_key(*parts: Any) -> str:
+    """Stable hash of JSON-serialisable render inputs."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """LRU of rendered HTML bounded by entry count and total size."""
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._size = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+            return html
+
+    def set(self, key: str, html: str) -> None:
+        # Python strings are roughly one byte per character for this content
+        size = len(html)
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = html
+            self._size += size
+            while self._entries and (self._size > self._max_bytes or len(self._entries) > self._max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def get_or_render(self, key: str, render: Callable[[], str]) -> str:
+        html = self.get(key)
+        if html is None:
+            html = render()
+            self.set(key, html)
+        return html
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+render_cache = RenderCache(settings.RENDER_CACHE_MAX_BYTES, settings.RENDER_CACHE_MAX_ENTRIES)
@@ -0,0 +1,257 @@
+"""
+Single-pass resume text scanner for contact details and skills.
+
+Contact patterns are compiled once into a single alternation, and skills
+are matched with an Aho-Corasick automaton built from the skills taxonomy
+at import time. Every match carries character offsets into the scanned
+text so later parsing stages can reuse them instead of searching again.
+"""
+import json
+import re
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+TAXONOMY_PATH = Path(__file__).parent.parent / "data" / "skills_taxonomy.json"
+
+
+# === Contact Patterns ===
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERNS = (
+    re.compile(r'\+?1?[-.\s]?\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}'),
+    re.compile(r'\+?[0-9]{1,3}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}[-.\s]?[0-9]{3,4}'),
+)
+LINKEDIN_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+', re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?github\.com/[\w-]+', re.IGNORECASE)
+
+# Order matters: at a given position, URLs and emails win over digit runs
+_CONTACT_GROUPS = (
+    ("email", EMAIL_PATTERN),
+    ("linkedin", LINKEDIN_PATTERN),
+    ("github", GITHUB_PATTERN),
+    ("phone", PHONE_PATTERNS[0]),
+    ("phone_intl", PHONE_PATTERNS[1]),
+)
+_CONTACT_KINDS = {"phone_intl": "phone"}
+_CONTACT_PATTERN = re.compile(
+    "|".join(f"(?P<{name}>{pattern.pattern})" for name, pattern in _CONTACT_GROUPS),
+    re.IGNORECASE,
+)
+CONTACT_KINDS = ("email", "phone", "linkedin", "github")
+
+
+def scan_contacts(text: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Find the first email, phone, LinkedIn and GitHub reference in one pass.
+    
+    Args:
+        text: Text to scan
+        
+    Returns:
+        Dictionary of kind -> {"value", "start", "end"} for each kind found
+    """
+    found: Dict[str, Dict[str, Any]] = {}
+    for match in _CONTACT_PATTERN.finditer(text):
+        kind = _CONTACT_KINDS.get(match.lastgroup, match.lastgroup)
+        if kind not in found:
+            value = match.group(0)
+            start = match.start() + len(value) - len(value.lstrip())
+            value = value.strip()
+            found[kind] = {"value": value, "start": start, "end": start + len(value)}
+            if len(found) == len(CONTACT_KINDS):
+                break
+    return found
+
+
+# === Skill Matching ===
+
+# Short terms ("C", "R", "Go", "AI") only match between these delimiters
+_STRICT_DELIMITERS = set(",;:/()[]|•·")
+_STRICT_MAX_LENGTH = 2
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _is_acronym(term: str) -> bool:
+    # Short all-caps terms ("DOE", "CNN", "SAP") collide with ordinary words
+    # and names when matched case-insensitively
+    return term.isalpha() and term.isupper() and len(term) <= 5
+
+
+def _lower_preserving_offsets(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few characters expand when lowercased (e.g. "İ"); keep those as-is
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over every skill name and alias in a taxonomy.
+    
+    Matching is case-insensitive except for terms listed under "exact",
+    respects word boundaries, and resolves overlaps leftmost-longest.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        # Per-term data, indexed by term id
+        self._term_text: List[str] = []
+        self._term_entry: List[int] = []
+        self._term_exact: List[bool] = []
+
+        for entry_index, entry in enumerate(entries):
+            exact_terms = set(entry.get("exact", []))
+            for term in [entry["name"], *entry.get("aliases", [])]:
+                self._add_term(term, entry_index, term in exact_terms or _is_acronym(term))
+
+        self._build_failure_links()
+
+    def _add_term(self, term: str, entry_index: int, exact: bool) -> None:
+        state = 0
+        for char in _lower_preserving_offsets(term):
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append(len(self._term_text))
+        self._term_text.append(term)
+        self._term_entry.append(entry_index)
+        self._term_exact.append(exact)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _accepts(self, text: str, start: int, end: int, term_id: int) -> bool:
+        term = self._term_text[term_id]
+        if self._term_exact[term_id] and text[start:end] != term:
+            return False
+
+        before = text[start - 1] if start > 0 else ""
+        after = text[end] if end < len(text) else ""
+        if len(term) <= _STRICT_MAX_LENGTH:
+            return all(
+                not char or char.isspace() or char in _STRICT_DELIMITERS
+                for char in (before, after)
+            )
+        return not (before and _is_word_char(before)) and not (after and _is_word_char(after))
+
+    def find_all(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Find all non-overlapping skill mentions in text.
+        
+        Args:
+            text: Text to scan
+            
+        Returns:
+            Matches in text order, each with "name", "category", "text",
+            "start" and "end"
+        """
+        lowered = _lower_preserving_offsets(text)
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        term_length = self._term_text
+
+        candidates = []
+        state = 0
+        for index, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            end = index + 1
+            for term_id in output[state]:
+                start = end - len(term_length[term_id])
+                if self._accepts(text, start, end, term_id):
+                    candidates.append((start, end, term_id))
+
+        # Leftmost-longest: "C++" wins over "C", "Node.js" over "JS"
+        candidates.sort(key=lambda item: (item[0], item[0] - item[1]))
+        matches = []
+        last_end = 0
+        for start, end, term_id in candidates:
+            if start < last_end:
+                continue
+            entry = self.entries[self._term_entry[term_id]]
+            matches.append({
+                "name": entry["name"],
+                "category": entry.get("category"),
+                "text": text[start:end],
+                "start": start,
+                "end": end,
+            })
+            last_end = end
+        return matches
+
+
+def load_skill_taxonomy(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Load skill entries ({"name", "category", "aliases", "exact"}) from JSON."""
+    with open(path or TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)["skills"]
+
+
+# Built once per process
+SKILL_MATCHER = SkillMatcher(load_skill_taxonomy())
+
+
+def scan_skills(text: str) -> List[Dict[str, Any]]:
+    """Find all skill mentions in text using the shared taxonomy matcher."""
+    return SKILL_MATCHER.find_all(text)
+
+
+def unique_skill_names(skill_matches: List[Dict[str, Any]]) -> List[str]:
+    """Canonical skill names in order of first appearance."""
+    seen = set()
+    names = []
+    for match in skill_matches:
+        if match["name"] not in seen:
+            seen.add(match["name"])
+            names.append(match["name"])
+    return names
+
+
+def scan_resume_text(text: str) -> Dict[str, Any]:
+    """
+    Scan resume text for contact details and skills.
+    
+    Args:
+        text: Raw resume text
+        
+    Returns:
+        {"contacts": {kind: match}, "skills": [match, ...]} with character offsets
+    """
+    contacts = scan_contacts(text)
+    contact_spans = [(match["start"], match["end"]) for match in contacts.values()]
+    # "github" inside github.com/user is a contact link, not a skill mention
+    skills = [
+        match for match in scan_skills(text)
+        if not any(start <= match["start"] < end for start, end in contact_spans)
+    ]
+    return {
+        "contacts": contacts,
+        "skills": skills,
+    }
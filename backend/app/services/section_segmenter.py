@@ -0,0 +1,592 @@
+"""
+Rule-based resume section segmenter.
+
+Splits raw resume text into sections by heading detection, groups lines
+into experience/education/project entries using date ranges and bullets,
+and records a confidence score for every field it fills. The AI parser
+then only has to complete the fields this pass is unsure about.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.resume_scanner import scan_resume_text, unique_skill_names
+
+
+# === Headings ===
+
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    "summary": [
+        "summary", "professional summary", "career summary", "profile", "professional profile",
+        "objective", "career objective", "about", "about me", "overview",
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history", "professional background",
+    ],
+    "education": [
+        "education", "academic background", "education and training", "academic history",
+        "education and certifications",
+    ],
+    "projects": [
+        "projects", "personal projects", "selected projects", "academic projects", "key projects",
+        "side projects", "technical projects",
+    ],
+    "skills": [
+        "skills", "technical skills", "core competencies", "competencies", "key skills",
+        "technologies", "skills and tools", "tools and technologies", "technical proficiencies",
+    ],
+    "certifications": [
+        "certifications", "certificates", "licenses", "licenses and certifications",
+        "certifications and licenses", "professional certifications",
+    ],
+    "awards": [
+        "awards", "honors", "honors and awards", "awards and honors", "achievements", "accomplishments",
+    ],
+    "activities": [
+        "activities", "leadership", "leadership and activities", "extracurricular activities",
+        "volunteer", "volunteering", "volunteer experience", "involvement",
+    ],
+    "coursework": ["coursework", "relevant coursework"],
+    # Recognised so they end the previous section, but not parsed
+    "other": [
+        "publications", "languages", "interests", "hobbies", "hobbies and interests", "references",
+        "patents", "presentations", "research", "additional information", "memberships",
+        "affiliations", "professional affiliations", "personal", "other",
+    ],
+}
+
+_HEADING_LOOKUP = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+
+def _normalize_heading(line: str) -> str:
+    text = line.strip().strip(":").strip()
+    text = text.replace("&", " and ")
+    text = re.sub(r"[^a-zA-Z ]", " ", text)
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+_UNKNOWN_HEADING_PATTERN = re.compile(r"^[A-Z]{2,}(?: (?:&|AND|[A-Z]{2,})){1,3}:?$")
+
+
+def detect_heading(line: str, isolated: bool = False) -> Optional[str]:
+    """
+    Return the section a heading line starts, "other" for an unrecognised
+    heading, or None for ordinary content.
+
+    Headings from SECTION_HEADINGS are always trusted. Any other line only
+    counts as a heading when it is isolated (blank lines on both sides), two
+    to four all-caps words of letters only, and doesn't read like a role,
+    institution or degree. Company and school names such as "IBM" or "MIT",
+    and lines like "GPA: 3.8/4.0", stay content.
+    """
+    stripped = line.strip()
+    if not stripped or len(stripped) > 40:
+        return None
+    section = _HEADING_LOOKUP.get(_normalize_heading(stripped))
+    if section:
+        return section
+    if (
+        isolated
+        and _UNKNOWN_HEADING_PATTERN.match(stripped)
+        and not _ROLE_PATTERN.search(stripped)
+        and not _INSTITUTION_PATTERN.search(stripped)
+        and not _DEGREE_PATTERN.search(stripped)
+    ):
+        return "other"
+    return None
+
+
+# === Dates ===
+
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?|spring|summer|fall|autumn|winter)\.?"
+)
+_DATE = rf"(?:{_MONTH}\s*,?\s*'?\d{{2,4}}|\d{{1,2}}/\d{{2,4}}|\d{{4}})"
+_ONGOING = r"(?:present|current|now|today|ongoing)"
+
+DATE_RANGE_PATTERN = re.compile(
+    rf"(?P<start>{_DATE})\s*(?:-|–|—|to|until|through)\s*(?P<end>{_DATE}|{_ONGOING})",
+    re.IGNORECASE,
+)
+SINGLE_DATE_PATTERN = re.compile(rf"(?:expected\s+|graduated\s+|graduation\s*:?\s*)?(?P<date>{_DATE})", re.IGNORECASE)
+
+
+def parse_date_range(text: str) -> Optional[Tuple[str, str, Tuple[int, int]]]:
+    """
+    Find a date range like "Jan 2020 - Present" or "2018 – 2021".
+
+    Returns:
+        (start, end, (span_start, span_end)) or None
+    """
+    match = DATE_RANGE_PATTERN.search(text)
+    if not match:
+        return None
+    end = match.group("end")
+    if re.fullmatch(_ONGOING, end, re.IGNORECASE):
+        end = "Present"
+    return match.group("start"), end, match.span()
+
+
+# === Lines, bullets and fields ===
+
+_BULLET_PATTERN = re.compile(r"^\s*(?:[•\-\*▪◦●■–·>‣⁃]|o\s)\s*")
+_SPLIT_PATTERN = re.compile(r"\s*(?:\||\s[-–—]\s|\t|\s{3,})\s*")
+_LOCATION_PATTERN = re.compile(r"^(?:(?i:remote|hybrid|on-?site)|[A-Z][a-zA-Z .'-]+,\s*(?:[A-Z]{2}|[A-Z][a-zA-Z ]+))$")
+_GPA_PATTERN = re.compile(r"\bGPA\s*:?\s*(?P<gpa>\d(?:\.\d{1,2})?(?:\s*/\s*\d(?:\.\d{1,2})?)?)", re.IGNORECASE)
+_DEGREE_PATTERN = re.compile(
+    r"\b(?:Bachelor(?:'s)?|Master(?:'s)?|Doctor(?:ate)?|Associate(?:'s)?|Diploma|Certificate|MBA|Ph\.?\s?D\.?"
+    r"|B\.?\s?S\.?c?|M\.?\s?S\.?c?|B\.?\s?A\.?|M\.?\s?A\.?|B\.?\s?Eng\.?|M\.?\s?Eng\.?|B\.?\s?Tech|M\.?\s?Tech"
+    r"|B\.?\s?Com|M\.?\s?Com|LL\.?B|LL\.?M|J\.?D\.?|M\.?D\.?|High School Diploma|GED)(?![a-zA-Z])",
+)
+_INSTITUTION_PATTERN = re.compile(
+    r"\b(?:University|College|Institute|School|Academy|Polytechnic|Universidad|Université|Universität|Bootcamp)\b",
+    re.IGNORECASE,
+)
+_ROLE_PATTERN = re.compile(
+    r"\b(?:engineer|developer|programmer|manager|analyst|intern|designer|scientist|consultant|director"
+    r"|lead|specialist|assistant|coordinator|architect|administrator|officer|associate|president|founder"
+    r"|co-founder|head|vp|technician|researcher|teacher|instructor|tutor|nurse|accountant|representative"
+    r"|executive|supervisor|owner|partner|advisor|strategist|editor|writer|recruiter|fellow|trainee"
+    r"|apprentice|volunteer|member|chair|captain|tester|operator|agent|clerk|cashier|sales)\b",
+    re.IGNORECASE,
+)
+_AT_PATTERN = re.compile(r"^(?P<role>.+?)\s+(?:at|@)\s+(?P<company>.+)$")
+
+
+def _strip_bullet(line: str) -> Tuple[bool, str]:
+    match = _BULLET_PATTERN.match(line)
+    if match:
+        return True, line[match.end():].strip()
+    return False, line.strip()
+
+
+def _split_parts(text: str) -> List[str]:
+    return [part.strip(" ,|-–—") for part in _SPLIT_PATTERN.split(text) if part and part.strip(" ,|-–—")]
+
+
+class _FieldRecorder:
+    """Collects field values and their confidence under dotted paths."""
+
+    def __init__(self):
+        self.confidence: Dict[str, float] = {}
+
+    def set(
+        self,
+        target: Dict[str, Any],
+        key: str,
+        value: Any,
+        score: float,
+        path: str,
+        optional: bool = False,
+    ) -> None:
+        target[key] = value
+        if value not in (None, "", []):
+            self.confidence[path] = round(score, 2)
+        elif not optional:
+            # Missing required field - always worth asking the AI about
+            self.confidence[path] = 0.0
+
+
+# === Section parsers ===
+
+def _group_entries(lines: List[Tuple[bool, str]]) -> List[Dict[str, List[str]]]:
+    """
+    Group section lines into entries of {"header": [...], "bullets": [...]}.
+    A non-bullet line after bullets, or a second date range, starts a new entry.
+    """
+    entries: List[Dict[str, List[str]]] = []
+    current: Optional[Dict[str, List[str]]] = None
+    current_has_dates = False
+
+    for is_bullet, text in lines:
+        if is_bullet:
+            if current is None:
+                current = {"header": [], "bullets": []}
+                entries.append(current)
+            current["bullets"].append(text)
+            continue
+
+        has_dates = parse_date_range(text) is not None
+        starts_new = (
+            current is None
+            or bool(current["bullets"])
+            or (has_dates and current_has_dates)
+            or len(current["header"]) >= 3
+        )
+        if starts_new:
+            current = {"header": [], "bullets": []}
+            entries.append(current)
+            current_has_dates = False
+        current["header"].append(text)
+        current_has_dates = current_has_dates or has_dates
+
+    return entries
+
+
+def _take_dates(header: List[str]) -> Tuple[Optional[str], Optional[str], List[str], float]:
+    """Pull a date range (or single date) out of header lines."""
+    remaining = []
+    start = end = None
+    score = 0.0
+    for line in header:
+        if start is None:
+            found = parse_date_range(line)
+            if found:
+                start, end, (span_start, span_end) = found
+                line = (line[:span_start] + " " + line[span_end:]).strip(" ,|-–—()")
+                score = 0.95
+        if line:
+            remaining.append(line)
+
+    if start is None:
+        for index, line in enumerate(remaining):
+            match = SINGLE_DATE_PATTERN.search(line)
+            if match:
+                end = match.group("date")
+                remaining[index] = (line[:match.start()] + " " + line[match.end():]).strip(" ,|-–—()")
+                score = 0.7
+                break
+        remaining = [line for line in remaining if line]
+
+    return start, end, remaining, score
+
+
+def _take_location(parts: List[str]) -> Tuple[Optional[str], List[str]]:
+    for index, part in enumerate(parts):
+        if _INSTITUTION_PATTERN.search(part) or _ROLE_PATTERN.search(part):
+            # "University of California, Berkeley" is not a location
+            continue
+        if _LOCATION_PATTERN.match(part):
+            return part, parts[:index] + parts[index + 1:]
+    return None, parts
+
+
+def _parse_experience(entry: Dict[str, List[str]], index: int, recorder: _FieldRecorder) -> Dict[str, Any]:
+    path = f"sections.experience[{index}]"
+    result: Dict[str, Any] = {}
+    start, end, header, date_score = _take_dates(entry["header"])
+
+    parts = [part for line in header for part in _split_parts(line)]
+    location, parts = _take_location(parts)
+
+    role = company = None
+    role_score = company_score = 0.0
+    for part in parts:
+        at_match = _AT_PATTERN.match(part)
+        if at_match and _ROLE_PATTERN.search(at_match.group("role")):
+            role, company = at_match.group("role"), at_match.group("company")
+            role_score = company_score = 0.9
+            parts = [p for p in parts if p is not part]
+            break
+
+    if role is None:
+        for part in parts:
+            if _ROLE_PATTERN.search(part):
+                role, role_score = part, 0.75
+                parts = [p for p in parts if p is not part]
+                break
+    if company is None and parts:
+        company = parts[0]
+        company_score = 0.65 if role else 0.4
+
+    recorder.set(result, "company", company or "", company_score, f"{path}.company")
+    recorder.set(result, "role", role, role_score, f"{path}.role")
+    recorder.set(result, "location", location, 0.8, f"{path}.location", optional=True)
+    recorder.set(result, "startDate", start, date_score, f"{path}.startDate")
+    recorder.set(result, "endDate", end, date_score, f"{path}.endDate")
+    recorder.set(result, "bullets", entry["bullets"], 0.9, f"{path}.bullets", optional=True)
+    return result
+
+
+def _parse_education(entry: Dict[str, List[str]], index: int, recorder: _FieldRecorder) -> Dict[str, Any]:
+    path = f"sections.education[{index}]"
+    result: Dict[str, Any] = {}
+    start, end, header, date_score = _take_dates(entry["header"])
+
+    gpa = None
+    cleaned = []
+    for line in header:
+        gpa_match = _GPA_PATTERN.search(line)
+        if gpa_match and gpa is None:
+            gpa = gpa_match.group("gpa")
+            line = (line[:gpa_match.start()] + line[gpa_match.end():]).strip(" ,|-–—()")
+        if line:
+            cleaned.append(line)
+
+    parts = [part for line in cleaned for part in _split_parts(line)]
+    location, parts = _take_location(parts)
+
+    institution = degree = field = None
+    institution_score = degree_score = field_score = 0.0
+    for part in parts:
+        if institution is None and _INSTITUTION_PATTERN.search(part):
+            institution, institution_score = part, 0.9
+        elif degree is None and _DEGREE_PATTERN.search(part):
+            degree_match = _DEGREE_PATTERN.search(part)
+            degree, degree_score = degree_match.group(0).strip(), 0.85
+            rest = part[degree_match.end():].strip(" ,.")
+            rest = re.sub(r"^(?:degree\s+)?(?:in|of)\s+", "", rest, flags=re.IGNORECASE)
+            if rest:
+                field, field_score = rest, 0.7
+
+    if institution is None:
+        leftovers = [part for part in parts if part not in (degree, field) and not _DEGREE_PATTERN.search(part)]
+        if leftovers:
+            institution, institution_score = leftovers[0], 0.4
+
+    recorder.set(result, "institution", institution or "", institution_score, f"{path}.institution")
+    recorder.set(result, "degree", degree, degree_score, f"{path}.degree")
+    recorder.set(result, "field", field, field_score, f"{path}.field", optional=True)
+    recorder.set(result, "location", location, 0.8, f"{path}.location", optional=True)
+    recorder.set(result, "startDate", start, date_score, f"{path}.startDate")
+    recorder.set(result, "endDate", end, date_score, f"{path}.endDate")
+    recorder.set(result, "gpa", gpa, 0.95, f"{path}.gpa", optional=True)
+    recorder.set(result, "highlights", entry["bullets"], 0.85, f"{path}.highlights", optional=True)
+    return result
+
+
+def _parse_project(
+    entry: Dict[str, List[str]],
+    index: int,
+    recorder: _FieldRecorder,
+    skills: List[Dict[str, Any]],
+) -> Dict[str, Any]:
+    path = f"sections.projects[{index}]"
+    result: Dict[str, Any] = {}
+    start, end, header, date_score = _take_dates(entry["header"])
+
+    first_line = header[0] if header else ""
+    name_part, _, rest = first_line.partition(":")
+    parts = _split_parts(name_part) if not rest else [name_part.strip()]
+    name = parts[0] if parts else None
+    description = rest.strip() or (header[1] if len(header) > 1 else None)
+
+    recorder.set(result, "name", name or "", 0.7 if name else 0.0, f"{path}.name")
+    recorder.set(result, "description", description, 0.6, f"{path}.description", optional=True)
+    recorder.set(result, "technologies", unique_skill_names(skills), 0.8, f"{path}.technologies", optional=True)
+    recorder.set(result, "date", end if not start else f"{start} - {end}", date_score, f"{path}.date", optional=True)
+    recorder.set(result, "bullets", entry["bullets"], 0.9, f"{path}.bullets", optional=True)
+    return result
+
+
+def _parse_listed(lines: List[Tuple[bool, str]], section: str, recorder: _FieldRecorder) -> List[Dict[str, Any]]:
+    """Certifications and awards: one entry per line with an optional trailing date."""
+    items = []
+    for is_bullet, text in lines:
+        index = len(items)
+        path = f"sections.{section}[{index}]"
+        item: Dict[str, Any] = {}
+        _, date, remaining, date_score = _take_dates([text])
+        parts = _split_parts(remaining[0]) if remaining else []
+        if not parts:
+            continue
+        recorder.set(item, "name", parts[0], 0.75, f"{path}.name")
+        recorder.set(item, "issuer", parts[1] if len(parts) > 1 else None, 0.6, f"{path}.issuer", optional=True)
+        recorder.set(item, "date", date, date_score, f"{path}.date", optional=True)
+        items.append(item)
+    return items
+
+
+# === Entry point ===
+
+def _split_sections(
+    raw_text: str,
+) -> Tuple[List[Tuple[str, int]], Dict[str, List[Tuple[str, int]]], List[str]]:
+    """
+    Split text into the header block (before the first heading),
+    section -> [(line, offset)] lists, and the sections that were ended by
+    an unrecognised heading (so may have been cut short).
+    """
+    header: List[Tuple[str, int]] = []
+    sections: Dict[str, List[Tuple[str, int]]] = {}
+    cut_short: List[str] = []
+    current: Optional[str] = None
+    offset = 0
+    lines = raw_text.split("\n")
+
+    for index, line in enumerate(lines):
+        line_offset = offset
+        offset += len(line) + 1
+        if not line.strip():
+            continue
+        isolated = (
+            (index == 0 or not lines[index - 1].strip())
+            and (index + 1 == len(lines) or not lines[index + 1].strip())
+        )
+        heading = detect_heading(line, isolated=isolated)
+        if heading:
+            known = _HEADING_LOOKUP.get(_normalize_heading(line)) is not None
+            if not known and current not in (None, "other") and current not in cut_short:
+                cut_short.append(current)
+            current = heading
+            sections.setdefault(current, [])
+            continue
+        if current is None:
+            header.append((line, line_offset))
+        else:
+            sections[current].append((line, line_offset))
+
+    return header, sections, cut_short
+
+
+def segment_resume(raw_text: str, scan: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Segment resume text into the canonical schema without calling the AI.
+
+    Args:
+        raw_text: Extracted text from resume
+        scan: Result of scan_resume_text(raw_text), if the caller already has it
+
+    Returns:
+        {"data": canonical resume dict, "confidence": {field path: 0.0-1.0},
+        "sections_found": [section names with a heading]}
+    """
+    scan = scan or scan_resume_text(raw_text)
+    recorder = _FieldRecorder()
+    header, sections, cut_short = _split_sections(raw_text)
+
+    contacts = scan["contacts"]
+    contact_spans = [(match["start"], match["end"]) for match in contacts.values()]
+
+    def contact_value(kind: str) -> Optional[str]:
+        match = contacts.get(kind)
+        return match["value"] if match else None
+
+    # Header lines that aren't just contact details
+    header_lines = [
+        (line.strip(), offset) for line, offset in header
+        if not any(offset <= start < offset + len(line) for start, _ in contact_spans)
+    ]
+
+    profile: Dict[str, Any] = {}
+    full_name = header_lines[0][0] if header_lines else (header[0][0].strip() if header else "Unknown")
+    name_like = bool(re.fullmatch(r"[A-Z][a-zA-Z'.-]+(?:\s+[A-Z][a-zA-Z'.-]+){1,3}", full_name))
+    recorder.set(profile, "fullName", full_name, 0.85 if name_like else 0.4, "profile.fullName")
+
+    headline = None
+    location = None
+    for line, _ in header_lines[1:]:
+        for part in _split_parts(line):
+            if location is None and _LOCATION_PATTERN.match(part):
+                location = part
+            elif headline is None and not re.search(r"\d|@|https?://|www\.", part) and len(part) <= 80:
+                headline = part
+    recorder.set(profile, "headline", headline, 0.5, "profile.headline", optional=True)
+
+    contact: Dict[str, Any] = {}
+    recorder.set(contact, "email", contact_value("email"), 0.95, "profile.contact.email")
+    recorder.set(contact, "phone", contact_value("phone"), 0.85, "profile.contact.phone", optional=True)
+    recorder.set(contact, "location", location, 0.6, "profile.contact.location", optional=True)
+    recorder.set(contact, "linkedin", contact_value("linkedin"), 0.95, "profile.contact.linkedin", optional=True)
+    recorder.set(contact, "portfolio", contact_value("github"), 0.9, "profile.contact.portfolio", optional=True)
+    profile["contact"] = contact
+
+    def section_lines(name: str) -> List[Tuple[bool, str]]:
+        return [_strip_bullet(line) for line, _ in sections.get(name, [])]
+
+    def section_skills(lines: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+        if not lines:
+            return []
+        start = lines[0][1]
+        end = lines[-1][1] + len(lines[-1][0])
+        return [match for match in scan["skills"] if start <= match["start"] < end]
+
+    result_sections: Dict[str, Any] = {}
+
+    summary_lines = [text for _, text in section_lines("summary")]
+    recorder.set(result_sections, "summary", " ".join(summary_lines) or None, 0.8, "sections.summary", optional=True)
+
+    result_sections["experience"] = [
+        _parse_experience(entry, index, recorder)
+        for index, entry in enumerate(_group_entries(section_lines("experience")))
+    ]
+    result_sections["education"] = [
+        _parse_education(entry, index, recorder)
+        for index, entry in enumerate(_group_entries(section_lines("education")))
+    ]
+
+    projects = []
+    project_entries = _group_entries(section_lines("projects"))
+    project_lines = sections.get("projects", [])
+    cursor = 0
+    for index, entry in enumerate(project_entries):
+        size = len(entry["header"]) + len(entry["bullets"])
+        projects.append(_parse_project(entry, index, recorder, section_skills(project_lines[cursor:cursor + size])))
+        cursor += size
+    result_sections["projects"] = projects
+
+    # Prefer skills listed under a skills heading; fall back to the whole text
+    skills_in_section = section_skills(sections.get("skills", []))
+    skill_names = unique_skill_names(skills_in_section or scan["skills"])
+    recorder.set(result_sections, "skills", skill_names, 0.9 if skills_in_section else 0.7, "sections.skills")
+
+    result_sections["certifications"] = _parse_listed(section_lines("certifications"), "certifications", recorder)
+    result_sections["awards"] = _parse_listed(section_lines("awards"), "awards", recorder)
+    result_sections["coursework"] = [
+        item.strip()
+        for _, text in section_lines("coursework")
+        for item in text.split(",")
+        if item.strip()
+    ]
+
+    # A heading with nothing parsed under it is a gap the AI has to fill
+    for name in ("experience", "education", "projects", "certifications", "awards"):
+        if name in sections and not result_sections[name]:
+            recorder.confidence[f"sections.{name}"] = 0.0
+
+    # An unrecognised heading may have ended a section early; have the AI
+    # re-read the whole section instead of trusting the entries found
+    for name in cut_short:
+        recorder.confidence[f"sections.{name}"] = min(recorder.confidence.get(f"sections.{name}", 1.0), 0.3)
+
+    data = {
+        "meta": {
+            "resumeId": None,
+            "purpose": None,
+            "industry": None,
+            "language": "en",
+            "tone": "professional",
+        },
+        "profile": profile,
+        "sections": result_sections,
+    }
+    return {
+        "data": data,
+        "confidence": recorder.confidence,
+        "sections_found": [name for name in sections if name != "other"],
+    }
+
+
+def low_confidence_fields(segmented: Dict[str, Any], threshold: float) -> List[str]:
+    """Field paths whose confidence is below threshold, in document order."""
+    return [path for path, score in segmented["confidence"].items() if score < threshold]
+
+
+_PATH_TOKEN = re.compile(r"([^.\[\]]+)|\[(\d+)\]")
+
+
+def set_field(data: Dict[str, Any], path: str, value: Any) -> bool:
+    """
+    Set a value at a dotted path such as "sections.experience[0].role".
+    Returns False if the path doesn't exist in data.
+    """
+    tokens = [int(index) if index else key for key, index in _PATH_TOKEN.findall(path)]
+    target: Any = data
+    for token in tokens[:-1]:
+        try:
+            target = target[token]
+        except (KeyError, IndexError, TypeError):
+            return False
+    last = tokens[-1]
+    if isinstance(target, dict) and isinstance(last, str):
+        target[last] = value
+        return True
+    if isinstance(target, list) and isinstance(last, int) and last < len(target):
+        target[last] = value
+        return True
+    return False
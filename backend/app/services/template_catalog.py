@@ -0,0 +1,173 @@
+"""
+In-memory catalog of templates for the /templates endpoints.
+
+Merges active resume_templates rows with the filesystem templates (a
+database row wins over a folder with the same slug) and keeps the result
+in memory. The catalog is rebuilt when its signature changes: the id,
+slug, version, status and updated_at of every row plus the file versions
+and pre-rendered thumbnail of every template folder. The signature is checked at most once every
+TEMPLATE_CATALOG_TTL seconds, and immediately after this process writes a
+ResumeTemplate.
+"""
+import hashlib
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.resume_template import ResumeTemplate
+from app.schemas.template import TemplateListItem, TemplateResponse
+from app.services import template_service
+from app.services.template_previews import thumbnail_url
+from app.services.template_service import get_available_templates, load_template_css
+
+DEFAULT_FS_TEMPLATE = "modern"
+
+
+def _fs_template_response(template: Dict[str, Any]) -> TemplateResponse:
+    slug = template["slug"]
+    html_path = template_service.TEMPLATES_DIR / slug / "index.html"
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+
+    return TemplateResponse(
+        id=0,  # Filesystem templates have no DB id
+        slug=slug,
+        name=template["name"],
+        description=template.get("description", ""),
+        template_type=template.get("type", "resume"),
+        html_content=html_content,
+        css_content=load_template_css(slug),
+        config={
+            "supportedPurposes": template.get("supportedPurposes", []),
+            "defaultTokens": template.get("defaultTokens", {}),
+            "features": template.get("features", []),
+        },
+        thumbnail_url=thumbnail_url(slug),
+        is_active=True,
+        is_default=slug == DEFAULT_FS_TEMPLATE,
+        version="1.0",
+        created_at=None,
+        updated_at=None
+    )
+
+
+def _list_item(template: TemplateResponse) -> TemplateListItem:
+    return TemplateListItem(
+        id=template.id,
+        slug=template.slug,
+        name=template.name,
+        description=template.description,
+        template_type=template.template_type,
+        thumbnail_url=template.thumbnail_url,
+        is_active=template.is_active,
+        is_default=template.is_default,
+        version=template.version or "1.0"
+    )
+
+
+class TemplateCatalog:
+    """Merged DB and filesystem templates, rebuilt when either changes."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._checked_at = 0.0
+        # (signature, templates by slug, listings by type), swapped as a whole
+        self._snapshot: Tuple[Optional[str], Dict[str, TemplateResponse], Dict[str, List[TemplateListItem]]] = (None, {}, {})
+        self._lock = threading.Lock()
+
+    def _db_signature(self, db: Session) -> List[Tuple[Any, ...]]:
+        rows = db.query(
+            ResumeTemplate.id,
+            ResumeTemplate.slug,
+            ResumeTemplate.version,
+            ResumeTemplate.is_active,
+            ResumeTemplate.updated_at,
+        ).order_by(ResumeTemplate.id).all()
+        return [tuple(row) for row in rows]
+
+    def _fs_signature(self) -> List[Tuple[str, str, Optional[str]]]:
+        templates_dir = template_service.TEMPLATES_DIR
+        if not templates_dir.exists():
+            return []
+        registry = template_service.template_registry
+        return sorted(
+            (folder.name, registry.template_version(folder.name), thumbnail_url(folder.name))
+            for folder in templates_dir.iterdir()
+            if folder.is_dir()
+        )
+
+    def _signature_of(self, db: Session) -> str:
+        payload = repr((self._db_signature(db), self._fs_signature()))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _build(self, db: Session) -> Tuple[Dict[str, TemplateResponse], Dict[str, List[TemplateListItem]]]:
+        details: Dict[str, TemplateResponse] = {}
+        rows = db.query(ResumeTemplate).filter(ResumeTemplate.is_active == True).order_by(ResumeTemplate.id).all()
+        for row in rows:
+            details[row.slug] = TemplateResponse.model_validate(row)
+        db_slugs = set(details)
+
+        for template in sorted(get_available_templates(), key=lambda t: t["slug"]):
+            if template["slug"] not in db_slugs:
+                details[template["slug"]] = _fs_template_response(template)
+
+        listings: Dict[str, List[TemplateListItem]] = {}
+        for template in details.values():
+            listings.setdefault(template.template_type, []).append(_list_item(template))
+
+        return details, listings
+
+    def refresh(self, db: Session, force: bool = False) -> None:
+        """Rebuild if the signature changed; checks at most once per TTL unless forced."""
+        if not force and time.monotonic() - self._checked_at < self.ttl:
+            return
+        with self._lock:
+            if not force and time.monotonic() - self._checked_at < self.ttl:
+                return
+            signature = self._signature_of(db)
+            if force or signature != self._snapshot[0]:
+                details, listings = self._build(db)
+                self._snapshot = (signature, details, listings)
+                print(f"[TemplateCatalog] Loaded {len(details)} templates")
+            self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        """Check the signature on the next request."""
+        self._checked_at = 0.0
+
+    def list(self, db: Session, template_type: str = "resume") -> Tuple[List[TemplateListItem], str]:
+        """Templates of a type and the ETag for the listing."""
+        self.refresh(db)
+        signature, _, listings = self._snapshot
+        etag = hashlib.sha256(f"{signature}:{template_type}".encode("utf-8")).hexdigest()
+        return listings.get(template_type, []), f'"{etag}"'
+
+    def get(self, db: Session, slug: str) -> Optional[TemplateResponse]:
+        self.refresh(db)
+        return self._snapshot[1].get(slug)
+
+
+template_catalog = TemplateCatalog(settings.TEMPLATE_CATALOG_TTL)
+
+
+def load_template_catalog() -> None:
+    """Build the catalog at startup; failures leave it to the first request."""
+    db = SessionLocal()
+    try:
+        template_catalog.refresh(db, force=True)
+    except Exception as e:
+        print(f"[TemplateCatalog] Startup load failed: {e}")
+    finally:
+        db.close()
+
+
+@event.listens_for(ResumeTemplate, "after_insert")
+@event.listens_for(ResumeTemplate, "after_update")
+@event.listens_for(ResumeTemplate, "after_delete")
+def _template_changed(mapper, connection, target) -> None:
+    template_catalog.invalidate()
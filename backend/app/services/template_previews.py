@@ -0,0 +1,224 @@
+"""
+Pre-rendered sample previews and thumbnails of filesystem resume templates.
+
+Each template is rendered once per template version with SAMPLE_RESUME, to
+HTML and to a PNG of the first page, and written to TEMPLATE_PREVIEW_DIR
+under a name that includes the version. The files never change once
+written, so they are served as immutable static assets and the gallery
+costs nothing server-side per view. Previews are built in the background at
+startup, or ahead of time with:
+
+    python -m workers.template_previews
+"""
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+from app.services.pdf_renderer import get_or_render_pdf
+from app.services.template_service import (
+    FileCache,
+    export_stylesheet,
+    get_available_templates,
+    render_resume_for_export,
+    render_resume_html,
+    resume_render_key,
+)
+from app.services.thumbnail_service import pdf_first_page_png
+
+SAMPLE_PURPOSE = "software_engineer"
+
+# Sample data for previews
+SAMPLE_RESUME = {
+    "meta": {
+        "purpose": "software_engineer",
+        "language": "en",
+        "tone": "professional"
+    },
+    "profile": {
+        "fullName": "Alex Johnson",
+        "headline": "Senior Software Engineer",
+        "contact": {
+            "email": "alex@example.com",
+            "phone": "+1 (555) 123-4567",
+            "location": "San Francisco, CA",
+            "linkedin": "linkedin.com/in/alexjohnson",
+            "portfolio": "github.com/alexj"
+        }
+    },
+    "sections": {
+        "summary": "Experienced software engineer with 8+ years building scalable web applications. Passionate about clean code, mentoring, and delivering impactful products.",
+        "experience": [
+            {
+                "company": "TechCorp Inc.",
+                "role": "Senior Software Engineer",
+                "location": "San Francisco, CA",
+                "startDate": "Jan 2021",
+                "endDate": "Present",
+                "bullets": [
+                    "Led development of microservices architecture serving 10M+ users",
+                    "Reduced API latency by 40% through caching optimization",
+                    "Mentored team of 5 junior developers"
+                ]
+            },
+            {
+                "company": "StartupXYZ",
+                "role": "Software Engineer",
+                "location": "Remote",
+                "startDate": "Jun 2018",
+                "endDate": "Dec 2020",
+                "bullets": [
+                    "Built real-time collaboration features using WebSockets",
+                    "Implemented CI/CD pipeline reducing deployment time by 60%"
+                ]
+            }
+        ],
+        "projects": [
+            {
+                "name": "Open Source CLI Tool",
+                "description": "Command-line tool for automating development workflows",
+                "technologies": ["Python", "Click", "Docker"]
+            }
+        ],
+        "education": [
+            {
+                "institution": "University of California, Berkeley",
+                "degree": "B.S.",
+                "field": "Computer Science",
+                "startDate": "2014",
+                "endDate": "2018"
+            }
+        ],
+        "skills": ["Python", "TypeScript", "React", "Node.js", "PostgreSQL", "AWS", "Docker", "Kubernetes"],
+        "certifications": [
+            {
+                "name": "AWS Solutions Architect",
+                "issuer": "Amazon Web Services",
+                "date": "2023"
+            }
+        ],
+        "awards": []
+    }
+}
+
+
+_preview_files = FileCache()
+_build_lock = threading.Lock()
+
+
+def preview_dir() -> Path:
+    return Path(settings.TEMPLATE_PREVIEW_DIR or os.path.join(tempfile.gettempdir(), "applypilot_template_previews"))
+
+
+def preview_key(template_slug: str) -> str:
+    """Render cache key (and ETag) of the sample preview; changes with the template version."""
+    return resume_render_key(template_slug, SAMPLE_RESUME, purpose=SAMPLE_PURPOSE)
+
+
+def preview_name(template_slug: str, extension: str) -> str:
+    return f"{template_slug}-{preview_key(template_slug)[:16]}.{extension}"
+
+
+# Served by GET /api/templates/previews/{name}; relative, so it works on
+# whatever host the client reached the API through
+PREVIEW_ROUTE = "/api/templates/previews"
+
+
+def preview_url(name: str) -> str:
+    base = settings.TEMPLATE_PREVIEW_BASE_URL or PREVIEW_ROUTE
+    return f"{base.rstrip('/')}/{name}"
+
+
+def thumbnail_url(template_slug: str) -> Optional[str]:
+    """URL of the current thumbnail, or None until it has been built."""
+    name = preview_name(template_slug, "png")
+    return preview_url(name) if (preview_dir() / name).exists() else None
+
+
+def read_preview_html(template_slug: str) -> Optional[str]:
+    """Pre-rendered sample preview for the current template version, if built."""
+    return _preview_files.get(preview_dir() / preview_name(template_slug, "html"))
+
+
+def _write_atomic(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".preview-")
+    with os.fdopen(descriptor, "wb") as handle:
+        handle.write(content)
+    os.replace(temp_path, path)
+
+
+def _remove_stale(directory: Path, template_slug: str, current: Set[str]) -> None:
+    """Delete files left by earlier versions of the template."""
+    pattern = re.compile(rf"^{re.escape(template_slug)}-[0-9a-f]{{16}}\.(html|png)$")
+    for path in directory.glob(f"{template_slug}-*"):
+        if path.name not in current and pattern.match(path.name):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def build_template_preview(template_slug: str) -> Dict[str, Any]:
+    """Write the HTML preview and PNG thumbnail for a template unless they exist."""
+    directory = preview_dir()
+    html_path = directory / preview_name(template_slug, "html")
+    png_path = directory / preview_name(template_slug, "png")
+    result = {"slug": template_slug, "html": False, "thumbnail": False}
+
+    if not html_path.exists():
+        html = render_resume_html(template_slug=template_slug, resume_data=SAMPLE_RESUME, purpose=SAMPLE_PURPOSE)
+        _write_atomic(html_path, html.encode("utf-8"))
+        result["html"] = True
+
+    _remove_stale(directory, template_slug, {html_path.name, png_path.name})
+
+    if not png_path.exists():
+        export_html = render_resume_for_export(
+            template_slug=template_slug,
+            resume_data=SAMPLE_RESUME,
+            purpose=SAMPLE_PURPOSE,
+            inline_css=False
+        )
+        chunks, _, _ = get_or_render_pdf(export_html, export_stylesheet(template_slug))
+        _write_atomic(png_path, pdf_first_page_png(b"".join(chunks), settings.THUMBNAIL_WIDTH))
+        result["thumbnail"] = True
+
+    return result
+
+
+def build_template_previews() -> Dict[str, int]:
+    """Build missing previews for every filesystem resume template."""
+    stats = {"templates": 0, "built": 0, "failed": 0}
+    with _build_lock:
+        for template in get_available_templates():
+            if template.get("type", "resume") != "resume":
+                continue
+            stats["templates"] += 1
+            try:
+                result = build_template_preview(template["slug"])
+            except Exception as e:
+                # Missing thumbnails are not fatal; the gallery falls back to live previews
+                stats["failed"] += 1
+                print(f"[TemplatePreviews] {template['slug']} failed: {e}")
+                continue
+            if result["html"] or result["thumbnail"]:
+                stats["built"] += 1
+    print(f"[TemplatePreviews] {stats}")
+    return stats
+
+
+def start_preview_build() -> threading.Thread:
+    """Build previews in a background thread so startup is not held up by PDF rendering."""
+    def run() -> None:
+        from app.services.template_catalog import template_catalog
+        build_template_previews()
+        # New thumbnails change the catalog signature
+        template_catalog.invalidate()
+
+    thread = threading.Thread(target=run, name="template-previews", daemon=True)
+    thread.start()
+    return thread
@@ -3,49 +3,141 @@ Template rendering service - merges resume data with HTML templates.
 """
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
 
+from app.core.config import settings
 from app.schemas.resume_content import PURPOSE_PRESETS, AVAILABLE_TOKENS
+from app.services.pdf_renderer import STYLESHEET_PLACEHOLDER
+from app.services.render_cache import render_cache, render_cache_key
 
 
 # Template directory
 TEMPLATES_DIR = Path(__file__).parent.parent.parent / "templates" / "resume"
 
 
+class FileCache:
+    """
+    Parsed file contents, re-read only when a file's mtime or size changes.
+    A missing file gives None.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, parse: Callable[[str], Any] = str) -> Optional[Any]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._entries.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            value = parse(f.read())
+        with self._lock:
+            self._entries[path] = (signature, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TemplateRegistry:
+    """
+    Process-wide cache of compiled templates, configs and CSS for a templates
+    directory.
+    
+    One Jinja environment is shared by all renders, so templates are compiled
+    once per process (and once per host with the bytecode cache). Jinja checks
+    template mtimes on lookup, and config.json/styles.css are re-read only when
+    their mtime or size changes, so edits on disk apply without a restart.
+    """
+
+    def __init__(
+        self,
+        templates_dir: Path,
+        bytecode_cache: bool = True,
+        bytecode_cache_dir: Optional[str] = None,
+    ):
+        self.templates_dir = Path(templates_dir)
+        self.env = Environment(
+            loader=FileSystemLoader(str(self.templates_dir)),
+            autoescape=select_autoescape(['html', 'xml']),
+            trim_blocks=True,
+            lstrip_blocks=True,
+            auto_reload=True,
+            cache_size=400,
+            # Keyed by template name and source checksum, so edited templates never load stale code
+            bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir) if bytecode_cache else None,
+        )
+        self.files = FileCache()
+
+    def get_template(self, template_slug: str) -> Template:
+        return self.env.get_template(f"{template_slug}/index.html")
+
+    def get_config(self, template_slug: str) -> Dict[str, Any]:
+        """Parsed config.json, shared between callers - do not mutate."""
+        return self.files.get(self.templates_dir / template_slug / "config.json", json.loads) or {}
+
+    def get_css(self, template_slug: str) -> str:
+        return self.files.get(self.templates_dir / template_slug / "styles.css") or ""
+
+    def template_version(self, template_slug: str) -> str:
+        """Changes whenever the template's HTML, CSS or config file changes."""
+        parts = []
+        for name in ("index.html", "styles.css", "config.json"):
+            try:
+                stat = (self.templates_dir / template_slug / name).stat()
+            except FileNotFoundError:
+                parts.append("-")
+                continue
+            parts.append(f"{stat.st_mtime_ns:x}-{stat.st_size:x}")
+        return ".".join(parts)
+
+    def clear(self) -> None:
+        self.files.clear()
+        if self.env.cache is not None:
+            self.env.cache.clear()
+
+
+template_registry = TemplateRegistry(
+    TEMPLATES_DIR,
+    bytecode_cache=settings.TEMPLATE_BYTECODE_CACHE,
+    bytecode_cache_dir=settings.TEMPLATE_BYTECODE_CACHE_DIR,
+)
+
+
 def get_template_env() -> Environment:
-    """Create Jinja2 environment for template rendering."""
-    return Environment(
-        loader=FileSystemLoader(str(TEMPLATES_DIR)),
-        autoescape=select_autoescape(['html', 'xml']),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
+    """Shared Jinja2 environment for template rendering."""
+    return template_registry.env
 
 
 def load_template_config(template_slug: str) -> Dict[str, Any]:
     """
-    Load template configuration from config.json.
+    Load template configuration from config.json (cached until the file changes).
     
     Args:
         template_slug: Template folder name (modern, classic, minimal)
         
     Returns:
-        Configuration dictionary
+        Configuration dictionary - shared, so treat it as read-only
     """
-    config_path = TEMPLATES_DIR / template_slug / "config.json"
-    if not config_path.exists():
-        return {}
-    
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return template_registry.get_config(template_slug)
 
 
 def load_template_css(template_slug: str) -> str:
     """
-    Load template CSS content.
+    Load template CSS content (cached until the file changes).
     
     Args:
         template_slug: Template folder name
@@ -53,12 +145,7 @@ def load_template_css(template_slug: str) -> str:
     Returns:
         CSS content as string
     """
-    css_path = TEMPLATES_DIR / template_slug / "styles.css"
-    if not css_path.exists():
-        return ""
-    
-    with open(css_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    return template_registry.get_css(template_slug)
 
 
 def get_available_templates() -> list[Dict[str, Any]]:
@@ -182,17 +269,31 @@ def render_resume_html(
         resume_data: Resume data in canonical schema
         design_tokens: Design token overrides
         purpose: Resume purpose for section ordering
-        inline_css: Whether to inline CSS in the HTML
+        inline_css: Whether to inline CSS in the HTML. PDF export leaves
+            STYLESHEET_PLACEHOLDER in its place and passes the CSS to the
+            PDF renderer separately (see export_stylesheet)
         profile: User profile data for rendering (name, email, phone, etc.)
         
     Returns:
         Rendered HTML string
     """
-    env = get_template_env()
-    
+    template, context = _resume_template_context(
+        template_slug, resume_data, design_tokens, purpose, inline_css, profile
+    )
+    return template.render(**context)
+
+
+def _resume_template_context(
+    template_slug: str,
+    resume_data: Dict[str, Any],
+    design_tokens: Optional[Dict[str, str]],
+    purpose: Optional[str],
+    inline_css: bool,
+    profile: Optional[Dict[str, Any]],
+) -> Tuple[Template, Dict[str, Any]]:
     # Load template
     try:
-        template = env.get_template(f"{template_slug}/index.html")
+        template = template_registry.get_template(template_slug)
     except Exception as e:
         raise ValueError(f"Template '{template_slug}' not found: {e}")
     
@@ -204,7 +305,7 @@ def render_resume_html(
     emphasis = get_section_emphasis(purpose or resume_data.get("meta", {}).get("purpose"))
     
     # Load template CSS
-    css = load_template_css(template_slug)
+    css = load_template_css(template_slug) if inline_css else STYLESHEET_PLACEHOLDER
     
     # Prepare template context - unified with cover letter schema
     context = {
@@ -236,11 +337,173 @@ def render_resume_html(
         "section_order": section_order,
         "emphasis": emphasis,
     }
+    return template, context
+
+
+# --- section fragments ---
+
+# Templates render their sections in a {% for section in section_order %}
+# loop. For incremental preview a resume is split without any help from the
+# template: it is rendered once with an empty section_order (the frame) and
+# once per section with only that section, and the section's fragment is what
+# it adds to the frame. This needs a section's markup to depend only on its
+# own data and the layout context (tokens, profile, meta, order, emphasis),
+# and the sections to be rendered back to back at one place. Templates that
+# don't split that way get no fragments and are always sent whole.
+
+# Context entries other than section data that sections may read
+_LAYOUT_KEYS = (
+    "font_family_token", "spacing_token", "accent_color_token",
+    "profile", "basics", "meta", "section_order", "emphasis",
+)
+
+# Comments around each section in a fragmented document, so clients can
+# swap one section without affecting layout or styling
+SECTION_START = "<!--section:{}-->"
+SECTION_END = "<!--/section:{}-->"
+
+
+def _render_with_sections(template: Template, context: Dict[str, Any], section_order: list) -> str:
+    return template.render(**{**context, "section_order": section_order})
+
+
+def _split_fragment(frame: str, single: str) -> Optional[Tuple[int, int, str]]:
+    """
+    (at, slack, html) such that single == frame[:at] + html + frame[at:], or
+    None if single isn't the frame with one insertion. The insertion could
+    equally sit anywhere from at to at + slack.
+    """
+    if len(single) < len(frame):
+        return None
+    prefix = len(os.path.commonprefix([frame, single]))
+    suffix = min(len(os.path.commonprefix([frame[::-1], single[::-1]])), len(frame))
+    at = len(frame) - suffix
+    if at > prefix:
+        return None
+    return at, prefix - at, single[at:at + len(single) - len(frame)]
+
+
+def _section_fragment(
+    template: Template,
+    context: Dict[str, Any],
+    frame: str,
+    key: str,
+    section: str,
+) -> Optional[Tuple[int, int, str]]:
+    def render() -> str:
+        split = _split_fragment(frame, _render_with_sections(template, context, [section]))
+        return "-" if split is None else "%d:%d:%s" % split
+    
+    cached = render_cache.get_or_render(key, render)
+    if cached == "-":
+        return None
+    at, slack, html = cached.split(":", 2)
+    return int(at), int(slack), html
+
+
+def render_resume_fragments(
+    template_slug: str,
+    resume_data: Dict[str, Any],
+    design_tokens: Optional[Dict[str, str]] = None,
+    purpose: Optional[str] = None,
+    profile: Optional[Dict[str, Any]] = None,
+    known_layout: Optional[str] = None
+) -> Tuple[str, Dict[str, Tuple[str, str]], Optional[str]]:
+    """
+    Per-section fragments of a resume for incremental preview.
+    
+    Returns (layout key, {section: (fragment key, html)}, document). The
+    layout key covers everything outside the sections - template, tokens,
+    profile, order, and whatever the template renders outside its section
+    loop. Fragments are cached by the layout and the section's own data, so
+    only edited sections render. The document (with SECTION_START and
+    SECTION_END around every section) is only built when known_layout isn't
+    the current layout key. Templates that don't split into sections give
+    no fragments and always the whole document.
+    """
+    template, context = _resume_template_context(
+        template_slug, resume_data, design_tokens, purpose, True, profile
+    )
+    frame = _render_with_sections(template, context, [])
+    layout = render_cache_key(
+        "layout",
+        template_slug,
+        template_registry.template_version(template_slug),
+        {key: context[key] for key in _LAYOUT_KEYS},
+        frame,
+    )
     
-    # Render HTML
-    html = template.render(**context)
+    pieces = {}
+    for section in dict.fromkeys(context["section_order"]):
+        key = render_cache_key("fragment", layout, section, context["sections"].get(section))
+        piece = _section_fragment(template, context, frame, key, section)
+        if piece is None:
+            return layout, {}, template.render(**context)
+        pieces[section] = (key, piece)
     
-    return html
+    # One insertion point valid for every section (an empty section fits
+    # anywhere), moved back out of any tag so the section comments are
+    # well-formed. It is part of the layout, so the client only ever swaps
+    # fragments into a document with comments in the same place.
+    filled = [(start, slack) for _, (start, slack, html) in pieces.values() if html]
+    if not filled:
+        return layout, {}, template.render(**context)
+    lowest = max(start for start, _ in filled)
+    at = min(start + slack for start, slack in filled)
+    if frame.rfind("<", 0, at) > frame.rfind(">", 0, at):
+        at = frame.rfind("<", 0, at)
+    if at < lowest:
+        return layout, {}, template.render(**context)
+    layout = render_cache_key(layout, at)
+    
+    fragments = {}
+    for section, (key, (start, _, html)) in pieces.items():
+        if html and at > start:
+            # Same insertion, shifted to `at` (the fragment's key changes with it)
+            html = (html + frame[start:at])[at - start:]
+            key = render_cache_key(key, at - start)
+        fragments[section] = (key, html)
+    
+    def assemble(marked: bool) -> str:
+        parts = [frame[:at]]
+        for section, (_, html) in fragments.items():
+            parts.append(SECTION_START.format(section) + html + SECTION_END.format(section) if marked else html)
+        parts.append(frame[at:])
+        return "".join(parts)
+    
+    # Checked against a plain render once per layout; catches separators
+    # between sections and anything else that keeps a template from splitting
+    split_ok = render_cache.get_or_render(
+        render_cache_key("fragment-split", layout),
+        lambda: "1" if assemble(False) == template.render(**context) else "0",
+    )
+    if split_ok != "1":
+        return layout, {}, template.render(**context)
+    if known_layout == layout:
+        return layout, fragments, None
+    return layout, fragments, assemble(True)
+
+
+def resume_render_key(
+    template_slug: str,
+    resume_data: Dict[str, Any],
+    design_tokens: Optional[Dict[str, str]] = None,
+    purpose: Optional[str] = None,
+    profile: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Render cache key (and ETag) for render_resume_html called with the same
+    arguments. Covers the template version, so edited templates get new keys.
+    """
+    return render_cache_key(
+        "resume",
+        template_slug,
+        template_registry.template_version(template_slug),
+        resume_data,
+        resolve_design_tokens(design_tokens, template_slug),
+        purpose or resume_data.get("meta", {}).get("purpose"),
+        profile,
+    )
 
 
 def render_resume_for_export(
@@ -248,7 +511,8 @@ def render_resume_for_export(
     resume_data: Dict[str, Any],
     design_tokens: Optional[Dict[str, str]] = None,
     purpose: Optional[str] = None,
-    page_size: str = "A4"
+    page_size: str = "A4",
+    inline_css: bool = True
 ) -> str:
     """
     Render resume HTML optimized for PDF export.
@@ -259,6 +523,8 @@ def render_resume_for_export(
         design_tokens: Design tokens
         purpose: Resume purpose
         page_size: Page size (A4 or letter)
+        inline_css: Whether to inline CSS; pass False and hand
+            export_stylesheet() to the PDF renderer instead
         
     Returns:
         Export-ready HTML
@@ -268,7 +534,7 @@ def render_resume_for_export(
         resume_data=resume_data,
         design_tokens=design_tokens,
         purpose=purpose,
-        inline_css=True
+        inline_css=inline_css
     )
     
     # Update page size if needed
@@ -276,3 +542,15 @@ def render_resume_for_export(
         html = html.replace("size: A4;", "size: letter;")
     
     return html
+
+
+def export_stylesheet(template_slug: str, page_size: str = "A4") -> str:
+    """
+    Template CSS for PDF export. The renderer applies it where the HTML holds
+    STYLESHEET_PLACEHOLDER, with the same precedence as inlined CSS. The text only changes with the template file and page size, so the PDF
+    workers parse each variant once.
+    """
+    css = load_template_css(template_slug)
+    if page_size.lower() == "letter":
+        css = css.replace("size: A4;", "size: letter;")
+    return css
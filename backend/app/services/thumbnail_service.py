@@ -0,0 +1,67 @@
+"""
+Low-resolution PNG thumbnails of rendered documents.
+
+The document goes through the PDF renderer (and its cache) and the first page
+is rasterized with pypdfium2, so a thumbnail looks exactly like the export.
+"""
+import base64
+import io
+from typing import Optional
+
+# PDF rasterization - optional
+try:
+    import pypdfium2
+    PYPDFIUM2_AVAILABLE = True
+except ImportError:
+    PYPDFIUM2_AVAILABLE = False
+
+from app.core.config import settings
+from app.services.pdf_renderer import get_or_render_pdf, pdf_cache_key
+from app.services.render_cache import render_cache, render_cache_key
+
+
+def pdf_first_page_png(pdf: bytes, width: int) -> bytes:
+    """First page of a PDF as a PNG `width` pixels wide."""
+    if not PYPDFIUM2_AVAILABLE:
+        raise RuntimeError("pypdfium2 is not installed. Install with: pip install pypdfium2")
+
+    document = pypdfium2.PdfDocument(pdf)
+    try:
+        if not len(document):
+            raise ValueError("PDF has no pages.")
+        page = document[0]
+        try:
+            page_width, _ = page.get_size()
+            bitmap = page.render(scale=width / page_width)
+            try:
+                image = bitmap.to_pil()
+            finally:
+                bitmap.close()
+        finally:
+            page.close()
+    finally:
+        document.close()
+
+    output = io.BytesIO()
+    image.convert("RGB").save(output, format="PNG", optimize=True)
+    return output.getvalue()
+
+
+def png_data_url(png: bytes) -> str:
+    return "data:image/png;base64," + base64.b64encode(png).decode("ascii")
+
+
+def html_thumbnail(html: str, css: Optional[str] = None, width: Optional[int] = None) -> str:
+    """
+    Thumbnail of an HTML document as a PNG data URL. Blocks while rendering;
+    call it from a threadpool in async code. Thumbnails are kept in the render
+    cache under the PDF's content address.
+    """
+    width = width or settings.THUMBNAIL_WIDTH
+    key = render_cache_key("thumbnail", pdf_cache_key(html, css), width)
+
+    def render() -> str:
+        chunks, _, _ = get_or_render_pdf(html, css)
+        return png_data_url(pdf_first_page_png(b"".join(chunks), width))
+
+    return render_cache.get_or_render(key, render)
@@ -0,0 +1,3 @@
+"""Local performance benchmarks. Run from the backend directory, e.g.
+``python -m benchmarks.pdf_extraction path/to/resume.pdf``.
+"""
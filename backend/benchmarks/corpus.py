@@ -0,0 +1,405 @@
+"""
+Synthetic resume corpus for extraction benchmarks.
+
+Generates PDF and DOCX resumes locally from a seed, so every run (and every
+commit) benchmarks the same bytes. Documents vary in page count and layout:
+single column, two columns (sidebar + main) and table-based sections. PDFs
+are written directly with compressed content streams and DOCX files as a
+minimal WordprocessingML package, so no extra dependencies are needed.
+
+Usage:
+    python -m benchmarks.corpus out_dir [--count 40] [--seed 1]
+"""
+import argparse
+import json
+import random
+import sys
+import textwrap
+import zipfile
+import zlib
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+LAYOUTS = ("single", "two_column", "table")
+PAGE_COUNTS = (1, 1, 2, 2, 3, 5)
+
+_FIRST_NAMES = ["Jane", "Amara", "Luis", "Chen", "Priya", "Tomasz", "Grace", "Kwame", "Sofia", "Daniel"]
+_LAST_NAMES = ["Doe", "Okafor", "Martinez", "Wei", "Sharma", "Nowak", "Hopper", "Mensah", "Rossi", "Kim"]
+_CITIES = ["Austin, TX", "Seattle, WA", "New York, NY", "Denver, CO", "Remote", "Chicago, IL", "Boston, MA"]
+_COMPANIES = [
+    "Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Enterprises",
+    "Hooli", "Pied Piper", "Vandelay Industries", "Soylent Systems", "Cyberdyne", "Tyrell Corp",
+]
+_ROLES = [
+    "Software Engineer", "Senior Software Engineer", "Data Analyst", "Product Manager",
+    "Backend Developer", "DevOps Engineer", "Machine Learning Engineer", "QA Engineer",
+]
+_SCHOOLS = ["University of Texas at Austin", "State University", "Institute of Technology", "City College"]
+_DEGREES = ["Bachelor of Science", "Master of Science", "B.A.", "MBA"]
+_FIELDS = ["Computer Science", "Mathematics", "Economics", "Information Systems"]
+_SKILLS = [
+    "Python", "JavaScript", "TypeScript", "React", "FastAPI", "Django", "PostgreSQL", "Redis",
+    "Docker", "Kubernetes", "AWS", "Terraform", "GraphQL", "Go", "Java", "Spark", "Airflow",
+    "Pandas", "TensorFlow", "Git", "Linux", "CI/CD", "Kafka", "Elasticsearch",
+]
+_VERBS = ["Built", "Led", "Designed", "Migrated", "Automated", "Reduced", "Improved", "Launched", "Scaled"]
+_OBJECTS = [
+    "the billing pipeline", "an internal analytics dashboard", "the customer onboarding flow",
+    "a real-time event ingestion service", "the legacy monolith", "nightly ETL jobs",
+    "the public REST API", "the recommendation engine", "deployment tooling",
+]
+_OUTCOMES = [
+    "cutting latency by 40%", "saving $120k per year", "serving 2M requests per day",
+    "reducing on-call pages by half", "improving conversion by 12%", "with zero downtime",
+]
+
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+# Letter page at 10pt Helvetica with 13pt leading between 1in margins
+_PAGE_TOP = 756
+_PAGE_BOTTOM = 54
+_LEADING = 13
+
+
+# === Content ===
+
+def _bullet(rng: random.Random) -> str:
+    return f"{rng.choice(_VERBS)} {rng.choice(_OBJECTS)} using {rng.choice(_SKILLS)}, {rng.choice(_OUTCOMES)}."
+
+
+def _date_range(rng: random.Random, year: int) -> Tuple[str, str, int]:
+    start = year - rng.randint(1, 3)
+    end = "Present" if year >= 2026 else f"{rng.choice(_MONTHS)} {year}"
+    return f"{rng.choice(_MONTHS)} {start}", end, start
+
+
+def make_resume(rng: random.Random, pages: int, entries_per_page: int = 8) -> Dict[str, Any]:
+    """Build resume content sized to roughly fill the requested number of pages."""
+    name = f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}"
+    handle = name.lower().replace(" ", ".")
+    resume: Dict[str, Any] = {
+        "name": name,
+        "headline": rng.choice(_ROLES),
+        "contact": [
+            f"{handle}@example.com",
+            f"+1 (555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            rng.choice(_CITIES),
+            f"linkedin.com/in/{handle.replace('.', '-')}",
+        ],
+        "summary": " ".join(_bullet(rng) for _ in range(2)),
+        "skills": rng.sample(_SKILLS, rng.randint(8, 16)),
+        "education": [],
+        "experience": [],
+        "projects": [],
+    }
+
+    year = 2026
+    for _ in range(rng.randint(1, 2)):
+        start, end, year = _date_range(rng, year)
+        resume["education"].append({
+            "school": rng.choice(_SCHOOLS),
+            "degree": f"{rng.choice(_DEGREES)} in {rng.choice(_FIELDS)}",
+            "dates": f"{start} - {end}",
+        })
+
+    # The first page also carries the header, contact and education blocks
+    year = 2026
+    for _ in range(max(2, pages * entries_per_page - 4)):
+        start, end, year = _date_range(rng, year)
+        resume["experience"].append({
+            "company": rng.choice(_COMPANIES),
+            "role": rng.choice(_ROLES),
+            "location": rng.choice(_CITIES),
+            "dates": f"{start} - {end}",
+            "bullets": [_bullet(rng) for _ in range(rng.randint(3, 5))],
+        })
+        year -= 1
+
+    for index in range(rng.randint(1, 3)):
+        resume["projects"].append({
+            "name": f"Project {rng.choice(['Atlas', 'Beacon', 'Comet', 'Drift', 'Ember'])} {index + 1}",
+            "description": _bullet(rng),
+            "technologies": rng.sample(_SKILLS, 3),
+        })
+    return resume
+
+
+def _section_lines(resume: Dict[str, Any], width: int, sections: List[str]) -> List[Tuple[str, str]]:
+    """Flatten sections into (style, text) lines wrapped to width characters."""
+    lines: List[Tuple[str, str]] = []
+
+    def wrap(text: str, style: str = "text", indent: str = "") -> None:
+        for index, part in enumerate(textwrap.wrap(text, width - len(indent)) or [""]):
+            lines.append((style, (indent if index else "") + part))
+
+    for section in sections:
+        if section == "contact":
+            for item in resume["contact"]:
+                wrap(item)
+            continue
+        lines.append(("heading", section.upper()))
+        if section == "summary":
+            wrap(resume["summary"])
+        elif section == "skills":
+            wrap(", ".join(resume["skills"]))
+        elif section == "education":
+            for entry in resume["education"]:
+                wrap(entry["degree"], "bold")
+                wrap(entry["school"])
+                wrap(entry["dates"])
+        elif section == "experience":
+            for entry in resume["experience"]:
+                wrap(f"{entry['role']} | {entry['company']} | {entry['location']} | {entry['dates']}", "bold")
+                for bullet in entry["bullets"]:
+                    wrap(f"- {bullet}", indent="  ")
+        elif section == "projects":
+            for entry in resume["projects"]:
+                wrap(entry["name"], "bold")
+                wrap(entry["description"])
+                wrap("Technologies: " + ", ".join(entry["technologies"]))
+        lines.append(("text", ""))
+    return lines
+
+
+# === PDF ===
+
+def _pdf_string(text: str) -> str:
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+class _PdfPage:
+    def __init__(self):
+        self.ops: List[str] = []
+
+    def text(self, x: float, y: float, text: str, bold: bool = False, size: float = 10) -> None:
+        font = "F2" if bold else "F1"
+        self.ops.append(f"BT /{font} {size} Tf {x} {y} Td ({_pdf_string(text)}) Tj ET")
+
+    def rule(self, x1: float, y1: float, x2: float, y2: float) -> None:
+        self.ops.append(f"{x1} {y1} m {x2} {y2} l S")
+
+
+def _write_pdf(pages: List[_PdfPage]) -> bytes:
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    regular = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    bold = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>")
+    pages_id = add(b"")
+    kids = []
+    for page in pages:
+        stream = zlib.compress("\n".join(page.ops).encode("latin-1"))
+        contents = add(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R /F2 %d 0 R >> >> >>" % (pages_id, contents, regular, bold)
+        ))
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+def _flow_column(pages: List[_PdfPage], lines: List[Tuple[str, str]], x: float, first_y: float) -> None:
+    """Lay lines down a column, starting new pages as needed."""
+    page_index, y = 0, first_y
+    for style, text in lines:
+        if y < _PAGE_BOTTOM:
+            page_index, y = page_index + 1, _PAGE_TOP
+        while len(pages) <= page_index:
+            pages.append(_PdfPage())
+        if text:
+            pages[page_index].text(x, y, text, bold=style in ("heading", "bold"), size=11 if style == "heading" else 10)
+        y -= _LEADING
+
+
+def render_pdf(resume: Dict[str, Any], layout: str) -> bytes:
+    first = _PdfPage()
+    first.text(54, _PAGE_TOP, resume["name"], bold=True, size=18)
+    first.text(54, _PAGE_TOP - 20, resume["headline"], size=12)
+    pages = [first]
+    body_top = _PAGE_TOP - 44
+
+    if layout == "two_column":
+        sidebar = _section_lines(resume, 30, ["contact", "skills", "education"])
+        main = _section_lines(resume, 62, ["summary", "experience", "projects"])
+        _flow_column(pages, sidebar, 54, body_top)
+        _flow_column(pages, main, 230, body_top)
+    elif layout == "table":
+        first.text(54, body_top, "  |  ".join(resume["contact"]))
+        y = body_top - 2 * _LEADING
+        # Skills and education as ruled tables
+        first.text(54, y, "SKILLS", bold=True, size=11)
+        y -= _LEADING
+        columns = 4
+        for row_start in range(0, len(resume["skills"]), columns):
+            first.rule(54, y + _LEADING - 3, 558, y + _LEADING - 3)
+            for column, skill in enumerate(resume["skills"][row_start:row_start + columns]):
+                first.text(58 + column * 126, y, skill)
+            y -= _LEADING
+        first.rule(54, y + _LEADING - 3, 558, y + _LEADING - 3)
+        y -= _LEADING
+        first.text(54, y, "EDUCATION", bold=True, size=11)
+        y -= _LEADING
+        for entry in resume["education"]:
+            first.rule(54, y + _LEADING - 3, 558, y + _LEADING - 3)
+            first.text(58, y, entry["school"][:34])
+            first.text(250, y, entry["degree"][:40])
+            first.text(470, y, entry["dates"])
+            y -= _LEADING
+        first.rule(54, y + _LEADING - 3, 558, y + _LEADING - 3)
+        _flow_column(pages, _section_lines(resume, 95, ["summary", "experience", "projects"]), 54, y - _LEADING)
+    else:
+        lines = _section_lines(resume, 95, ["contact", "summary", "experience", "education", "skills", "projects"])
+        _flow_column(pages, lines, 54, body_top)
+    return _write_pdf(pages)
+
+
+# === DOCX ===
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+
+
+def _docx_paragraph(text: str, bold: bool = False, size: Optional[int] = None) -> str:
+    props = ""
+    if bold or size:
+        props = "<w:rPr>" + ("<w:b/>" if bold else "") + (f'<w:sz w:val="{size * 2}"/>' if size else "") + "</w:rPr>"
+    return f'<w:p><w:r>{props}<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def _docx_table(rows: List[List[str]]) -> str:
+    body = "".join(
+        "<w:tr>" + "".join(f"<w:tc>{_docx_paragraph(cell)}</w:tc>" for cell in row) + "</w:tr>"
+        for row in rows
+    )
+    return f'<w:tbl><w:tblPr><w:tblBorders><w:insideH w:val="single"/></w:tblBorders></w:tblPr>{body}</w:tbl>'
+
+
+def render_docx(resume: Dict[str, Any], layout: str) -> bytes:
+    blocks = [_docx_paragraph(resume["name"], bold=True, size=18), _docx_paragraph(resume["headline"], size=12)]
+
+    if layout == "table":
+        blocks.append(_docx_paragraph("  |  ".join(resume["contact"])))
+        blocks.append(_docx_paragraph("SKILLS", bold=True))
+        skills = resume["skills"]
+        blocks.append(_docx_table([skills[index:index + 4] for index in range(0, len(skills), 4)]))
+        blocks.append(_docx_paragraph("EDUCATION", bold=True))
+        blocks.append(_docx_table([[entry["school"], entry["degree"], entry["dates"]] for entry in resume["education"]]))
+        sections = ["summary", "experience", "projects"]
+    elif layout == "two_column":
+        sections = ["contact", "skills", "education", "summary", "experience", "projects"]
+    else:
+        sections = ["contact", "summary", "experience", "education", "skills", "projects"]
+
+    # Word wraps paragraphs itself, so lines are only split per logical item
+    for style, text in _section_lines(resume, 10_000, sections):
+        blocks.append(_docx_paragraph(text, bold=style in ("heading", "bold")))
+
+    columns = '<w:cols w:num="2" w:space="360"/>' if layout == "two_column" else ""
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{_W_NS}"><w:body>{"".join(blocks)}'
+        f'<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>{columns}</w:sectPr>'
+        "</w:body></w:document>"
+    )
+
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", _CONTENT_TYPES_XML)
+        package.writestr("_rels/.rels", _RELS_XML)
+        package.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+# === Corpus ===
+
+def iter_corpus(count: int = 40, seed: int = 1) -> Iterator[Dict[str, Any]]:
+    """
+    Yield corpus documents as dicts with name, content_type, layout, pages and content.
+    Alternates PDF and DOCX; the same seed always yields the same bytes.
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        layout = LAYOUTS[index % len(LAYOUTS)]
+        pages = rng.choice(PAGE_COUNTS)
+        # Narrow two-column text wraps more, so fewer entries fill a page
+        resume = make_resume(rng, pages, 5 if layout == "two_column" else 7)
+        if index % 2 == 0:
+            name, content_type, content = f"resume_{index:03d}.pdf", PDF_CONTENT_TYPE, render_pdf(resume, layout)
+        else:
+            name, content_type, content = f"resume_{index:03d}.docx", DOCX_CONTENT_TYPE, render_docx(resume, layout)
+        yield {"name": name, "content_type": content_type, "layout": layout, "pages": pages, "content": content}
+
+
+def write_corpus(out_dir: str, count: int = 40, seed: int = 1) -> List[Dict[str, Any]]:
+    """Write the corpus and a manifest.json describing each file."""
+    directory = Path(out_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for document in iter_corpus(count, seed):
+        (directory / document["name"]).write_bytes(document["content"])
+        manifest.append({key: value for key, value in document.items() if key != "content"})
+    (directory / "manifest.json").write_text(json.dumps({"seed": seed, "documents": manifest}, indent=2))
+    return manifest
+
+
+def load_corpus(directory: str) -> List[Dict[str, Any]]:
+    """Read a corpus written by write_corpus back into memory."""
+    path = Path(directory)
+    manifest = json.loads((path / "manifest.json").read_text())
+    return [{**entry, "content": (path / entry["name"]).read_bytes()} for entry in manifest["documents"]]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir", help="Directory to write the corpus into")
+    parser.add_argument("--count", type=int, default=40, help="Number of documents")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args(argv)
+
+    manifest = write_corpus(args.out_dir, count=args.count, seed=args.seed)
+    print(f"Wrote {len(manifest)} documents to {args.out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Benchmark the resume extraction pipeline stage by stage.
+
+Runs extract_text, segment_resume, basic_parse_resume and
+validate_resume_schema over a synthetic corpus (see benchmarks.corpus) and
+reports docs/sec, p50/p99 latency and tracemalloc peak per stage. Timings
+and memory are measured in separate passes so tracing overhead doesn't skew
+latency. Save the JSON output per commit and compare with --baseline.
+
+Usage:
+    python -m benchmarks.extraction_pipeline [--count 40] [--seed 1] [--repeat 3]
+    python -m benchmarks.extraction_pipeline --corpus corpus_dir --json > after.json
+    python -m benchmarks.extraction_pipeline --baseline before.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from app.services.extraction_service import basic_parse_resume, extract_text, validate_resume_schema
+from app.services.section_segmenter import segment_resume
+from benchmarks.corpus import iter_corpus, load_corpus
+
+STAGES = ("extract_text", "segment_resume", "basic_parse_resume", "validate_resume_schema")
+
+
+def _stage_inputs(documents: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Run the pipeline once so each stage can be timed on its own inputs."""
+    texts = [extract_text(document["content"], document["content_type"]) for document in documents]
+    parsed = [basic_parse_resume(text) for text in texts]
+    return {
+        "extract_text": [(document["content"], document["content_type"]) for document in documents],
+        "segment_resume": [(text,) for text in texts],
+        "basic_parse_resume": [(text,) for text in texts],
+        "validate_resume_schema": [(data,) for data in parsed],
+    }
+
+
+_STAGE_FUNCS: Dict[str, Callable[..., Any]] = {
+    "extract_text": extract_text,
+    "segment_resume": segment_resume,
+    "basic_parse_resume": basic_parse_resume,
+    "validate_resume_schema": validate_resume_schema,
+}
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _time_stage(func: Callable[..., Any], inputs: List[Any], repeat: int) -> Dict[str, Any]:
+    latencies = []
+    for _ in range(repeat):
+        for args in inputs:
+            started = time.perf_counter()
+            func(*args)
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "docs": len(latencies),
+        "seconds": round(total, 4),
+        "docs_per_sec": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def _peak_memory(func: Callable[..., Any], inputs: List[Any]) -> float:
+    """Largest tracemalloc peak for a single document, in MB."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for args in inputs:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            func(*args)
+            _, doc_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, doc_peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024 / 1024, 3)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(documents: List[Dict[str, Any]], repeat: int = 3) -> Dict[str, Any]:
+    inputs = _stage_inputs(documents)
+    stages = {}
+    for stage in STAGES:
+        func = _STAGE_FUNCS[stage]
+        func(*inputs[stage][0])  # warm up imports and caches
+        result = _time_stage(func, inputs[stage], repeat)
+        result["peak_mb"] = _peak_memory(func, inputs[stage])
+        stages[stage] = result
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "corpus": {
+            "documents": len(documents),
+            "pdf": sum(1 for document in documents if document["name"].endswith(".pdf")),
+            "docx": sum(1 for document in documents if document["name"].endswith(".docx")),
+            "pages": sum(document.get("pages", 0) for document in documents),
+            "bytes": sum(len(document["content"]) for document in documents),
+        },
+        "repeat": repeat,
+        "stages": stages,
+    }
+
+
+def _print_table(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    corpus = result["corpus"]
+    print(
+        f"commit {result['commit'] or '-'}  corpus {corpus['documents']} docs "
+        f"({corpus['pdf']} pdf, {corpus['docx']} docx, {corpus['pages']} pages)"
+    )
+    print(f"{'stage':<24}{'docs/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}")
+    for stage, row in result["stages"].items():
+        line = f"{stage:<24}{row['docs_per_sec']:>10}{row['p50_ms']:>10}{row['p99_ms']:>10}{row['peak_mb']:>10}"
+        before = (baseline or {}).get("stages", {}).get(stage)
+        if before and before.get("docs_per_sec") and row["docs_per_sec"]:
+            change = (row["docs_per_sec"] - before["docs_per_sec"]) / before["docs_per_sec"] * 100
+            line += f"   {change:+.1f}% docs/s vs {baseline.get('commit') or 'baseline'}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Corpus directory written by benchmarks.corpus (default: generate in memory)")
+    parser.add_argument("--count", type=int, default=40, help="Documents to generate when --corpus isn't given")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus seed when --corpus isn't given")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the corpus")
+    parser.add_argument("--baseline", help="Earlier --json output to compare docs/sec against")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    documents = load_corpus(args.corpus) if args.corpus else list(iter_corpus(args.count, args.seed))
+    result = run_benchmark(documents, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+    _print_table(result, baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
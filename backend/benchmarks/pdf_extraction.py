@@ -0,0 +1,98 @@
+"""
+Benchmark PDF text extraction engines.
+
+Compares the layout-aware pdfplumber path with the pypdfium2 text-layer
+engine, both for full documents and with the AI prompt character budget.
+Each run happens in a fresh process so peak RSS is measured per engine.
+
+Usage:
+    python -m benchmarks.pdf_extraction resume1.pdf resume2.pdf [--repeat 3] [--json]
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.services.extraction_service import AI_PARSE_MAX_CHARS, PDF_ENGINES, iter_pdf_pages
+
+
+def _run_case(
+    paths: List[str],
+    engine: str,
+    max_chars: Optional[int],
+    repeat: int,
+    queue: multiprocessing.Queue,
+) -> None:
+    documents = [Path(path).read_bytes() for path in paths]
+    pages = 0
+    chars = 0
+    started = time.perf_counter()
+
+    for _ in range(repeat):
+        for content in documents:
+            total = 0
+            for page_text in iter_pdf_pages(content, engine=engine):
+                pages += 1
+                total += len(page_text)
+                if max_chars and total >= max_chars:
+                    break
+            chars += total
+
+    elapsed = time.perf_counter() - started
+    # ru_maxrss is reported in kilobytes on Linux
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    queue.put({
+        "engine": engine,
+        "mode": "budget" if max_chars else "full",
+        "pages": pages,
+        "chars": chars,
+        "seconds": round(elapsed, 4),
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else None,
+        "peak_rss_mb": round(peak_rss_mb, 1),
+    })
+
+
+def run_benchmark(paths: List[str], repeat: int = 3) -> List[Dict[str, Any]]:
+    """Run every engine/mode combination in its own process and collect results."""
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for engine in PDF_ENGINES:
+        for max_chars in (None, AI_PARSE_MAX_CHARS):
+            queue = context.Queue()
+            process = context.Process(target=_run_case, args=(paths, engine, max_chars, repeat, queue))
+            process.start()
+            process.join()
+            if process.exitcode != 0:
+                results.append({"engine": engine, "mode": "budget" if max_chars else "full", "error": process.exitcode})
+                continue
+            results.append(queue.get())
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="PDF files to extract")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the input files")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.paths, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'engine':<12}{'mode':<8}{'pages':>8}{'pages/s':>12}{'peak RSS MB':>14}")
+    for row in results:
+        if "error" in row:
+            print(f"{row['engine']:<12}{row['mode']:<8}  failed (exit {row['error']})")
+            continue
+        print(f"{row['engine']:<12}{row['mode']:<8}{row['pages']:>8}{row['pages_per_sec']:>12}{row['peak_rss_mb']:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+Benchmark resume HTML rendering throughput.
+
+Renders synthetic resumes (see benchmarks.corpus) through
+render_resume_html with each template and compares three setups:
+
+    fresh_env      new Jinja environment per render, nothing cached
+                   (how rendering worked before the template registry)
+    bytecode_only  new environment per render, compiled code loaded from the
+                   bytecode cache (a freshly started worker)
+    registry       the shared process-wide registry
+
+Templates come from templates/resume; when none are installed a small
+fixture template is used so the benchmark still runs.
+
+Usage:
+    python -m benchmarks.template_render [--count 20] [--repeat 5] [--templates DIR]
+    python -m benchmarks.template_render --json > after.json
+    python -m benchmarks.template_render --baseline before.json
+"""
+import argparse
+import contextlib
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.services import template_service
+from app.services.template_service import TEMPLATES_DIR, TemplateRegistry, render_resume_html
+from benchmarks.corpus import make_resume
+
+MODES = ("fresh_env", "bytecode_only", "registry")
+
+_FIXTURE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><style>{{ styles }}</style></head>
+<body class="spacing-{{ spacing_token }} accent-{{ accent_color_token }}" style="font-family: {{ font_family_token }}">
+<header><h1>{{ profile.fullName }}</h1><p>{{ profile.headline }}</p>
+{% for key, value in (profile.contact or {}).items() %}<span class="{{ key }}">{{ value }}</span>{% endfor %}
+</header>
+{% for section in section_order %}
+{% if section == "summary" and sections.summary %}<section><h2>Summary</h2><p>{{ sections.summary }}</p></section>
+{% elif section == "experience" and sections.experience %}<section><h2>Experience</h2>
+{% for job in sections.experience %}<article><h3>{{ job.role }} - {{ job.company }}</h3>
+<p class="dates">{{ job.startDate }} - {{ job.endDate }} | {{ job.location }}</p>
+<ul>{% for bullet in job.bullets %}<li>{{ bullet }}</li>{% endfor %}</ul></article>{% endfor %}</section>
+{% elif section == "skills" and sections.skills %}<section><h2>Skills</h2><p>{{ sections.skills | join(", ") }}</p></section>
+{% elif section == "projects" and sections.projects %}<section><h2>Projects</h2>
+{% for project in sections.projects %}<article><h3>{{ project.name }}</h3><p>{{ project.description }}</p>
+<p>{{ project.technologies | join(", ") }}</p></article>{% endfor %}</section>
+{% elif section == "education" and sections.education %}<section><h2>Education</h2>
+{% for school in sections.education %}<p>{{ school.degree }}, {{ school.institution }} ({{ school.endDate }})</p>{% endfor %}</section>
+{% endif %}
+{% endfor %}
+</body></html>
+"""
+
+_FIXTURE_CSS = "@page { size: A4; margin: 18mm; }\nbody { font-size: 10pt; }\nh2 { border-bottom: 1px solid #333; }\n"
+
+
+def _write_fixture_template(directory: Path) -> None:
+    folder = directory / "fixture"
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / "index.html").write_text(_FIXTURE_HTML, encoding="utf-8")
+    (folder / "styles.css").write_text(_FIXTURE_CSS * 40, encoding="utf-8")
+    (folder / "config.json").write_text(
+        json.dumps({"name": "Fixture", "defaultTokens": {"spacing": "compact"}}), encoding="utf-8"
+    )
+
+
+def _template_slugs(directory: Path) -> List[str]:
+    if not directory.exists():
+        return []
+    return sorted(folder.name for folder in directory.iterdir() if (folder / "index.html").exists())
+
+
+def _canonical(resume: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a corpus resume into the canonical resume schema."""
+    email, phone, location, linkedin = resume["contact"]
+    experience = []
+    for job in resume["experience"]:
+        start, end = job["dates"].split(" - ")
+        experience.append({
+            "company": job["company"],
+            "role": job["role"],
+            "location": job["location"],
+            "startDate": start,
+            "endDate": end,
+            "bullets": job["bullets"],
+        })
+    education = []
+    for school in resume["education"]:
+        start, end = school["dates"].split(" - ")
+        education.append({"institution": school["school"], "degree": school["degree"], "startDate": start, "endDate": end})
+    return {
+        "meta": {"purpose": "software_engineer", "language": "en", "tone": "professional"},
+        "profile": {
+            "fullName": resume["name"],
+            "headline": resume["headline"],
+            "contact": {"email": email, "phone": phone, "location": location, "linkedin": linkedin},
+        },
+        "sections": {
+            "summary": resume["summary"],
+            "experience": experience,
+            "skills": resume["skills"],
+            "projects": resume["projects"],
+            "education": education,
+        },
+    }
+
+
+@contextlib.contextmanager
+def _use_registry(registry: TemplateRegistry) -> Iterator[None]:
+    previous = template_service.template_registry
+    template_service.template_registry = registry
+    try:
+        yield
+    finally:
+        template_service.template_registry = previous
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time_mode(mode: str, directory: Path, bytecode_dir: str, slugs: List[str], documents: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    shared = TemplateRegistry(directory, bytecode_cache=False)
+    # Prime the bytecode cache so bytecode_only measures loading, not compiling
+    primer = TemplateRegistry(directory, bytecode_cache_dir=bytecode_dir)
+    for slug in slugs:
+        primer.get_template(slug)
+        # The shared registry is warm in a running server
+        shared.get_template(slug)
+    latencies = []
+    for _ in range(repeat):
+        for slug in slugs:
+            for document in documents:
+                started = time.perf_counter()
+                if mode == "fresh_env":
+                    registry = TemplateRegistry(directory, bytecode_cache=False)
+                elif mode == "bytecode_only":
+                    registry = TemplateRegistry(directory, bytecode_cache_dir=bytecode_dir)
+                else:
+                    registry = shared
+                with _use_registry(registry):
+                    render_resume_html(slug, document)
+                latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "renders": len(latencies),
+        "seconds": round(total, 4),
+        "renders_per_sec": round(len(latencies) / total, 2) if total else None,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run_benchmark(directory: Path, count: int = 20, seed: int = 1, repeat: int = 5) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    documents = [_canonical(make_resume(rng, pages=rng.choice((1, 2, 3)))) for _ in range(count)]
+    with tempfile.TemporaryDirectory() as scratch:
+        slugs = _template_slugs(directory)
+        if not slugs:
+            directory = Path(scratch) / "templates"
+            _write_fixture_template(directory)
+            slugs = _template_slugs(directory)
+        bytecode_dir = str(Path(scratch) / "bytecode")
+        Path(bytecode_dir).mkdir()
+        modes = {mode: _time_mode(mode, directory, bytecode_dir, slugs, documents, repeat) for mode in MODES}
+
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "templates": slugs,
+        "documents": count,
+        "repeat": repeat,
+        "modes": modes,
+    }
+
+
+def _print_table(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    print(
+        f"commit {result['commit'] or '-'}  templates {', '.join(result['templates'])}  "
+        f"{result['documents']} documents x {result['repeat']}"
+    )
+    print(f"{'mode':<16}{'renders/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, row in result["modes"].items():
+        line = f"{mode:<16}{row['renders_per_sec']:>12}{row['p50_ms']:>10}{row['p99_ms']:>10}"
+        before = (baseline or {}).get("modes", {}).get(mode)
+        if before and before.get("renders_per_sec") and row["renders_per_sec"]:
+            change = (row["renders_per_sec"] - before["renders_per_sec"]) / before["renders_per_sec"] * 100
+            line += f"   {change:+.1f}% renders/s vs {baseline.get('commit') or 'baseline'}"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--templates", default=str(TEMPLATES_DIR), help="Resume templates directory")
+    parser.add_argument("--count", type=int, default=20, help="Synthetic resumes to render")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the synthetic resumes")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes over the documents")
+    parser.add_argument("--baseline", help="Earlier --json output to compare renders/sec against")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(Path(args.templates), count=args.count, seed=args.seed, repeat=args.repeat)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+    _print_table(result, baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""Add content_hash column to resumes table
+
+Revision ID: 20261018_resume_content_hash
+Revises: 20260204_add_raw_text
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_resume_content_hash'
+down_revision = '20260204_add_raw_text'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # SHA-256 hex digest of the uploaded file, used to deduplicate re-uploads
+    op.add_column('resumes', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_resumes_user_id_content_hash', 'resumes', ['user_id', 'content_hash'])
+
+
+def downgrade():
+    op.drop_index('ix_resumes_user_id_content_hash', table_name='resumes')
+    op.drop_column('resumes', 'content_hash')
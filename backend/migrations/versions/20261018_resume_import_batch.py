@@ -0,0 +1,27 @@
+"""Add import_batch_id column to resumes table
+
+Revision ID: 20261018_resume_import_batch
+Revises: 20261018_resume_content_hash
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_resume_import_batch'
+down_revision = '20261018_resume_content_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Groups resumes created by one bulk import so its progress can be polled
+    op.add_column('resumes', sa.Column('import_batch_id', sa.String(length=32), nullable=True))
+    op.create_index('ix_resumes_import_batch_id', 'resumes', ['import_batch_id'])
+
+
+def downgrade():
+    op.drop_index('ix_resumes_import_batch_id', table_name='resumes')
+    op.drop_column('resumes', 'import_batch_id')
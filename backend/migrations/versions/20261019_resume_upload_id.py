@@ -0,0 +1,27 @@
+"""Add upload_id column to resumes table
+
+Revision ID: 20261019_resume_upload_id
+Revises: 20261018_resume_import_batch
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_resume_upload_id'
+down_revision = '20261018_resume_import_batch'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Direct upload intent a resume was created from, so completing it twice returns the same resume
+    op.add_column('resumes', sa.Column('upload_id', sa.String(length=32), nullable=True))
+    op.create_index('ix_resumes_upload_id', 'resumes', ['upload_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_resumes_upload_id', table_name='resumes')
+    op.drop_column('resumes', 'upload_id')
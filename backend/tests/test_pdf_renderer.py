@@ -0,0 +1,112 @@
+import re
+import sys
+import types
+
+import pytest
+
+from app.services import pdf_renderer
+from app.services.pdf_renderer import STYLESHEET_PLACEHOLDER
+
+
+def _fake_weasyprint():
+    """
+    Stand-in for WeasyPrint that records the document's <style> elements and
+    the stylesheets passed to write_pdf().
+    """
+    parsed = []
+    rendered = []
+
+    class CSS:
+        def __init__(self, string=None, font_config=None, counter_style=None, **kwargs):
+            self.string = string
+            parsed.append(string)
+
+    class HTML:
+        def __init__(self, string):
+            self.string = string
+
+        def write_pdf(self, stylesheets=None, font_config=None, counter_style=None):
+            styles = re.findall(r"<style>(.*?)</style>", self.string, re.S)
+            rendered.append((self.string, styles, stylesheets or []))
+            return b"%PDF"
+
+    weasyprint = types.ModuleType("weasyprint")
+    weasyprint.CSS, weasyprint.HTML = CSS, HTML
+    css_module = types.ModuleType("weasyprint.css")
+    counters = types.ModuleType("weasyprint.css.counters")
+    counters.CounterStyle = type("CounterStyle", (dict,), {})
+    text = types.ModuleType("weasyprint.text")
+    fonts = types.ModuleType("weasyprint.text.fonts")
+    fonts.FontConfiguration = type("FontConfiguration", (), {})
+    modules = {
+        "weasyprint": weasyprint,
+        "weasyprint.css": css_module,
+        "weasyprint.css.counters": counters,
+        "weasyprint.text": text,
+        "weasyprint.text.fonts": fonts,
+    }
+    return modules, parsed, rendered
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    modules, parsed, rendered = _fake_weasyprint()
+    for name, module in modules.items():
+        monkeypatch.setitem(sys.modules, name, module)
+    monkeypatch.setattr(pdf_renderer, "_worker_stylesheets", {})
+    monkeypatch.setattr(pdf_renderer, "_worker_font_config", None)
+    return parsed, rendered
+
+
+CSS = "h1 { color: blue; }"
+ONLY_CSS = f"<html><head><style>{STYLESHEET_PLACEHOLDER}</style></head><body><h1 style=\"margin: 0\">A</h1><p>B</p></body></html>"
+
+
+@pytest.mark.parametrize("html, css", [
+    (f"<html><head><style>{STYLESHEET_PLACEHOLDER}</style><style>h1 {{ color: red; }}</style></head></html>", CSS),
+    (f"<html><head><style>{STYLESHEET_PLACEHOLDER} h1 {{ color: red; }}</style></head></html>", CSS),
+    (f"<html><head><link rel=\"stylesheet\" href=\"x.css\"><style>{STYLESHEET_PLACEHOLDER}</style></head></html>", CSS),
+    (ONLY_CSS, "h1 { color: blue !important; }"),
+])
+def test_template_css_is_inlined_next_to_other_styles(worker, html, css):
+    _, rendered = worker
+
+    pdf_renderer._write_pdf(html, css, "key")
+
+    html, styles, stylesheets = rendered[0]
+    assert STYLESHEET_PLACEHOLDER not in html
+    assert css in styles[0]
+    assert stylesheets == []
+
+
+def test_only_css_is_parsed_once_per_worker(worker):
+    parsed, rendered = worker
+
+    pdf_renderer._write_pdf(ONLY_CSS, CSS, "key")
+    pdf_renderer._write_pdf(ONLY_CSS, CSS, "key")
+
+    assert parsed.count(CSS) == 1
+    for html, styles, stylesheets in rendered:
+        assert styles == []
+        assert [sheet.string for sheet in stylesheets] == [CSS]
+    assert rendered[0][2][0] is rendered[1][2][0]
+
+
+@pytest.mark.skipif(not pdf_renderer.WEASYPRINT_AVAILABLE, reason="WeasyPrint is not available")
+@pytest.mark.parametrize("html", [
+    ONLY_CSS,
+    f"<html><head><style>{STYLESHEET_PLACEHOLDER}</style><style>p {{ margin: 0; }}</style></head>"
+    "<body><h1>A</h1><p>B</p></body></html>",
+])
+def test_real_render_keeps_page_size_and_template_styles(monkeypatch, html):
+    pypdfium2 = pytest.importorskip("pypdfium2")
+    monkeypatch.setattr(pdf_renderer, "_worker_stylesheets", {})
+    css = "@page { size: A5; margin: 10mm; } h1 { break-after: page; }"
+
+    document = pypdfium2.PdfDocument(pdf_renderer._write_pdf(html, css, "key"))
+    try:
+        assert len(document) == 2
+        width, height = document[0].get_size()
+        assert (round(width), round(height)) == (420, 595)
+    finally:
+        document.close()
@@ -0,0 +1,75 @@
+"""Heading detection in the rule-based resume segmenter."""
+import pytest
+
+from app.services.section_segmenter import detect_heading, low_confidence_fields, segment_resume
+
+RESUME = """Jane Doe
+jane@example.com | (555) 123-4567
+
+EXPERIENCE
+Software Engineer | Acme Corp | Jan 2021 - Present
+- Built the billing service
+Software Engineer
+IBM
+Jun 2018 - Dec 2020
+- Migrated batch jobs to Spark
+Intern | NASA | May 2017 - Aug 2017
+- Wrote telemetry tooling
+
+EDUCATION
+MIT
+B.S. Computer Science | 2014 - 2018
+GPA: 3.8/4.0
+
+SKILLS
+Python, Go, Spark
+"""
+
+
+@pytest.mark.parametrize("line", ["IBM", "NASA", "MIT", "UCLA", "GPA: 3.8/4.0", "GPA 3.8", "IBM CORP"])
+def test_capitalised_content_is_not_a_heading(line):
+    assert detect_heading(line) is None
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["IBM", "NASA", "MIT", "GPA: 3.8/4.0", "STANFORD UNIVERSITY", "SENIOR ENGINEER", "B.S. COMPUTER SCIENCE"],
+)
+def test_isolated_names_and_roles_are_not_headings(line):
+    assert detect_heading(line, isolated=True) is None
+
+
+def test_known_headings():
+    assert detect_heading("EXPERIENCE") == "experience"
+    assert detect_heading("Work Experience:") == "experience"
+    assert detect_heading("PUBLICATIONS") == "other"
+
+
+def test_unknown_heading_needs_blank_lines():
+    assert detect_heading("SELECTED TALKS") is None
+    assert detect_heading("SELECTED TALKS", isolated=True) == "other"
+
+
+def test_capitalised_company_keeps_every_job():
+    segmented = segment_resume(RESUME)
+    experience = segmented["data"]["sections"]["experience"]
+    assert len(experience) == 3
+    assert [job["bullets"] for job in experience] == [
+        ["Built the billing service"],
+        ["Migrated batch jobs to Spark"],
+        ["Wrote telemetry tooling"],
+    ]
+    assert "sections.experience" not in low_confidence_fields(segmented, 0.6)
+
+
+def test_capitalised_school_and_gpa_stay_in_education():
+    education = segment_resume(RESUME)["data"]["sections"]["education"]
+    assert len(education) == 1
+    assert education[0]["institution"] == "MIT"
+    assert education[0]["gpa"] == "3.8/4.0"
+
+
+def test_section_ended_by_unknown_heading_is_low_confidence():
+    text = RESUME.replace("\nEDUCATION\n", "\nSELECTED TALKS\n\nEDUCATION\n")
+    segmented = segment_resume(text)
+    assert "sections.experience" in low_confidence_fields(segmented, 0.6)
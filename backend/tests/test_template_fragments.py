@@ -0,0 +1,98 @@
+"""Splitting rendered resumes into per-section fragments."""
+import copy
+
+import pytest
+
+from app.services import template_service
+from app.services.render_cache import render_cache
+from app.services.template_service import TemplateRegistry, render_resume_fragments, render_resume_html
+
+TEMPLATE_HTML = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><style>{{ styles }}</style></head>
+<body class="spacing-{{ spacing_token }}">
+<header><h1>{{ profile.fullName }}</h1></header>
+{% for section in section_order %}
+{% if section == "summary" and sections.summary %}<section><h2>Summary</h2><p>{{ sections.summary }}</p></section>
+{% elif section == "experience" and sections.experience %}<section><h2>Experience</h2>
+{% for job in sections.experience %}<article><h3>{{ job.role }} - {{ job.company }}</h3></article>{% endfor %}</section>
+{% elif section == "skills" and sections.skills %}<section><h2>Skills</h2><p>{{ sections.skills | join(", ") }}</p></section>
+{% endif %}
+{% endfor %}
+<footer>{{ profile.fullName }}</footer>
+</body></html>
+"""
+
+SEPARATED_HTML = """<body>{% for section in section_order %}{% if not loop.first %}<hr>{% endif %}
+{% if section == "summary" %}<p>{{ sections.summary }}</p>{% elif section == "skills" %}<p>{{ sections.skills | join(", ") }}</p>{% endif %}
+{% endfor %}</body>"""
+
+RESUME = {
+    "meta": {"purpose": "software_engineer"},
+    "profile": {"fullName": "Jane Doe"},
+    "sections": {
+        "summary": "Backend engineer.",
+        "experience": [{"role": "Engineer", "company": "Acme"}],
+        "skills": ["Python", "SQL"],
+    },
+}
+
+
+@pytest.fixture
+def templates(tmp_path, monkeypatch):
+    for slug, html in (("plain", TEMPLATE_HTML), ("separated", SEPARATED_HTML)):
+        (tmp_path / slug).mkdir()
+        (tmp_path / slug / "index.html").write_text(html, encoding="utf-8")
+        (tmp_path / slug / "styles.css").write_text("body { margin: 0; }", encoding="utf-8")
+    monkeypatch.setattr(template_service, "TEMPLATES_DIR", tmp_path)
+    monkeypatch.setattr(template_service, "template_registry", TemplateRegistry(tmp_path, bytecode_cache=False))
+    render_cache.clear()
+    yield
+    render_cache.clear()
+
+
+def _strip_markers(html, sections):
+    for section in sections:
+        html = html.replace(f"<!--section:{section}-->", "").replace(f"<!--/section:{section}-->", "")
+    return html
+
+
+def test_document_matches_plain_render(templates):
+    layout, fragments, html = render_resume_fragments("plain", RESUME)
+
+    assert set(fragments) >= {"summary", "experience", "skills"}
+    assert fragments["summary"][1].startswith("<section>")
+    assert _strip_markers(html, fragments) == render_resume_html("plain", RESUME)
+    for section, (_, fragment_html) in fragments.items():
+        assert f"<!--section:{section}-->{fragment_html}<!--/section:{section}-->" in html
+
+
+def test_editing_one_section_changes_only_its_fragment(templates):
+    layout, fragments, _ = render_resume_fragments("plain", RESUME)
+    edited = copy.deepcopy(RESUME)
+    edited["sections"]["skills"].append("Go")
+
+    new_layout, new_fragments, html = render_resume_fragments("plain", edited, known_layout=layout)
+
+    assert new_layout == layout
+    assert html is None
+    changed = {section for section in fragments if fragments[section][0] != new_fragments[section][0]}
+    assert changed == {"skills"}
+    assert "Go" in new_fragments["skills"][1]
+
+
+def test_layout_change_sends_document(templates):
+    layout, _, _ = render_resume_fragments("plain", RESUME)
+    renamed = copy.deepcopy(RESUME)
+    renamed["profile"]["fullName"] = "Jane Smith"
+
+    new_layout, _, html = render_resume_fragments("plain", renamed, known_layout=layout)
+
+    assert new_layout != layout
+    assert "Jane Smith" in html
+
+
+def test_template_that_does_not_split_is_sent_whole(templates):
+    layout, fragments, html = render_resume_fragments("separated", RESUME, known_layout="stale")
+
+    assert fragments == {}
+    assert html == render_resume_html("separated", RESUME)
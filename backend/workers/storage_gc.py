@@ -0,0 +1,270 @@
+"""
+Delete storage objects that no resume or profile references.
+
+Deleting a resume, replacing an avatar or abandoning a direct upload leaves
+the stored object behind. This job walks the pdf-cache/, profiles/ and
+resumes/ prefixes in a fixed order, compares every object with
+resumes.storage_path and profiles.avatar_url, and bulk-deletes unreferenced
+objects older than the grace period. Each delete batch is checked against
+the database again first, so objects claimed by rows committed during the
+run survive. The position and counters are checkpointed after every delete
+batch, so an interrupted run continues where it stopped. Storage calls are
+rate limited.
+
+Usage:
+    python -m workers.storage_gc --dry-run
+    python -m workers.storage_gc [--grace-hours 24] [--batch-size 100] [--rate 5]
+    python -m workers.storage_gc --restart    # ignore the checkpoint
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from sqlalchemy import or_
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.storage import AVATAR_VARIANT_PATTERN, StorageBackend, delete_objects, get_storage_backend
+from app.models.profile import Profile
+from app.models.resume import Resume
+
+# pdf-cache objects are never referenced, so the grace period acts as their TTL
+GC_PREFIXES = ("pdf-cache", "profiles", "resumes")
+
+# Save the position this often even when nothing is being deleted
+CHECKPOINT_EVERY = 1000
+
+
+class _RateLimiter:
+    """Spaces calls at least 1/per_second apart."""
+
+    def __init__(self, per_second: float):
+        self._interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        now = time.monotonic()
+        if self._next_at > now:
+            time.sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + self._interval
+
+
+def _object_path(value: Optional[str], backend: StorageBackend) -> Optional[str]:
+    value = (value or "").strip()
+    if value.startswith("http"):
+        return backend.object_path_from_url(value)
+    return value or None
+
+
+def _add_references(values: Iterator[Optional[str]], backend: StorageBackend, paths: Set[str], avatar_folders: Set[str]) -> None:
+    for value in values:
+        object_path = _object_path(value, backend)
+        if not object_path:
+            continue
+        paths.add(object_path)
+        # A profile stores one variant; the other sizes live next to it
+        match = AVATAR_VARIANT_PATTERN.match(object_path)
+        if match:
+            avatar_folders.add(match.group(1))
+
+
+def _referenced(backend: StorageBackend) -> Tuple[Set[str], Set[str]]:
+    """Object paths referenced from the database, and avatar variant folders."""
+    paths: Set[str] = set()
+    avatar_folders: Set[str] = set()
+    db = SessionLocal()
+    try:
+        values = chain(
+            (row[0] for row in db.query(Resume.storage_path).yield_per(1000)),
+            (row[0] for row in db.query(Profile.avatar_url).filter(Profile.avatar_url.isnot(None)).yield_per(1000)),
+        )
+        _add_references(values, backend, paths, avatar_folders)
+    finally:
+        db.close()
+    return paths, avatar_folders
+
+
+def _referenced_now(backend: StorageBackend, object_paths: List[str]) -> Set[str]:
+    """
+    Which of object_paths the database references at this moment. Catches
+    uploads whose row was committed after _referenced() took its snapshot.
+    """
+    folders = {object_path.rsplit("/", 1)[0] for object_path in object_paths}
+    paths: Set[str] = set()
+    avatar_folders: Set[str] = set()
+    db = SessionLocal()
+    try:
+        # Stored values may be URLs that contain the object path
+        resume_rows = db.query(Resume.storage_path).filter(
+            or_(*(Resume.storage_path.contains(object_path, autoescape=True) for object_path in object_paths))
+        )
+        profile_rows = db.query(Profile.avatar_url).filter(
+            or_(*(Profile.avatar_url.contains(f"{folder}/", autoescape=True) for folder in folders))
+        )
+        _add_references((row[0] for row in chain(resume_rows, profile_rows)), backend, paths, avatar_folders)
+    finally:
+        db.close()
+    return {
+        object_path for object_path in object_paths
+        if object_path in paths or object_path.rsplit("/", 1)[0] in avatar_folders
+    }
+
+
+def _path_key(object_path: str) -> Tuple[str, ...]:
+    return tuple(object_path.split("/"))
+
+
+def _walk(
+    backend: StorageBackend,
+    prefix: str,
+    after: Optional[Tuple[str, ...]],
+    limiter: _RateLimiter,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Depth-first walk yielding objects in _path_key order. Objects at or
+    before `after` are skipped, and so are whole folders that precede it.
+    """
+    limiter.wait()
+    for entry in sorted(backend.list_folder(prefix), key=lambda item: item["name"]):
+        object_path = f"{prefix}/{entry['name']}"
+        key = _path_key(object_path)
+        if entry["is_folder"]:
+            if after and key < after[:len(key)]:
+                continue
+            yield from _walk(backend, object_path, after, limiter)
+        elif not after or key > after:
+            yield dict(entry, path=object_path)
+
+
+def _checkpoint_file() -> str:
+    return settings.STORAGE_GC_CHECKPOINT or os.path.join(tempfile.gettempdir(), "applypilot_storage_gc.json")
+
+
+def _load_checkpoint(path: str, backend: StorageBackend) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as handle:
+            checkpoint = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    if checkpoint.get("backend") != backend.name or not checkpoint.get("cursor"):
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(path: str, checkpoint: Dict[str, Any]) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as handle:
+        json.dump(checkpoint, handle)
+    os.replace(temp_path, path)
+
+
+def collect_orphans(
+    dry_run: bool = False,
+    grace_hours: Optional[float] = None,
+    batch_size: Optional[int] = None,
+    requests_per_second: Optional[float] = None,
+    restart: bool = False,
+) -> Dict[str, Any]:
+    """
+    Find and delete unreferenced objects. Returns counters for the run.
+    A dry run deletes nothing and neither reads nor writes the checkpoint.
+    """
+    backend = get_storage_backend()
+    grace_hours = settings.STORAGE_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    batch_size = max(1, batch_size or settings.STORAGE_GC_BATCH_SIZE)
+    limiter = _RateLimiter(settings.STORAGE_GC_REQUESTS_PER_SECOND if requests_per_second is None else requests_per_second)
+    cutoff = time.time() - grace_hours * 3600
+    checkpoint_path = _checkpoint_file()
+
+    checkpoint = None if dry_run or restart else _load_checkpoint(checkpoint_path, backend)
+    if checkpoint:
+        print(f"[StorageGC] Resuming after {checkpoint['cursor']}")
+    else:
+        checkpoint = {"backend": backend.name, "cursor": None, "started_at": datetime.utcnow().isoformat()}
+    stats = {"scanned": 0, "referenced": 0, "recent": 0, "orphaned": 0, "deleted": 0, "orphaned_bytes": 0}
+    # Totals so far, so a resumed run reports the whole scan
+    stats.update(checkpoint.get("stats", {}))
+
+    referenced_paths, avatar_folders = _referenced(backend)
+    after = _path_key(checkpoint["cursor"]) if checkpoint["cursor"] else None
+    # (object path, size) of orphans waiting for the next delete batch
+    pending: List[Tuple[str, int]] = []
+
+    def flush(cursor: str) -> None:
+        if pending and not dry_run:
+            # The reference snapshot is older than this batch
+            claimed = _referenced_now(backend, [object_path for object_path, _ in pending])
+            for object_path, size in pending:
+                if object_path in claimed:
+                    stats["orphaned"] -= 1
+                    stats["orphaned_bytes"] -= size
+                    stats["referenced"] += 1
+            doomed = [object_path for object_path, _ in pending if object_path not in claimed]
+            if doomed:
+                limiter.wait()
+                delete_objects(doomed)
+                stats["deleted"] += len(doomed)
+        pending.clear()
+        if not dry_run:
+            checkpoint.update(cursor=cursor, stats=stats)
+            _save_checkpoint(checkpoint_path, checkpoint)
+
+    last_path = None
+    for prefix in GC_PREFIXES:
+        for entry in _walk(backend, prefix, after, limiter):
+            object_path = last_path = entry["path"]
+            stats["scanned"] += 1
+            folder = object_path.rsplit("/", 1)[0]
+            if object_path in referenced_paths or folder in avatar_folders:
+                stats["referenced"] += 1
+            elif entry.get("updated_at") is None or entry["updated_at"] > cutoff:
+                # Unknown age counts as recent; it may be an upload still in progress
+                stats["recent"] += 1
+            else:
+                stats["orphaned"] += 1
+                stats["orphaned_bytes"] += entry.get("size") or 0
+                if dry_run:
+                    print(f"[StorageGC] Would delete {object_path}")
+                pending.append((object_path, entry.get("size") or 0))
+
+            if len(pending) >= batch_size or (not pending and stats["scanned"] % CHECKPOINT_EVERY == 0):
+                flush(object_path)
+
+    if last_path:
+        flush(last_path)
+    if not dry_run and os.path.exists(checkpoint_path):
+        # Finished: the next run starts from the beginning
+        os.remove(checkpoint_path)
+
+    print(f"[StorageGC] {'Dry run: ' if dry_run else ''}{stats}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="Report orphans without deleting them")
+    parser.add_argument("--grace-hours", type=float, help="Keep orphans younger than this (default: STORAGE_GC_GRACE_HOURS)")
+    parser.add_argument("--batch-size", type=int, help="Objects per delete request (default: STORAGE_GC_BATCH_SIZE)")
+    parser.add_argument("--rate", type=float, help="Storage requests per second (default: STORAGE_GC_REQUESTS_PER_SECOND)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and scan from the start")
+    args = parser.parse_args(argv)
+
+    collect_orphans(
+        dry_run=args.dry_run,
+        grace_hours=args.grace_hours,
+        batch_size=args.batch_size,
+        requests_per_second=args.rate,
+        restart=args.restart,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
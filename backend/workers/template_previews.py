@@ -0,0 +1,21 @@
+"""
+Build pre-rendered sample previews and thumbnails for resume templates.
+
+Run at deploy time so a fresh server has every preview ready; the API also
+builds missing ones in the background at startup.
+
+Usage:
+    python -m workers.template_previews
+"""
+import sys
+
+from app.services.template_previews import build_template_previews
+
+
+def main() -> int:
+    stats = build_template_previews()
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())